@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Accounting Export
+Downloads GET /api/export/<payments|expenses> as CSV or NDJSON straight to disk, a chunk
+at a time, optionally filtered by date range and property.
+
+With --memory-check it also samples the traced heap while the download runs and fails if
+memory grows with the number of rows exported rather than staying flat. On the emulator
+it first loads --rows synthetic payments so the export runs into the millions.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+from api_emulator import EXPORT_COLUMNS, ApiEmulator, EmulatorSession, emulator_requested, now_iso
+from backend_test import BASE_URL, MyRentManagerTester
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Heap growth allowed across a memory-checked export, independent of its size
+MEMORY_TOLERANCE_MB = 16.0
+MEMORY_SAMPLE_BYTES = 8 * 1024 * 1024
+
+
+class RowCounter:
+    """Counts CSV or NDJSON rows across chunk boundaries; newlines inside quoted CSV cells do not end a row"""
+
+    def __init__(self, fmt):
+        self.fmt = fmt
+        self.lines = 0
+        self.in_quotes = False
+
+    def feed(self, chunk):
+        if self.fmt == 'ndjson' or (b'"' not in chunk and not self.in_quotes):
+            self.lines += chunk.count(b'\n')
+            return
+        # Segments between quotes alternate outside/inside; a doubled quote toggles twice
+        for index, segment in enumerate(chunk.split(b'"')):
+            if index:
+                self.in_quotes = not self.in_quotes
+            if not self.in_quotes:
+                self.lines += segment.count(b'\n')
+
+    @property
+    def rows(self):
+        return max(self.lines - 1, 0) if self.fmt == 'csv' else self.lines
+
+
+class ExportClient:
+    def __init__(self, tester, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.tester = tester
+        self.chunk_size = chunk_size
+
+    def download(self, collection, path, fmt='csv', date_from=None, date_to=None, property_id=None, on_chunk=None):
+        """Stream one export into `path`; returns {'rows', 'bytes', 'seconds'}"""
+        params = {key: value for key, value in (('format', fmt), ('from', date_from), ('to', date_to),
+                                                ('propertyId', property_id)) if value}
+        endpoint = f"export/{collection}?{urlencode(params)}"
+        start = time.perf_counter()
+        response = self.tester.make_request('GET', endpoint, stream=True)
+        if not response or response.status_code != 200:
+            raise RuntimeError(f"GET {endpoint} failed: {response.status_code if response is not None else 'No response'}")
+        counter = RowCounter(fmt)
+        written = 0
+        try:
+            with open(path, 'wb') as f:
+                for chunk in response.iter_content(self.chunk_size):
+                    f.write(chunk)
+                    counter.feed(chunk)
+                    written += len(chunk)
+                    if on_chunk:
+                        on_chunk(written, counter.rows)
+        finally:
+            response.close()
+        return {'rows': counter.rows, 'bytes': written, 'seconds': round(time.perf_counter() - start, 3)}
+
+
+class MemorySampler:
+    """Traced heap size every MEMORY_SAMPLE_BYTES downloaded, as (rows so far, MiB)"""
+
+    def __init__(self):
+        self.samples = []
+        self.next_sample = 0
+
+    def __call__(self, written, rows):
+        if written >= self.next_sample:
+            current, _ = tracemalloc.get_traced_memory()
+            self.samples.append((rows, current / 2**20))
+            self.next_sample = written + MEMORY_SAMPLE_BYTES
+
+    def growth(self):
+        """MiB the heap grew from the first sample to the largest one"""
+        if len(self.samples) < 2:
+            return 0.0
+        return max(mb for _, mb in self.samples) - self.samples[0][1]
+
+
+def load_synthetic_payments(emulator, count, seed=42, years=5):
+    """Insert `count` payments spread over `years` straight into the emulator, without the HTTP layer"""
+    rng = random.Random(seed)
+    first = date.today() - timedelta(days=365 * years)
+    created = now_iso()
+    property_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(200)]
+    with emulator.lock:
+        for start in range(0, count, 100_000):
+            emulator.payments.insert_many({
+                'id': str(uuid.UUID(int=rng.getrandbits(128))),
+                'tenantId': None,
+                'tenantName': f"Tenant {i}",
+                'propertyId': rng.choice(property_ids),
+                'propertyName': 'Export, "Synthetic" Block',
+                'amount': float(rng.randrange(500, 5000, 25)),
+                'date': (first + timedelta(days=rng.randrange(365 * years))).isoformat(),
+                'status': 'Paid',
+                'createdAt': created,
+            } for i in range(start, min(start + 100_000, count)))
+        # Build the date-sorted view now, so the check measures the export rather than the first sort
+        emulator.payments.sorted_view('date')
+    return property_ids
+
+
+def main():
+    """Main export execution"""
+    parser = argparse.ArgumentParser(description="Stream a payments or expenses export to disk")
+    parser.add_argument('collection', choices=sorted(EXPORT_COLUMNS))
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+    parser.add_argument('--from', dest='date_from', help="first day included (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='date_to', help="last day included (YYYY-MM-DD)")
+    parser.add_argument('--property-id')
+    parser.add_argument('--output', help="file to write; defaults to a temporary file under --memory-check")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--memory-check', action='store_true', help="fail unless heap use stays flat during the export")
+    parser.add_argument('--rows', type=int, default=2_000_000, help="synthetic payments loaded into the emulator")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--emulator', action='store_true', help="export from the in-process API emulator")
+    args = parser.parse_args()
+
+    session = None
+    expected_rows = None
+    if args.emulator or emulator_requested():
+        emulator = ApiEmulator()
+        if args.memory_check and args.collection == 'payments':
+            print(f"Loading {args.rows:,} synthetic payments into the emulator...")
+            load_synthetic_payments(emulator, args.rows, args.seed)
+            if not (args.date_from or args.date_to or args.property_id):
+                expected_rows = args.rows
+        session = EmulatorSession(emulator)
+
+    if not args.output and not args.memory_check:
+        parser.error("--output is required unless --memory-check is given")
+    output = args.output or os.path.join(tempfile.mkdtemp(), f"{args.collection}.{args.format}")
+
+    client = ExportClient(MyRentManagerTester(args.base_url, session), args.chunk_size)
+    sampler = MemorySampler() if args.memory_check else None
+    if sampler:
+        tracemalloc.start()
+    try:
+        result = client.download(args.collection, output, args.format, args.date_from, args.date_to,
+                                 args.property_id, sampler)
+    finally:
+        if sampler:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    print(f"Exported {result['rows']:,} rows ({result['bytes'] / 2**20:.1f} MiB) to {output} "
+          f"in {result['seconds']:.1f}s ({result['rows'] / result['seconds'] if result['seconds'] else 0:,.0f} rows/s)")
+
+    problems = []
+    if expected_rows is not None and result['rows'] != expected_rows:
+        problems.append(f"exported {result['rows']:,} rows, expected {expected_rows:,}")
+    if sampler:
+        print(f"\n{'ROWS':>12} | {'HEAP MiB':>9}")
+        print("-" * 25)
+        step = max(len(sampler.samples) // 10, 1)
+        for rows, mb in sampler.samples[::step]:
+            print(f"{rows:12,d} | {mb:9.2f}")
+        growth = sampler.growth()
+        print(f"Heap grew {growth:.2f} MiB over the export (peak {peak / 2**20:.2f} MiB)")
+        if growth > MEMORY_TOLERANCE_MB:
+            problems.append(f"heap grew {growth:.2f} MiB, more than {MEMORY_TOLERANCE_MB} MiB")
+        if not args.output:
+            os.remove(output)
+
+    for problem in problems:
+        print(f"❌ {problem}")
+    if sampler and not problems:
+        print("✅ Memory stayed flat while streaming the export")
+
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
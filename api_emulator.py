@@ -0,0 +1,1079 @@
+#!/usr/bin/env python3
+"""
+MyRentManager In-Process API Emulator
+Speaks the same routes and cascade semantics as app/api/[[...path]]/route.js,
+backed by indexed in-memory collections, so the backend tests can run offline.
+
+Select it with `--emulator` on the command line or MYRENTMANAGER_EMULATOR=1.
+"""
+
+import base64
+import bisect
+import calendar
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from itertools import count
+from urllib.parse import urlsplit, parse_qs
+
+from requests.structures import CaseInsensitiveDict
+
+EMULATOR_ENV_VAR = 'MYRENTMANAGER_EMULATOR'
+
+# Collections whose records are addressed by `id` in the single-record routes
+RECORD_COLLECTIONS = ('properties', 'tenants', 'payments', 'expenses')
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+MAX_BULK_ITEMS = 1000
+NOT_ATTEMPTED = 'Not attempted: an earlier item failed'
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Text cells starting with these are quoted as text, and cells containing these need quotes
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+CSV_QUOTED = re.compile(r'[",\r\n]')
+
+# Mirrors EXPORT_COLUMNS in route.js
+EXPORT_COLUMNS = {
+    'payments': ['id', 'date', 'tenantId', 'tenantName', 'propertyId', 'propertyName', 'amount', 'status', 'createdAt'],
+    'expenses': ['id', 'date', 'propertyId', 'propertyName', 'category', 'description', 'amount', 'createdAt'],
+}
+
+# Collections GET /api/changes reports on, and its defaults from route.js
+SYNC_COLLECTIONS = RECORD_COLLECTIONS + ('settings',)
+SYNC_OVERLAP_MS = int(os.environ.get('SYNC_OVERLAP_MS', '5000'))
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', '30'))
+# Rent statuses and the grace period of the rent-cycle job in route.js
+RENT_STATUSES = ('Paid', 'Pending', 'Overdue')
+RENT_GRACE_DAYS = int(os.environ.get('RENT_GRACE_DAYS', '5'))
+
+SYNC_TOKEN_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z')
+
+# Mirrors the corsHeaders constant in route.js
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, If-None-Match',
+    'Access-Control-Expose-Headers': 'ETag, Server-Timing, Content-Disposition',
+    'Timing-Allow-Origin': '*',
+}
+
+
+def emulator_requested(argv=None):
+    """True when the emulator was selected by flag or environment variable"""
+    if argv and '--emulator' in argv:
+        return True
+    return os.environ.get(EMULATOR_ENV_VAR, '').lower() in ('1', 'true', 'yes')
+
+
+def now_iso():
+    """ISO timestamp in the same format as JavaScript's toISOString()"""
+    return to_iso(datetime.now(timezone.utc))
+
+
+def to_iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}Z"
+
+
+def encode_sync_token(time_iso):
+    """Same token as encodeSyncToken() in route.js: unpadded base64url of the ISO time"""
+    return base64.urlsafe_b64encode(time_iso.encode('ascii')).rstrip(b'=').decode('ascii')
+
+
+def decode_sync_token(token):
+    try:
+        time_iso = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8')
+    except (ValueError, TypeError):
+        return None
+    return time_iso if SYNC_TOKEN_PATTERN.fullmatch(time_iso) else None
+
+
+def parse_float(value):
+    """Emulate parseFloat(): numbers pass through, junk becomes NaN (serialized as null)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def encode_cursor(doc, sort_field):
+    """Same token as encodeCursor() in route.js: unpadded base64url of JSON [sortValue, id]"""
+    raw = json.dumps([doc.get(sort_field), doc['id']], ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(token):
+    """Same checks as decodeCursor() in route.js: only [string | number | null, string] is a cursor"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(position, list) or len(position) != 2:
+        return None
+    value, doc_id = position
+    if isinstance(value, bool) or not (value is None or isinstance(value, (str, int, float))) \
+            or not isinstance(doc_id, str):
+        return None
+    return value, doc_id
+
+
+def sort_key(value, doc_id):
+    """Ascending key whose reverse is Mongo's (field desc, id desc) order with nulls last"""
+    return (value is not None, value if value is not None else '', doc_id)
+
+
+def rent_due_date(year, month, lease_day):
+    """Rent due date for a month given as (year, month), where month may run past either end of the year"""
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return date(year, month, min(lease_day, calendar.monthrange(year, month)[1])).isoformat()
+
+
+def rent_periods(as_of):
+    """Same table as rentPeriods() in route.js: per lease day 1-31, (due, previous due, and the
+    1st of each one's month), the due date being the latest on or before as_of"""
+    year, month = int(as_of[:4]), int(as_of[5:7])
+    periods = []
+    for lease_day in range(1, 32):
+        back = 0 if rent_due_date(year, month, lease_day) <= as_of else 1
+        due = rent_due_date(year, month - back, lease_day)
+        prev_due = rent_due_date(year, month - 1 - back, lease_day)
+        periods.append((due, prev_due, due[:7] + '-01', prev_due[:7] + '-01'))
+    return periods
+
+
+def js_string(value):
+    """String(value) as JavaScript writes numbers: 1350 rather than 1350.0, NaN for junk"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 'NaN'
+        return str(int(value)) if value.is_integer() else repr(value)
+    return str(value)
+
+
+def csv_cell(value):
+    """Same quoting as csvCell() in route.js"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        text = "'" + value if value.startswith(CSV_FORMULA_PREFIXES) else value
+    elif isinstance(value, (dict, list)):
+        text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = js_string(value)
+    return '"' + text.replace('"', '""') + '"' if CSV_QUOTED.search(text) else text
+
+
+def csv_row(values):
+    return ','.join(csv_cell(value) for value in values) + '\r\n'
+
+
+class StreamBody:
+    """Response body produced lazily as a sequence of byte chunks (like a ReadableStream)"""
+
+    def __init__(self, chunks, content_type, headers=None):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.headers = headers or {}
+
+
+class Collection:
+    """In-memory document store with a primary index on `id` and optional secondary indexes"""
+
+    _object_ids = count(1)
+
+    def __init__(self, name, indexed_fields=()):
+        self.name = name
+        self.docs = {}
+        self.indexes = {field: {} for field in indexed_fields}
+        self.sorted_views = {}
+        # Bumped on every write, like the `version:<name>` counters route.js keeps in Mongo
+        self.version = 0
+        # One per call that route.js makes as a single Mongo round trip
+        self.operations = 0
+
+    def _index_add(self, doc):
+        for field, index in self.indexes.items():
+            index.setdefault(doc.get(field), set()).add(doc['id'])
+
+    def _index_remove(self, doc):
+        for field, index in self.indexes.items():
+            ids = index.get(doc.get(field))
+            if ids:
+                ids.discard(doc['id'])
+                if not ids:
+                    del index[doc.get(field)]
+
+    def insert(self, doc):
+        self.operations += 1
+        return self._insert(doc)
+
+    def insert_many(self, docs):
+        self.operations += 1
+        return [self._insert(doc) for doc in docs]
+
+    def _insert(self, doc):
+        doc = dict(doc)
+        doc.setdefault('_id', f"{next(self._object_ids):024x}")
+        self.version += 1
+        self.sorted_views.clear()
+        self.docs[doc['id']] = doc
+        self._index_add(doc)
+        return doc
+
+    def get(self, doc_id):
+        self.operations += 1
+        return self.docs.get(doc_id)
+
+    def update(self, doc_id, fields):
+        """findOneAndUpdate: `fields` may be a function of the current document, like a pipeline update"""
+        self.operations += 1
+        return self._update(doc_id, fields)
+
+    def update_many(self, doc_ids, fields):
+        self.operations += 1
+        return [doc for doc in (self._update(doc_id, fields) for doc_id in doc_ids) if doc is not None]
+
+    def _update(self, doc_id, fields):
+        doc = self.docs.get(doc_id)
+        if doc is None:
+            return None
+        if callable(fields):
+            fields = fields(doc)
+        self._index_remove(doc)
+        self.version += 1
+        self.sorted_views.clear()
+        doc.update(fields)
+        self._index_add(doc)
+        return doc
+
+    def bulk_update(self, updates):
+        """bulkWrite of updateMany operations: `updates` is a list of (doc_ids, fields)"""
+        self.operations += 1
+        return [doc for doc_ids, fields in updates for doc in (self._update(doc_id, fields) for doc_id in doc_ids)
+                if doc is not None]
+
+    def upsert_by(self, field, value, fields, on_insert):
+        """findOneAndUpdate with upsert on a secondary field; `on_insert` applies only to a new document"""
+        self.operations += 1
+        found = self._find_by(field, value)
+        if found:
+            return self._update(found[0]['id'], fields)
+        return self._insert(dict(on_insert, **fields, **{field: value}))
+
+    def delete(self, doc_id):
+        self.operations += 1
+        doc = self.docs.pop(doc_id, None)
+        if doc is not None:
+            self.version += 1
+            self.sorted_views.clear()
+            self._index_remove(doc)
+        return doc
+
+    def find_by(self, field, value):
+        self.operations += 1
+        return self._find_by(field, value)
+
+    def find_changed(self, since):
+        """Documents created or updated after `since` (every document when None), as GET /api/changes finds them"""
+        self.operations += 1
+        if since is None:
+            return list(self.docs.values())
+        return [doc for doc in self.docs.values()
+                if (doc.get('updatedAt') or '') > since or (doc.get('createdAt') or '') > since]
+
+    def _find_by(self, field, value):
+        if field in self.indexes:
+            return [self.docs[doc_id] for doc_id in self.indexes[field].get(value, ())]
+        return [doc for doc in self.docs.values() if doc.get(field) == value]
+
+    def sorted_view(self, sort_field):
+        """Ascending (keys, docs) on sort_field, cached until the next write"""
+        if sort_field not in self.sorted_views:
+            docs = sorted(self.docs.values(), key=lambda d: sort_key(d.get(sort_field), d['id']))
+            keys = [sort_key(d.get(sort_field), d['id']) for d in docs]
+            self.sorted_views[sort_field] = (keys, docs)
+        return self.sorted_views[sort_field]
+
+    def find_range(self, sort_field, low=None, high=None):
+        """Documents with low <= sort_field <= high (either bound optional) in ascending (sort_field, id)
+        order, produced lazily from the sorted view as it was when the call was made"""
+        self.operations += 1
+        keys, docs = self.sorted_view(sort_field)
+        start = bisect.bisect_left(keys, (True, low, '')) if low is not None else 0
+        end = bisect.bisect_right(keys, (True, high, '\U0010ffff')) if high is not None else len(docs)
+        return (docs[i] for i in range(start, end))
+
+    def find_sorted(self, sort_field, after=None, limit=None):
+        """Documents in (sort_field desc, id desc) order, optionally strictly after a cursor position"""
+        self.operations += 1
+        keys, docs = self.sorted_view(sort_field)
+        end = bisect.bisect_left(keys, sort_key(*after)) if after else len(docs)
+        start = max(end - limit, 0) if limit else 0
+        return docs[start:end][::-1]
+
+    def clear(self):
+        self.version += 1
+        self.sorted_views.clear()
+        self.docs.clear()
+        for index in self.indexes.values():
+            index.clear()
+
+
+class ApiEmulator:
+    """Route handlers equivalent to route.js over in-memory collections"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.properties = Collection('properties')
+        self.tenants = Collection('tenants', indexed_fields=('propertyId',))
+        self.payments = Collection('payments', indexed_fields=('tenantId', 'propertyId'))
+        self.expenses = Collection('expenses', indexed_fields=('propertyId',))
+        self.settings = Collection('settings', indexed_fields=('type',))
+        # {collection, id, deletedAt} per deleted record, like the tombstone documents in `meta`
+        self.tombstones = []
+        # The in-memory store has no connection to open; these mirror poolStats in route.js as
+        # if one client with one pooled connection were opened by the first database request
+        self.started = time.monotonic()
+        self.connected = False
+        self.pool = {'clientsCreated': 0, 'connectionsCreated': 0, 'connectionsClosed': 0}
+
+    def reset(self):
+        with self.lock:
+            for collection in (self.properties, self.tenants, self.payments, self.expenses, self.settings):
+                collection.clear()
+            self.tombstones.clear()
+
+    def record_delete(self, collection, doc_id):
+        self.tombstones.append({'collection': collection.name, 'id': doc_id, 'deletedAt': now_iso()})
+
+    # ==================== PAGINATION ====================
+
+    def list_collection(self, collection, sort_field, query):
+        """Full array by default; `limit`/`cursor` switch to keyset pages, `format=ndjson` streams records"""
+        limit_param = query.get('limit')
+        cursor_param = query.get('cursor')
+        streaming = query.get('format') == 'ndjson'
+
+        if not limit_param and not cursor_param and not streaming:
+            return 200, collection.find_sorted(sort_field)
+
+        after = None
+        if cursor_param:
+            after = decode_cursor(cursor_param)
+            if after is None:
+                return 400, {'error': 'Invalid cursor'}
+
+        if streaming:
+            limit = max(_parse_int(limit_param) or 0, 0)
+            docs = collection.find_sorted(sort_field, after, limit or None)
+            return 200, StreamBody(self.ndjson_chunks(docs), 'application/x-ndjson')
+
+        limit = min(max(_parse_int(limit_param) or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+        docs = collection.find_sorted(sort_field, after, limit + 1)
+        items = docs[:limit]
+        next_cursor = encode_cursor(items[-1], sort_field) if len(docs) > limit else None
+        return 200, {'items': items, 'next': next_cursor}
+
+    def ndjson_chunks(self, docs):
+        return self.stream_chunks(iter(docs), ndjson_line)
+
+    def stream_chunks(self, docs, encode, head=''):
+        """Encode documents a chunk at a time so a stream never holds the whole body, like streamCursor()"""
+        chunk = head
+        while True:
+            with self.lock:
+                for doc in docs:
+                    chunk += encode(doc)
+                    if len(chunk) >= STREAM_CHUNK_SIZE:
+                        break
+                else:
+                    if chunk:
+                        yield chunk.encode('utf-8')
+                    return
+            yield chunk.encode('utf-8')
+            chunk = ''
+
+    # ==================== BULK ====================
+
+    def insert_bulk(self, collection, body, build):
+        """Same contract as insertBulk() in route.js; raises ValueError for a malformed envelope"""
+        items = body if isinstance(body, list) else (body or {}).get('items')
+        ordered = isinstance(body, dict) and body.get('ordered') is True
+        if not isinstance(items, list) or not 0 < len(items) <= MAX_BULK_ITEMS:
+            raise ValueError(f"Expected between 1 and {MAX_BULK_ITEMS} items")
+
+        records, errors = [], []
+        for index, item in enumerate(items):
+            record = build(item) if isinstance(item, dict) else None
+            if record and isinstance(record['amount'], float) and math.isfinite(record['amount']) \
+                    and isinstance(record['date'], str):
+                records.append(record)
+                continue
+            errors.append({'index': index, 'error': 'Item must be an object with a numeric amount and a date'})
+            if ordered:
+                errors.extend({'index': rest, 'error': NOT_ATTEMPTED} for rest in range(index + 1, len(items)))
+                break
+        return (collection.insert_many(records) if records else []), errors
+
+    # ==================== SINGLE RECORD ====================
+
+    def get_record(self, collection, record_id):
+        record = collection.get(record_id)
+        if record is None:
+            return 404, {'error': 'Not found'}
+        return 200, record
+
+    # ==================== PROPERTIES ====================
+
+    def get_properties(self, query):
+        return self.list_collection(self.properties, 'createdAt', query)
+
+    def create_property(self, body):
+        prop = self.properties.insert({
+            'id': str(uuid.uuid4()),
+            'name': body.get('name'),
+            'address': body.get('address'),
+            'type': body.get('type'),
+            'monthlyRent': parse_float(body.get('monthlyRent')),
+            'status': body.get('status') or 'Vacant',
+            'tenantCount': 0,
+            'createdAt': now_iso(),
+        })
+        return 201, prop
+
+    def update_property(self, body, prop_id):
+        updated = self.properties.update(prop_id, {
+            'name': body.get('name'),
+            'address': body.get('address'),
+            'type': body.get('type'),
+            'monthlyRent': parse_float(body.get('monthlyRent')),
+            'status': body.get('status'),
+            'updatedAt': now_iso(),
+        })
+        return 200, updated
+
+    def delete_property(self, prop_id):
+        if self.properties.delete(prop_id):
+            self.record_delete(self.properties, prop_id)
+        return 200, {'success': True}
+
+    # ==================== TENANTS ====================
+
+    def get_tenants(self, query):
+        return self.list_collection(self.tenants, 'createdAt', query)
+
+    def create_tenant(self, body):
+        tenant = self.tenants.insert({
+            'id': str(uuid.uuid4()),
+            'name': body.get('name'),
+            'email': body.get('email'),
+            'phone': body.get('phone'),
+            'propertyId': body.get('propertyId'),
+            'propertyName': body.get('propertyName'),
+            'monthlyRent': parse_float(body.get('monthlyRent')),
+            'leaseStart': body.get('leaseStart'),
+            'leaseEnd': body.get('leaseEnd'),
+            'rentStatus': body.get('rentStatus') or 'Pending',
+            'createdAt': now_iso(),
+        })
+
+        # Update property status to Occupied, counting tenants as route.js does
+        if body.get('propertyId'):
+            self.properties.update(body['propertyId'],
+                                   lambda prop: {'tenantCount': (prop.get('tenantCount') or 0) + 1, 'status': 'Occupied',
+                                                 'updatedAt': now_iso()})
+
+        return 201, tenant
+
+    def update_tenant(self, body, tenant_id):
+        updated = self.tenants.update(tenant_id, {
+            'name': body.get('name'),
+            'email': body.get('email'),
+            'phone': body.get('phone'),
+            'propertyId': body.get('propertyId'),
+            'propertyName': body.get('propertyName'),
+            'monthlyRent': parse_float(body.get('monthlyRent')),
+            'leaseStart': body.get('leaseStart'),
+            'leaseEnd': body.get('leaseEnd'),
+            'rentStatus': body.get('rentStatus'),
+            'updatedAt': now_iso(),
+        })
+        return 200, updated
+
+    def delete_tenant(self, tenant_id):
+        tenant = self.tenants.delete(tenant_id)
+        if tenant:
+            self.record_delete(self.tenants, tenant_id)
+
+        # Update property status to Vacant once its last tenant is gone
+        if tenant and tenant.get('propertyId'):
+            self.properties.update(tenant['propertyId'], vacate)
+
+        return 200, {'success': True}
+
+    # ==================== PAYMENTS ====================
+
+    def get_payments(self, query):
+        return self.list_collection(self.payments, 'date', query)
+
+    def build_payment(self, body):
+        return {
+            'id': str(uuid.uuid4()),
+            'tenantId': body.get('tenantId'),
+            'tenantName': body.get('tenantName'),
+            'propertyId': body.get('propertyId'),
+            'propertyName': body.get('propertyName'),
+            'amount': parse_float(body.get('amount')),
+            'date': body.get('date'),
+            'status': body.get('status') or 'Paid',
+            'createdAt': now_iso(),
+        }
+
+    def create_payment(self, body):
+        payment = self.payments.insert(self.build_payment(body))
+
+        # Update tenant rent status
+        if body.get('tenantId'):
+            self.tenants.update(body['tenantId'], {'rentStatus': 'Paid', 'updatedAt': now_iso()})
+
+        return 201, payment
+
+    def create_payments_bulk(self, body):
+        try:
+            inserted, errors = self.insert_bulk(self.payments, body, self.build_payment)
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+        # Update tenant rent status for every tenant that got a payment, in one write
+        tenant_ids = {p['tenantId'] for p in inserted if p.get('tenantId')}
+        if tenant_ids:
+            self.tenants.update_many(tenant_ids, {'rentStatus': 'Paid', 'updatedAt': now_iso()})
+
+        return bulk_response(inserted, errors)
+
+    def delete_payment(self, payment_id):
+        if self.payments.delete(payment_id):
+            self.record_delete(self.payments, payment_id)
+        return 200, {'success': True}
+
+    # ==================== EXPENSES ====================
+
+    def get_expenses(self, query):
+        return self.list_collection(self.expenses, 'date', query)
+
+    def build_expense(self, body):
+        return {
+            'id': str(uuid.uuid4()),
+            'propertyId': body.get('propertyId'),
+            'propertyName': body.get('propertyName'),
+            'description': body.get('description'),
+            'amount': parse_float(body.get('amount')),
+            'date': body.get('date'),
+            'category': body.get('category'),
+            'createdAt': now_iso(),
+        }
+
+    def create_expense(self, body):
+        expense = self.expenses.insert(self.build_expense(body))
+        return 201, expense
+
+    def create_expenses_bulk(self, body):
+        try:
+            inserted, errors = self.insert_bulk(self.expenses, body, self.build_expense)
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        return bulk_response(inserted, errors)
+
+    def delete_expense(self, expense_id):
+        if self.expenses.delete(expense_id):
+            self.record_delete(self.expenses, expense_id)
+        return 200, {'success': True}
+
+    # ==================== SETTINGS ====================
+
+    def _app_settings(self):
+        found = self.settings.find_by('type', 'app_settings')
+        return found[0] if found else None
+
+    def get_settings(self, query):
+        settings = self._app_settings()
+        if not settings:
+            settings = self.settings.upsert_by('type', 'app_settings', {}, {
+                'id': str(uuid.uuid4()),
+                'currency': '₺',
+                'notifications': True,
+                'createdAt': now_iso(),
+            })
+        return 200, settings
+
+    def update_settings(self, body):
+        fields = {'currency': body.get('currency'), 'notifications': body.get('notifications'), 'updatedAt': now_iso()}
+        settings = self.settings.upsert_by('type', 'app_settings', fields,
+                                           {'id': str(uuid.uuid4()), 'createdAt': now_iso()})
+        return 200, settings
+
+    # ==================== STATS ====================
+
+    def get_stats(self, query):
+        """Same figures as the aggregation pipeline behind GET /api/stats"""
+        today = now_iso()[:10]
+        month = query.get('month') or today[:7]
+        if not re.fullmatch(r'\d{4}-\d{2}', month):
+            return 400, {'error': 'month must be YYYY-MM'}
+        year = month[:4]
+
+        def number(value):
+            return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+        properties = self.properties.docs.values()
+        tenants = list(self.tenants.docs.values())
+        paid = [t for t in tenants if t.get('rentStatus') == 'Paid']
+        pending = [t for t in tenants if t.get('rentStatus') == 'Pending']
+        overdue = [t for t in tenants if t.get('rentStatus') == 'Overdue']
+        stats = {
+            'month': month,
+            'totalProperties': len(self.properties.docs),
+            'occupiedProperties': sum(1 for p in properties if p.get('status') == 'Occupied'),
+            'totalTenants': len(tenants),
+            'paidTenants': len(paid),
+            'pendingTenants': len(pending),
+            'overdueTenants': len(overdue),
+            'expiredLeases': sum(1 for t in tenants
+                                 if isinstance(t.get('leaseEnd'), str) and '' < t['leaseEnd'] < today),
+            'monthlyIncome': sum(number(t.get('monthlyRent')) for t in paid),
+            'rentDue': sum(number(t.get('monthlyRent')) for t in pending + overdue),
+            'monthlyExpenses': 0,
+            'monthlyExpenseCount': 0,
+        }
+
+        chart = [{'month': name, 'income': 0, 'expenses': 0} for name in MONTH_NAMES]
+        for collection, field in ((self.payments, 'income'), (self.expenses, 'expenses')):
+            for doc in collection.docs.values():
+                date = doc.get('date')
+                if not isinstance(date, str) or date[:4] != year:
+                    continue
+                index = int(date[5:7]) - 1 if date[5:7].isdigit() else -1
+                if 0 <= index < 12:
+                    chart[index][field] += number(doc.get('amount'))
+                if field == 'expenses' and date[:7] == month:
+                    stats['monthlyExpenses'] += number(doc.get('amount'))
+                    stats['monthlyExpenseCount'] += 1
+        stats['chart'] = chart
+        stats['netIncome'] = stats['monthlyIncome'] - stats['monthlyExpenses']
+        return 200, stats
+
+    # ==================== RENT CYCLE ====================
+
+    def run_rent_cycle(self, body):
+        """Same rules as rentCyclePipeline() in route.js: a payment covers a period it was made in or
+        after, oldest first; Paid when every owed period is covered, else Overdue once the oldest
+        unpaid due date is past the grace days, else Pending; only for running leases"""
+        body = body or {}
+        as_of = body.get('asOf') or now_iso()[:10]
+        tenant_ids = body.get('tenantIds')
+        try:
+            as_of_day = date.fromisoformat(as_of) if re.fullmatch(r'\d{4}-\d{2}-\d{2}', as_of) else None
+        except (TypeError, ValueError):
+            as_of_day = None
+        if as_of_day is None:
+            return 400, {'error': 'asOf must be YYYY-MM-DD'}
+        if tenant_ids is not None and not (isinstance(tenant_ids, list) and all(isinstance(i, str) for i in tenant_ids)):
+            return 400, {'error': 'tenantIds must be an array of strings'}
+        periods = rent_periods(as_of)
+        late_before = (as_of_day - timedelta(days=RENT_GRACE_DAYS)).isoformat()
+        payment_dates = {}
+        for payment in self.payments.docs.values():
+            if isinstance(payment.get('date'), str) and payment['date'] <= as_of:
+                payment_dates.setdefault(payment.get('tenantId'), []).append(payment['date'])
+
+        if tenant_ids is None:
+            tenants = self.tenants.docs.values()
+        else:
+            tenants = [doc for doc in map(self.tenants.get, dict.fromkeys(tenant_ids)) if doc is not None]
+        groups = {}
+        for tenant in tenants:
+            lease_start, lease_end = tenant.get('leaseStart'), tenant.get('leaseEnd')
+            if not isinstance(lease_start, str) or lease_start > as_of:
+                continue
+            if lease_end not in (None, '') and not (isinstance(lease_end, str) and lease_end >= as_of):
+                continue
+            lease_day = _parse_int(lease_start[8:10])
+            due, prev_due, due_start, prev_start = periods[min(max(1 if lease_day is None else lease_day, 1), 31) - 1]
+            owed = 2 if prev_due >= lease_start[:10] else 1
+            since = prev_start if owed == 2 else due_start
+            window = [paid_on for paid_on in payment_dates.get(tenant['id'], ()) if paid_on >= since]
+            paid = len(window)
+            if paid >= owed and max(window) >= due_start:
+                status = 'Paid'
+            elif (prev_due if paid < owed - 1 else due) < late_before:
+                status = 'Overdue'
+            else:
+                status = 'Pending'
+            if tenant.get('rentStatus') != status:
+                groups.setdefault(status, []).append(tenant['id'])
+
+        updated = []
+        if groups:
+            updated = self.tenants.bulk_update([(ids, {'rentStatus': status, 'updatedAt': now_iso()})
+                                                for status, ids in groups.items()])
+        return 200, {
+            'asOf': as_of,
+            'graceDays': RENT_GRACE_DAYS,
+            'updated': len(updated),
+            'skipped': sum(len(ids) for ids in groups.values()) - len(updated),
+            'transitions': {status: len(groups.get(status, ())) for status in RENT_STATUSES},
+        }
+
+    # ==================== EXPORT ====================
+
+    def export_collection(self, name, query):
+        """Same contract as exportCollection() in route.js: CSV or NDJSON, oldest first, streamed"""
+        fmt = query.get('format') or 'csv'
+        date_from, date_to = query.get('from'), query.get('to')
+        day = re.compile(r'\d{4}-\d{2}-\d{2}')
+        if fmt not in ('csv', 'ndjson') or (date_from and not day.fullmatch(date_from)) \
+                or (date_to and not day.fullmatch(date_to)):
+            return 400, {'error': 'format must be csv or ndjson; from and to must be YYYY-MM-DD'}
+
+        docs = getattr(self, name).find_range('date', date_from or None, date_to or None)
+        if date_from or date_to:
+            # Range bounds only match strings, as $gte/$lte do
+            docs = (doc for doc in docs if isinstance(doc.get('date'), str))
+        if query.get('propertyId'):
+            docs = (doc for doc in docs if doc.get('propertyId') == query['propertyId'])
+        docs = ({key: value for key, value in doc.items() if key != '_id'} for doc in docs)
+
+        headers = {
+            'Content-Disposition': f'attachment; filename="{name}-{date_from or "start"}-{date_to or "end"}.{fmt}"',
+            'Cache-Control': 'no-store',
+        }
+        if fmt == 'ndjson':
+            return 200, StreamBody(self.stream_chunks(docs, ndjson_line), 'application/x-ndjson', headers)
+        columns = EXPORT_COLUMNS[name]
+        return 200, StreamBody(self.stream_chunks(docs, lambda doc: csv_row(doc.get(c) for c in columns), csv_row(columns)),
+                               'text/csv; charset=utf-8', headers)
+
+    # ==================== SYNC ====================
+
+    def get_changes(self, query):
+        """Same contract as getChanges() in route.js: a full reset without a (recent) token, else a delta"""
+        token = query.get('since')
+        started = datetime.now(timezone.utc)
+        since = decode_sync_token(token) if token else None
+        if token and not since:
+            return 400, {'error': 'Invalid sync token'}
+
+        # Tombstones past their retention are gone, as the TTL index on expiresAt removes them
+        horizon = to_iso(started - timedelta(days=TOMBSTONE_RETENTION_DAYS))
+        self.tombstones = [t for t in self.tombstones if t['deletedAt'] > horizon]
+
+        reset = not since or since < horizon
+        after = None if reset else to_iso(
+            datetime.strptime(since, '%Y-%m-%dT%H:%M:%S.%f%z') - timedelta(milliseconds=SYNC_OVERLAP_MS))
+        deleted = {name: [] for name in SYNC_COLLECTIONS}
+        if not reset:
+            for tombstone in self.tombstones:
+                if tombstone['deletedAt'] > after:
+                    deleted[tombstone['collection']].append(tombstone['id'])
+        return 200, {
+            'token': encode_sync_token(to_iso(started)),
+            'reset': reset,
+            'upserted': {name: getattr(self, name).find_changed(after) for name in SYNC_COLLECTIONS},
+            'deleted': deleted,
+        }
+
+    # ==================== HEALTH ====================
+
+    def connect(self):
+        if not self.connected:
+            self.connected = True
+            self.pool['clientsCreated'] += 1
+            self.pool['connectionsCreated'] += 1
+
+    def get_health(self):
+        warm = self.connected
+        self.connect()
+        return 200, {
+            'status': 'ok',
+            'warm': warm,
+            'uptimeMs': round((time.monotonic() - self.started) * 1000),
+            'pool': {'maxPoolSize': None, 'minPoolSize': None, **self.pool,
+                     'open': self.pool['connectionsCreated'] - self.pool['connectionsClosed']},
+        }
+
+    # ==================== CONDITIONAL GET ====================
+
+    def etag(self, path, query):
+        """Weak ETag for a GET, built like conditionalGet() in route.js; None for untagged routes"""
+        parts = path.split('/')
+        extra = ''
+        if parts[0] in RECORD_COLLECTIONS or path == 'settings':
+            names = [parts[0]]
+        elif path == 'stats':
+            names = list(RECORD_COLLECTIONS)
+            # The current day moves expiredLeases
+            extra = now_iso()[:10]
+        else:
+            return None
+        versions = '.'.join(str(getattr(self, name).version) for name in names)
+        search = '&'.join(f"{key}={value}" for key, value in sorted(query.items()))
+        digest = hashlib.sha1(f"/api/{path}?{search}|{extra}".encode('utf-8')).digest()
+        return f'W/"{versions}-{base64.urlsafe_b64encode(digest).decode("ascii")[:16]}"'
+
+    def counters(self):
+        """{collection name: (operations, version)} snapshot for round_trips()"""
+        return {c.name: (c.operations, c.version)
+                for c in (self.properties, self.tenants, self.payments, self.expenses, self.settings)}
+
+    def round_trips(self, path, before, after, versioned):
+        """Calls per phase that route.js would make for this request: db on the routed collection,
+        cascade on the others, and one meta call to read (GET) or bump (write) version counters"""
+        primary = path.split('/')[0]
+        calls = {'db': 0, 'cascade': 0, 'meta': 0}
+        for name, (operations, version) in after.items():
+            # GET /api/changes reads every collection as part of one parallel batch
+            phase = 'db' if name == primary or primary == 'changes' else 'cascade'
+            calls[phase] += operations - before[name][0]
+            if version != before[name][1]:
+                calls['meta'] = 1
+        if versioned or primary == 'changes':
+            calls['meta'] = 1
+        return calls
+
+    # ==================== MAIN ROUTER ====================
+
+    def handle(self, method, path, body=None, query=None):
+        """Dispatch a request the same way the exported GET/POST/PUT/DELETE handlers do"""
+        query = query or {}
+        parts = path.split('/')
+        with self.lock:
+            # Every route but the root message and the health probe goes through getCollection()
+            if path not in ('', 'health') and method != 'OPTIONS':
+                self.connect()
+            if method == 'GET':
+                if path == 'properties': return self.get_properties(query)
+                if path == 'tenants': return self.get_tenants(query)
+                if path == 'payments': return self.get_payments(query)
+                if path == 'expenses': return self.get_expenses(query)
+                if path == 'settings': return self.get_settings(query)
+                if path == 'stats': return self.get_stats(query)
+                if path == 'changes': return self.get_changes(query)
+                if path == 'health': return self.get_health()
+                if parts[0] == 'export' and len(parts) == 2 and parts[1] in EXPORT_COLUMNS:
+                    return self.export_collection(parts[1], query)
+                if parts[0] in RECORD_COLLECTIONS and len(parts) > 1 and parts[1]:
+                    return self.get_record(getattr(self, parts[0]), parts[1])
+                return 200, {'message': 'API is running'}
+
+            if method == 'POST':
+                if path == 'properties': return self.create_property(body or {})
+                if path == 'tenants': return self.create_tenant(body or {})
+                if path == 'payments': return self.create_payment(body or {})
+                if path == 'expenses': return self.create_expense(body or {})
+                if path == 'payments/bulk': return self.create_payments_bulk(body)
+                if path == 'expenses/bulk': return self.create_expenses_bulk(body)
+                if path == 'rent-cycle': return self.run_rent_cycle(body)
+
+            if method == 'PUT':
+                if parts[0] == 'properties' and len(parts) > 1 and parts[1]:
+                    return self.update_property(body or {}, parts[1])
+                if parts[0] == 'tenants' and len(parts) > 1 and parts[1]:
+                    return self.update_tenant(body or {}, parts[1])
+                if path == 'settings':
+                    return self.update_settings(body or {})
+
+            if method == 'DELETE':
+                if parts[0] == 'properties' and len(parts) > 1 and parts[1]:
+                    return self.delete_property(parts[1])
+                if parts[0] == 'tenants' and len(parts) > 1 and parts[1]:
+                    return self.delete_tenant(parts[1])
+                if parts[0] == 'payments' and len(parts) > 1 and parts[1]:
+                    return self.delete_payment(parts[1])
+                if parts[0] == 'expenses' and len(parts) > 1 and parts[1]:
+                    return self.delete_expense(parts[1])
+
+            if method == 'OPTIONS':
+                return 200, {}
+
+        return 404, {'error': 'Not found'}
+
+
+class EmulatorResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code, payload, url, headers=None):
+        self.status_code = status_code
+        self.url = url
+        self._chunks = None
+        if isinstance(payload, StreamBody):
+            self._content = None
+            self._chunks = iter(payload.chunks)
+            content_type = payload.content_type
+            headers = {**payload.headers, **(headers or {})}
+        elif payload is None:
+            # 304 Not Modified carries no body
+            self._content = b''
+            content_type = 'application/json'
+        else:
+            self._content = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            content_type = 'application/json'
+        self.headers = CaseInsensitiveDict({'Content-Type': content_type, **CORS_HEADERS})
+        if self._content is not None:
+            self.headers['Content-Length'] = str(len(self._content))
+        if headers:
+            self.headers.update(headers)
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def __bool__(self):
+        # requests.Response is falsy for 4xx/5xx, and the tester relies on that
+        return self.ok
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = b''.join(self._chunks)
+        return self._content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        if self._content is None:
+            yield from self._chunks
+            return
+        for start in range(0, len(self._content), chunk_size):
+            yield self._content[start:start + chunk_size]
+
+    def iter_lines(self, chunk_size=512, decode_unicode=False):
+        pending = b''
+        for chunk in self.iter_content(chunk_size):
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line.decode('utf-8') if decode_unicode else line
+        if pending:
+            yield pending.decode('utf-8') if decode_unicode else pending
+
+    def close(self):
+        pass
+
+
+class EmulatorSession:
+    """Drop-in replacement for requests.Session that routes calls into an ApiEmulator"""
+
+    def __init__(self, emulator=None):
+        self.emulator = emulator or ApiEmulator()
+        self.headers = CaseInsensitiveDict()
+
+    def request(self, method, url, json=None, headers=None, **kwargs):
+        parts = urlsplit(url)
+        path = parts.path.strip('/')
+        # The tester addresses routes relative to the base URL, with or without the /api prefix
+        if path.startswith('api/') or path == 'api':
+            path = path[4:]
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        # Round-trip the body through JSON so handlers never share objects with the caller
+        body = None if json is None else _json_roundtrip(json)
+        # Serialize under the emulator lock so concurrent writers never race the encoder
+        with self.emulator.lock:
+            start = time.perf_counter()
+            etag = self.emulator.etag(path, query) if method.upper() == 'GET' else None
+            if etag:
+                cache_headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+                if etag_matches(CaseInsensitiveDict(headers or {}).get('If-None-Match'), etag):
+                    response = EmulatorResponse(304, None, url, cache_headers)
+                    response.headers['Server-Timing'] = server_timing(
+                        {'meta': 0.0, 'total': time.perf_counter() - start}, {'meta': 1})
+                    return response
+            before = self.emulator.counters()
+            status, payload = self.emulator.handle(method.upper(), path, body, query)
+            handled = time.perf_counter()
+            if etag and status == 200:
+                response_headers = cache_headers
+            else:
+                # The health probe must never be answered from a cache
+                response_headers = {'Cache-Control': 'no-store'} if path == 'health' else None
+            response = EmulatorResponse(status, payload, url, response_headers)
+            done = time.perf_counter()
+            response.headers['Server-Timing'] = server_timing(
+                {'db': handled - start, 'cascade': 0.0, 'meta': 0.0, 'serialize': done - handled, 'total': done - start},
+                self.emulator.round_trips(path, before, self.emulator.counters(), bool(etag)))
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def options(self, url, **kwargs):
+        return self.request('OPTIONS', url, **kwargs)
+
+    def post(self, url, json=None, **kwargs):
+        return self.request('POST', url, json=json, **kwargs)
+
+    def put(self, url, json=None, **kwargs):
+        return self.request('PUT', url, json=json, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        pass
+
+
+def ndjson_line(doc):
+    return json.dumps(doc, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def bulk_response(inserted, errors):
+    """201 when every item was inserted, 207 for partial success, 400 when nothing was"""
+    status = 201 if not errors else 207 if inserted else 400
+    return status, {'inserted': len(inserted), 'failed': len(errors), 'items': inserted, 'errors': errors}
+
+
+def vacate(prop):
+    """Property fields after one tenant leaves, as the pipeline update in deleteTenant() computes them"""
+    remaining = max((prop.get('tenantCount') or 0) - 1, 0)
+    return {'tenantCount': remaining, 'status': 'Occupied' if remaining > 0 else 'Vacant', 'updatedAt': now_iso()}
+
+
+def server_timing(phases, calls=None):
+    """Server-Timing header value from phase durations in seconds and call counts, as withTiming() writes it"""
+    calls = calls or {}
+    return ', '.join(f"{phase};dur={seconds * 1000:.2f}" + (f';desc="{calls[phase]}"' if phase in calls else '')
+                     for phase, seconds in phases.items())
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match comparison, as etagMatches() in route.js"""
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == '*' or any(tag.strip() == etag for tag in if_none_match.split(','))
+
+
+def _parse_int(value):
+    """parseInt() for query parameters: None when missing or not a number"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _json_roundtrip(data):
+    return json.loads(json.dumps(data))
@@ -1,28 +1,130 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import { createHash } from 'crypto';
 import { MongoClient, ObjectId } from 'mongodb';
 import { NextResponse } from 'next/server';
 import { v4 as uuidv4 } from 'uuid';
+import indexSpecs from '@/lib/indexes.json';
 
 let client;
-let db;
+let dbPromise;
 
-async function connectDB() {
-  if (db) return db;
-  
+// Pool sizing and timeouts; the driver's own defaults apply to anything not listed
+const MONGO_OPTIONS = {
+  maxPoolSize: parseInt(process.env.MONGO_MAX_POOL_SIZE || '20', 10),
+  minPoolSize: parseInt(process.env.MONGO_MIN_POOL_SIZE || '0', 10),
+  maxIdleTimeMS: parseInt(process.env.MONGO_MAX_IDLE_TIME_MS || '60000', 10),
+  serverSelectionTimeoutMS: parseInt(process.env.MONGO_SERVER_SELECTION_TIMEOUT_MS || '5000', 10),
+  connectTimeoutMS: parseInt(process.env.MONGO_CONNECT_TIMEOUT_MS || '10000', 10),
+};
+
+// Counted from the driver's pool events and reported by GET /api/health
+const poolStats = { clientsCreated: 0, connectionsCreated: 0, connectionsClosed: 0 };
+
+// Collections whose records are addressed by `id` in the single-record routes
+const RECORD_COLLECTIONS = ['properties', 'tenants', 'payments', 'expenses'];
+
+// Idempotent: createIndexes is a no-op for indexes that already exist with the same options.
+// An existing index on the same key with other options (settings.type from before it was
+// unique) is rebuilt. The same specs drive index_check.py, which explains the hot queries.
+async function ensureIndexes(database) {
+  await migrateLegacyData(database);
+  await Promise.all(
+    Object.entries(indexSpecs).map(async ([name, specs]) => {
+      const collection = database.collection(name);
+      try {
+        await collection.createIndexes(specs);
+      } catch (error) {
+        // IndexOptionsConflict / IndexKeySpecsConflict
+        if (error.code !== 85 && error.code !== 86) throw error;
+        const existing = await collection.indexes();
+        for (const spec of specs) {
+          const stale = existing.find((index) =>
+            JSON.stringify(index.key) === JSON.stringify(spec.key) && Boolean(index.unique) !== Boolean(spec.unique)
+          );
+          if (stale) await collection.dropIndex(stale.name);
+        }
+        await collection.createIndexes(specs);
+      }
+    })
+  );
+}
+
+// One-time fixes for documents written by older versions; each is a no-op once applied
+async function migrateLegacyData(database) {
+  // Racing first reads could insert a second settings document before settings.type was
+  // unique; keep the first one inserted, which is the one findOne() has been returning
+  const settings = database.collection('settings');
+  const duplicates = await settings
+    .find({ type: 'app_settings' }, { projection: { _id: 1 } })
+    .sort({ _id: 1 })
+    .skip(1)
+    .toArray();
+  if (duplicates.length) {
+    await settings.deleteMany({ _id: { $in: duplicates.map(({ _id }) => _id) } });
+  }
+
+  // Properties from before tenantCount existed get it counted from their tenants, so that
+  // createTenant's $inc and deleteTenant's decrement both start from the real number
+  await database.collection('properties').aggregate([
+    { $match: { tenantCount: { $exists: false } } },
+    { $lookup: {
+      from: 'tenants',
+      localField: 'id',
+      foreignField: 'propertyId',
+      pipeline: [{ $project: { _id: 1 } }],
+      as: 'tenants',
+    } },
+    { $project: { tenantCount: { $size: '$tenants' } } },
+    { $merge: { into: 'properties', on: '_id', whenMatched: 'merge', whenNotMatched: 'discard' } },
+  ]).toArray();
+}
+
+// Upserts on a unique key race: the loser of two concurrent inserts gets a duplicate-key error
+// and, run again, matches the document the winner inserted
+async function retryOnDuplicateKey(operation) {
   try {
-    client = new MongoClient(process.env.MONGO_URL);
-    await client.connect();
-    db = client.db('myrentmanager');
+    return await operation();
+  } catch (error) {
+    if (error.code !== 11000) throw error;
+    return operation();
+  }
+}
+
+// Single flight: requests arriving while the first connect is in progress await the same
+// promise instead of each opening a client. A failed attempt is forgotten so the next
+// request retries.
+function connectDB() {
+  if (!dbPromise) {
+    dbPromise = openDB().catch((error) => {
+      dbPromise = null;
+      throw error;
+    });
+  }
+  return dbPromise;
+}
+
+async function openDB() {
+  const mongo = new MongoClient(process.env.MONGO_URL, MONGO_OPTIONS);
+  poolStats.clientsCreated += 1;
+  mongo.on('connectionCreated', () => { poolStats.connectionsCreated += 1; });
+  mongo.on('connectionClosed', () => { poolStats.connectionsClosed += 1; });
+  try {
+    await mongo.connect();
+    const database = mongo.db('myrentmanager');
+    await ensureIndexes(database);
+    client = mongo;
     console.log('Connected to MongoDB');
-    return db;
+    return database;
   } catch (error) {
     console.error('MongoDB connection error:', error);
+    await mongo.close().catch(() => {});
     throw error;
   }
 }
 
 // Helper to get collections
 async function getCollection(name) {
-  const database = await connectDB();
+  const database = await timed('connect', connectDB);
   return database.collection(name);
 }
 
@@ -30,19 +132,350 @@ async function getCollection(name) {
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-  'Access-Control-Allow-Headers': 'Content-Type',
+  'Access-Control-Allow-Headers': 'Content-Type, If-None-Match',
+  'Access-Control-Expose-Headers': 'ETag, Server-Timing, Content-Disposition',
+  'Timing-Allow-Origin': '*',
 };
 
-export async function OPTIONS() {
-  return NextResponse.json({}, { headers: corsHeaders });
+export async function OPTIONS(request) {
+  return withTiming('OPTIONS', request, () => jsonResponse({}, { headers: corsHeaders }));
+}
+
+// ==================== TIMING HELPERS ====================
+
+// Every response carries a Server-Timing header with the time spent per phase:
+// connect (connectDB), db (primary queries), cascade (dependent updates), meta (version
+// counters), serialize (JSON.stringify) and total. Each phase's desc is its number of calls,
+// so db + cascade + meta is the request's Mongo round trips. TIMING_LOG=1 also logs one JSON
+// line per request.
+const TIMING_LOG = ['1', 'true', 'yes'].includes((process.env.TIMING_LOG || '').toLowerCase());
+const timingStore = new AsyncLocalStorage();
+
+function addTiming(phase, ms) {
+  const phases = timingStore.getStore();
+  if (!phases) return;
+  const entry = phases[phase] || (phases[phase] = { ms: 0, calls: 0 });
+  entry.ms += ms;
+  entry.calls += 1;
+}
+
+async function timed(phase, work) {
+  const start = performance.now();
+  try {
+    return await work();
+  } finally {
+    addTiming(phase, performance.now() - start);
+  }
+}
+
+function jsonResponse(data, init = {}) {
+  const start = performance.now();
+  const body = JSON.stringify(data);
+  addTiming('serialize', performance.now() - start);
+  return new NextResponse(body, {
+    ...init,
+    headers: { 'Content-Type': 'application/json', ...init.headers },
+  });
+}
+
+async function withTiming(method, request, handler) {
+  const phases = {};
+  const start = performance.now();
+  const response = await timingStore.run(phases, handler);
+  const total = performance.now() - start;
+  response.headers.set(
+    'Server-Timing',
+    Object.entries(phases)
+      .map(([phase, { ms, calls }]) => `${phase};dur=${ms.toFixed(2)};desc="${calls}"`)
+      .concat(`total;dur=${total.toFixed(2)}`)
+      .join(', ')
+  );
+  if (TIMING_LOG) {
+    const timings = Object.fromEntries(Object.entries(phases).map(([phase, { ms }]) => [phase, +ms.toFixed(2)]));
+    timings.total = +total.toFixed(2);
+    console.log(JSON.stringify({
+      type: 'timing',
+      method,
+      path: new URL(request.url).pathname,
+      status: response.status,
+      ...timings,
+    }));
+  }
+  return response;
+}
+
+// ==================== CONDITIONAL GET HELPERS ====================
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+// Tombstones expire (TTL index on expiresAt) after this long; older sync tokens get a full reset
+const TOMBSTONE_RETENTION_DAYS = parseInt(process.env.TOMBSTONE_RETENTION_DAYS || '30', 10);
+
+// Per-collection write counters live in Mongo (`meta` collection) rather than in memory,
+// so every server instance derives the same ETag for the same data.
+async function recordWrite(...names) {
+  await bumpVersions(names);
+}
+
+// Deletes also leave a tombstone for GET /api/changes, written in the same bulkWrite
+async function recordDelete(name, id, ...names) {
+  await bumpVersions([name, ...names], [{ collection: name, id }]);
+}
+
+async function bumpVersions(names, deleted = []) {
+  invalidateStats();
+  const meta = await getCollection('meta');
+  const deletedAt = new Date();
+  const expiresAt = new Date(deletedAt.getTime() + TOMBSTONE_RETENTION_DAYS * DAY_MS);
+  await timed('meta', () => meta.bulkWrite(
+    [
+      ...names.map((name) => ({
+        updateOne: { filter: { _id: `version:${name}` }, update: { $inc: { value: 1 } }, upsert: true },
+      })),
+      ...deleted.map(({ collection, id }) => ({
+        updateOne: {
+          filter: { _id: `tombstone:${collection}:${id}` },
+          update: { $set: { type: 'tombstone', collection, id, deletedAt: deletedAt.toISOString(), expiresAt } },
+          upsert: true,
+        },
+      })),
+    ],
+    { ordered: false }
+  ));
+}
+
+async function readVersions(names) {
+  const meta = await getCollection('meta');
+  const docs = await timed('meta', () => meta.find({ _id: { $in: names.map((name) => `version:${name}`) } }).toArray());
+  const values = new Map(docs.map((doc) => [doc._id, doc.value]));
+  return names.map((name) => values.get(`version:${name}`) || 0);
+}
+
+function etagMatches(request, etag) {
+  const header = request.headers.get('if-none-match');
+  if (!header) return false;
+  return header.trim() === '*' || header.split(',').some((tag) => tag.trim() === etag);
+}
+
+// Versions are read before the query runs, so a write landing in between leaves the ETag
+// behind the body: the next poll then gets a fresh 200 instead of a stale 304.
+async function conditionalGet(request, names, produce, extra = '') {
+  const url = new URL(request.url);
+  const versions = await readVersions(names);
+  const variant = createHash('sha1').update(`${url.pathname}${url.search}|${extra}`).digest('base64url').slice(0, 16);
+  const etag = `W/"${versions.join('.')}-${variant}"`;
+  const cacheHeaders = { ETag: etag, 'Cache-Control': 'private, no-cache' };
+
+  if (etagMatches(request, etag)) {
+    return new NextResponse(null, { status: 304, headers: { ...corsHeaders, ...cacheHeaders } });
+  }
+
+  const response = await produce();
+  if (response.status === 200) {
+    for (const [key, value] of Object.entries(cacheHeaders)) response.headers.set(key, value);
+  }
+  return response;
+}
+
+// ==================== PAGINATION HELPERS ====================
+
+const DEFAULT_PAGE_SIZE = 100;
+const MAX_PAGE_SIZE = 1000;
+const STREAM_CHUNK_SIZE = 64 * 1024;
+
+// Cursor tokens encode the [sortValue, id] of the last record on a page
+function encodeCursor(doc, sortField) {
+  return Buffer.from(JSON.stringify([doc[sortField] ?? null, doc.id])).toString('base64url');
+}
+
+// Null unless the token decodes to [string | number | null, string]: anything else (an object
+// such as {"$ne": null}) would reach the query as an operator
+function decodeCursor(token) {
+  let position;
+  try {
+    position = JSON.parse(Buffer.from(token, 'base64url').toString('utf8'));
+  } catch {
+    return null;
+  }
+  if (!Array.isArray(position) || position.length !== 2) return null;
+  const [value, id] = position;
+  if (!(value === null || typeof value === 'string' || typeof value === 'number') || typeof id !== 'string') {
+    return null;
+  }
+  return { value, id };
+}
+
+// Records strictly after the cursor in (sortField desc, id desc) order; nulls sort last
+function keysetFilter(sortField, { value, id }) {
+  if (value === null) {
+    return { [sortField]: null, id: { $lt: id } };
+  }
+  return {
+    $or: [
+      { [sortField]: { $lt: value } },
+      { [sortField]: value, id: { $lt: id } },
+      { [sortField]: null },
+    ],
+  };
+}
+
+// The cursor is only advanced when the client pulls, so at most one chunk is held in memory.
+// `head` goes out before the first document (the CSV header row).
+function streamCursor(cursor, encodeDoc, headers, head = '') {
+  const encoder = new TextEncoder();
+  let pending = head;
+  const stream = new ReadableStream({
+    async pull(controller) {
+      let chunk = pending;
+      pending = '';
+      while (chunk.length < STREAM_CHUNK_SIZE) {
+        const doc = await cursor.next();
+        if (!doc) {
+          if (chunk) controller.enqueue(encoder.encode(chunk));
+          controller.close();
+          return;
+        }
+        chunk += encodeDoc(doc);
+      }
+      controller.enqueue(encoder.encode(chunk));
+    },
+    async cancel() {
+      await cursor.close();
+    },
+  });
+  return new NextResponse(stream, {
+    headers: { ...corsHeaders, ...headers },
+  });
+}
+
+function streamNdjson(cursor, headers = {}) {
+  return streamCursor(cursor, (doc) => JSON.stringify(doc) + '\n', { 'Content-Type': 'application/x-ndjson', ...headers });
+}
+
+// Full array by default; `limit`/`cursor` switch to keyset pages, `format=ndjson` streams records
+async function listCollection(name, sortField, request) {
+  const collection = await getCollection(name);
+  const searchParams = new URL(request.url).searchParams;
+  const limitParam = searchParams.get('limit');
+  const cursorParam = searchParams.get('cursor');
+  const streaming = searchParams.get('format') === 'ndjson';
+
+  if (!limitParam && !cursorParam && !streaming) {
+    const docs = await timed('db', () => collection.find({}).sort({ [sortField]: -1 }).toArray());
+    return jsonResponse(docs, { headers: corsHeaders });
+  }
+
+  let filter = {};
+  if (cursorParam) {
+    const position = decodeCursor(cursorParam);
+    if (!position) {
+      return jsonResponse(
+        { error: 'Invalid cursor' },
+        { status: 400, headers: corsHeaders }
+      );
+    }
+    filter = keysetFilter(sortField, position);
+  }
+  const cursor = collection.find(filter).sort({ [sortField]: -1, id: -1 });
+
+  if (streaming) {
+    if (limitParam) cursor.limit(Math.max(parseInt(limitParam, 10) || 0, 0));
+    return streamNdjson(cursor);
+  }
+
+  const limit = Math.min(Math.max(parseInt(limitParam, 10) || DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE);
+  const docs = await timed('db', () => cursor.limit(limit + 1).toArray());
+  const items = docs.slice(0, limit);
+  const next = docs.length > limit ? encodeCursor(items[items.length - 1], sortField) : null;
+  return jsonResponse({ items, next }, { headers: corsHeaders });
+}
+
+// ==================== BULK HELPERS ====================
+
+const MAX_BULK_ITEMS = 1000;
+const NOT_ATTEMPTED = 'Not attempted: an earlier item failed';
+
+// Body is either an array of items or { items, ordered }. Ordered batches stop at the
+// first failing item (like insertMany); unordered batches insert every valid item.
+async function insertBulk(name, body, build) {
+  const items = Array.isArray(body) ? body : body?.items;
+  const ordered = !Array.isArray(body) && body?.ordered === true;
+  if (!Array.isArray(items) || items.length === 0 || items.length > MAX_BULK_ITEMS) {
+    const error = new Error(`Expected between 1 and ${MAX_BULK_ITEMS} items`);
+    error.status = 400;
+    throw error;
+  }
+  
+  const entries = [];
+  const errors = [];
+  for (let index = 0; index < items.length; index++) {
+    const item = items[index];
+    const record = item && typeof item === 'object' && !Array.isArray(item) ? build(item) : null;
+    if (record && Number.isFinite(record.amount) && typeof record.date === 'string') {
+      entries.push({ index, record });
+      continue;
+    }
+    errors.push({ index, error: 'Item must be an object with a numeric amount and a date' });
+    if (ordered) {
+      for (let rest = index + 1; rest < items.length; rest++) errors.push({ index: rest, error: NOT_ATTEMPTED });
+      break;
+    }
+  }
+  
+  if (!entries.length) return { inserted: [], errors };
+  
+  const collection = await getCollection(name);
+  try {
+    await timed('db', () => collection.insertMany(entries.map((e) => e.record), { ordered }));
+    return { inserted: entries.map((e) => e.record), errors };
+  } catch (error) {
+    if (!error.writeErrors) throw error;
+    const writeErrors = [].concat(error.writeErrors);
+    const failed = new Map(writeErrors.map((e) => [e.index, e.errmsg]));
+    const stopAt = ordered ? Math.min(...failed.keys()) : entries.length;
+    const inserted = [];
+    entries.forEach((entry, position) => {
+      if (failed.has(position)) errors.push({ index: entry.index, error: failed.get(position) });
+      else if (position > stopAt) errors.push({ index: entry.index, error: NOT_ATTEMPTED });
+      else inserted.push(entry.record);
+    });
+    errors.sort((a, b) => a.index - b.index);
+    return { inserted, errors };
+  }
+}
+
+// 201 when every item was inserted, 207 for partial success, 400 when nothing was
+function bulkResponse(inserted, errors) {
+  const status = errors.length === 0 ? 201 : inserted.length ? 207 : 400;
+  return jsonResponse(
+    { inserted: inserted.length, failed: errors.length, items: inserted, errors },
+    { status, headers: corsHeaders }
+  );
+}
+
+// ==================== SINGLE RECORD ROUTES ====================
+
+async function getRecord(request, name, id) {
+  return conditionalGet(request, [name], () => findRecord(name, id));
+}
+
+async function findRecord(name, id) {
+  const collection = await getCollection(name);
+  const record = await timed('db', () => collection.findOne({ id }));
+  
+  if (!record) {
+    return jsonResponse(
+      { error: 'Not found' },
+      { status: 404, headers: corsHeaders }
+    );
+  }
+  
+  return jsonResponse(record, { headers: corsHeaders });
 }
 
 // ==================== PROPERTIES ROUTES ====================
 
-async function getProperties() {
-  const collection = await getCollection('properties');
-  const properties = await collection.find({}).sort({ createdAt: -1 }).toArray();
-  return NextResponse.json(properties, { headers: corsHeaders });
+async function getProperties(request) {
+  return conditionalGet(request, ['properties'], () => listCollection('properties', 'createdAt', request));
 }
 
 async function createProperty(request) {
@@ -56,11 +489,13 @@ async function createProperty(request) {
     type: body.type,
     monthlyRent: parseFloat(body.monthlyRent),
     status: body.status || 'Vacant',
+    tenantCount: 0,
     createdAt: new Date().toISOString(),
   };
   
-  await collection.insertOne(property);
-  return NextResponse.json(property, { status: 201, headers: corsHeaders });
+  await timed('db', () => collection.insertOne(property));
+  await recordWrite('properties');
+  return jsonResponse(property, { status: 201, headers: corsHeaders });
 }
 
 async function updateProperty(request, id) {
@@ -76,23 +511,24 @@ async function updateProperty(request, id) {
     updatedAt: new Date().toISOString(),
   };
   
-  await collection.updateOne({ id }, { $set: updateData });
-  const updated = await collection.findOne({ id });
-  return NextResponse.json(updated, { headers: corsHeaders });
+  const updated = await timed('db', () =>
+    collection.findOneAndUpdate({ id }, { $set: updateData }, { returnDocument: 'after' })
+  );
+  await recordWrite('properties');
+  return jsonResponse(updated, { headers: corsHeaders });
 }
 
 async function deleteProperty(id) {
   const collection = await getCollection('properties');
-  await collection.deleteOne({ id });
-  return NextResponse.json({ success: true }, { headers: corsHeaders });
+  const { deletedCount } = await timed('db', () => collection.deleteOne({ id }));
+  if (deletedCount) await recordDelete('properties', id);
+  return jsonResponse({ success: true }, { headers: corsHeaders });
 }
 
 // ==================== TENANTS ROUTES ====================
 
-async function getTenants() {
-  const collection = await getCollection('tenants');
-  const tenants = await collection.find({}).sort({ createdAt: -1 }).toArray();
-  return NextResponse.json(tenants, { headers: corsHeaders });
+async function getTenants(request) {
+  return conditionalGet(request, ['tenants'], () => listCollection('tenants', 'createdAt', request));
 }
 
 async function createTenant(request) {
@@ -113,18 +549,20 @@ async function createTenant(request) {
     createdAt: new Date().toISOString(),
   };
   
-  await collection.insertOne(tenant);
+  await timed('db', () => collection.insertOne(tenant));
   
-  // Update property status to Occupied
+  // Update property status to Occupied. Properties count their tenants so that concurrent
+  // creates and deletes commute: each is one atomic single-document update.
   if (body.propertyId) {
     const propCollection = await getCollection('properties');
-    await propCollection.updateOne(
+    await timed('cascade', () => propCollection.updateOne(
       { id: body.propertyId },
-      { $set: { status: 'Occupied' } }
-    );
+      { $inc: { tenantCount: 1 }, $set: { status: 'Occupied', updatedAt: new Date().toISOString() } }
+    ));
   }
+  await recordWrite('tenants', 'properties');
   
-  return NextResponse.json(tenant, { status: 201, headers: corsHeaders });
+  return jsonResponse(tenant, { status: 201, headers: corsHeaders });
 }
 
 async function updateTenant(request, id) {
@@ -144,41 +582,47 @@ async function updateTenant(request, id) {
     updatedAt: new Date().toISOString(),
   };
   
-  await collection.updateOne({ id }, { $set: updateData });
-  const updated = await collection.findOne({ id });
-  return NextResponse.json(updated, { headers: corsHeaders });
+  const updated = await timed('db', () =>
+    collection.findOneAndUpdate({ id }, { $set: updateData }, { returnDocument: 'after' })
+  );
+  await recordWrite('tenants');
+  return jsonResponse(updated, { headers: corsHeaders });
 }
 
 async function deleteTenant(id) {
   const collection = await getCollection('tenants');
-  const tenant = await collection.findOne({ id });
+  const tenant = await timed('db', () => collection.findOneAndDelete({ id }));
   
   if (tenant && tenant.propertyId) {
-    // Update property status to Vacant
+    // Update property status to Vacant once its last tenant is gone. Every property has a
+    // tenantCount (migrateLegacyData() backfills old ones); a missing one counts as 0, as $inc does.
     const propCollection = await getCollection('properties');
-    await propCollection.updateOne(
+    await timed('cascade', () => propCollection.updateOne(
       { id: tenant.propertyId },
-      { $set: { status: 'Vacant' } }
-    );
+      [
+        {
+          $set: {
+            tenantCount: { $max: [{ $subtract: [{ $ifNull: ['$tenantCount', 0] }, 1] }, 0] },
+            updatedAt: new Date().toISOString(),
+          },
+        },
+        { $set: { status: { $cond: [{ $gt: ['$tenantCount', 0] }, 'Occupied', 'Vacant'] } } },
+      ]
+    ));
   }
   
-  await collection.deleteOne({ id });
-  return NextResponse.json({ success: true }, { headers: corsHeaders });
+  if (tenant) await recordDelete('tenants', id, 'properties');
+  return jsonResponse({ success: true }, { headers: corsHeaders });
 }
 
 // ==================== PAYMENTS ROUTES ====================
 
-async function getPayments() {
-  const collection = await getCollection('payments');
-  const payments = await collection.find({}).sort({ date: -1 }).toArray();
-  return NextResponse.json(payments, { headers: corsHeaders });
+async function getPayments(request) {
+  return conditionalGet(request, ['payments'], () => listCollection('payments', 'date', request));
 }
 
-async function createPayment(request) {
-  const body = await request.json();
-  const collection = await getCollection('payments');
-  
-  const payment = {
+function buildPayment(body) {
+  return {
     id: uuidv4(),
     tenantId: body.tenantId,
     tenantName: body.tenantName,
@@ -189,34 +633,62 @@ async function createPayment(request) {
     status: body.status || 'Paid',
     createdAt: new Date().toISOString(),
   };
+}
+
+async function createPayment(request) {
+  const body = await request.json();
+  const collection = await getCollection('payments');
+  
+  const payment = buildPayment(body);
   
-  await collection.insertOne(payment);
+  await timed('db', () => collection.insertOne(payment));
   
   // Update tenant rent status
   if (body.tenantId) {
     const tenantCollection = await getCollection('tenants');
-    await tenantCollection.updateOne(
+    await timed('cascade', () => tenantCollection.updateOne(
       { id: body.tenantId },
-      { $set: { rentStatus: 'Paid' } }
-    );
+      { $set: { rentStatus: 'Paid', updatedAt: new Date().toISOString() } }
+    ));
+  }
+  await recordWrite('payments', 'tenants');
+  
+  return jsonResponse(payment, { status: 201, headers: corsHeaders });
+}
+
+async function createPaymentsBulk(request) {
+  const body = await request.json();
+  const { inserted, errors } = await insertBulk('payments', body, buildPayment);
+  
+  // Update tenant rent status for every tenant that got a payment, in one write
+  const tenantIds = [...new Set(inserted.map((p) => p.tenantId).filter(Boolean))];
+  if (tenantIds.length) {
+    const tenantCollection = await getCollection('tenants');
+    await timed('cascade', () => tenantCollection.updateMany(
+      { id: { $in: tenantIds } },
+      { $set: { rentStatus: 'Paid', updatedAt: new Date().toISOString() } }
+    ));
   }
+  if (inserted.length) await recordWrite('payments', 'tenants');
   
-  return NextResponse.json(payment, { status: 201, headers: corsHeaders });
+  return bulkResponse(inserted, errors);
+}
+
+async function deletePayment(id) {
+  const collection = await getCollection('payments');
+  const { deletedCount } = await timed('db', () => collection.deleteOne({ id }));
+  if (deletedCount) await recordDelete('payments', id);
+  return jsonResponse({ success: true }, { headers: corsHeaders });
 }
 
 // ==================== EXPENSES ROUTES ====================
 
-async function getExpenses() {
-  const collection = await getCollection('expenses');
-  const expenses = await collection.find({}).sort({ date: -1 }).toArray();
-  return NextResponse.json(expenses, { headers: corsHeaders });
+async function getExpenses(request) {
+  return conditionalGet(request, ['expenses'], () => listCollection('expenses', 'date', request));
 }
 
-async function createExpense(request) {
-  const body = await request.json();
-  const collection = await getCollection('expenses');
-  
-  const expense = {
+function buildExpense(body) {
+  return {
     id: uuidv4(),
     propertyId: body.propertyId,
     propertyName: body.propertyName,
@@ -226,74 +698,542 @@ async function createExpense(request) {
     category: body.category,
     createdAt: new Date().toISOString(),
   };
+}
+
+async function createExpense(request) {
+  const body = await request.json();
+  const collection = await getCollection('expenses');
   
-  await collection.insertOne(expense);
-  return NextResponse.json(expense, { status: 201, headers: corsHeaders });
+  const expense = buildExpense(body);
+  
+  await timed('db', () => collection.insertOne(expense));
+  await recordWrite('expenses');
+  return jsonResponse(expense, { status: 201, headers: corsHeaders });
+}
+
+async function createExpensesBulk(request) {
+  const body = await request.json();
+  const { inserted, errors } = await insertBulk('expenses', body, buildExpense);
+  if (inserted.length) await recordWrite('expenses');
+  return bulkResponse(inserted, errors);
 }
 
 async function deleteExpense(id) {
   const collection = await getCollection('expenses');
-  await collection.deleteOne({ id });
-  return NextResponse.json({ success: true }, { headers: corsHeaders });
+  const { deletedCount } = await timed('db', () => collection.deleteOne({ id }));
+  if (deletedCount) await recordDelete('expenses', id);
+  return jsonResponse({ success: true }, { headers: corsHeaders });
 }
 
 // ==================== SETTINGS ROUTES ====================
 
-async function getSettings() {
+async function getSettings(request) {
+  return conditionalGet(request, ['settings'], findSettings);
+}
+
+async function findSettings() {
   const collection = await getCollection('settings');
-  let settings = await collection.findOne({ type: 'app_settings' });
+  let settings = await timed('db', () => collection.findOne({ type: 'app_settings' }));
   
   if (!settings) {
-    settings = {
-      id: uuidv4(),
-      type: 'app_settings',
-      currency: '₺',
-      notifications: true,
-      createdAt: new Date().toISOString(),
-    };
-    await collection.insertOne(settings);
+    // Upsert on the unique type, so concurrent first reads cannot create two documents
+    const result = await retryOnDuplicateKey(() => timed('db', () => collection.findOneAndUpdate(
+      { type: 'app_settings' },
+      {
+        $setOnInsert: {
+          id: uuidv4(),
+          currency: '₺',
+          notifications: true,
+          createdAt: new Date().toISOString(),
+        },
+      },
+      { upsert: true, returnDocument: 'after', includeResultMetadata: true }
+    )));
+    settings = result.value;
+    if (!result.lastErrorObject?.updatedExisting) await recordWrite('settings');
   }
   
-  return NextResponse.json(settings, { headers: corsHeaders });
+  return jsonResponse(settings, { headers: corsHeaders });
 }
 
 async function updateSettings(request) {
   const body = await request.json();
   const collection = await getCollection('settings');
   
-  await collection.updateOne(
+  const updated = await retryOnDuplicateKey(() => timed('db', () => collection.findOneAndUpdate(
     { type: 'app_settings' },
-    { $set: { currency: body.currency, notifications: body.notifications } },
-    { upsert: true }
-  );
+    {
+      $set: { currency: body.currency, notifications: body.notifications, updatedAt: new Date().toISOString() },
+      $setOnInsert: { id: uuidv4(), createdAt: new Date().toISOString() },
+    },
+    { upsert: true, returnDocument: 'after' }
+  )));
+  await recordWrite('settings');
   
-  const updated = await collection.findOne({ type: 'app_settings' });
-  return NextResponse.json(updated, { headers: corsHeaders });
+  return jsonResponse(updated, { headers: corsHeaders });
+}
+
+// ==================== STATS ROUTES ====================
+
+const MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
+
+// Opt-in cache of /api/stats responses, dropped on every data write. The TTL bounds
+// staleness when several server instances each hold their own cache.
+const STATS_CACHE_TTL_MS = parseInt(process.env.STATS_CACHE_TTL_MS || '0', 10);
+const statsCache = new Map();
+let statsGeneration = 0;
+
+function invalidateStats() {
+  statsGeneration += 1;
+  statsCache.clear();
+}
+
+// Everything the dashboard shows, from one aggregation over all four collections.
+// Dates are 'YYYY-MM-DD' strings, so months are matched on the 'YYYY-MM' prefix.
+function statsPipeline(year, month, today) {
+  const yearStart = `${year}-01-01`;
+  const nextYearStart = `${year + 1}-01-01`;
+  const inYear = { date: { $gte: yearStart, $lt: nextYearStart } };
+  const monthOf = { $substrBytes: ['$date', 0, 7] };
+  const isKind = (kind) => ({ $eq: ['$kind', kind] });
+  const countIf = (condition) => ({ $sum: { $cond: [condition, 1, 0] } });
+  const sumIf = (condition, field) => ({ $sum: { $cond: [condition, field, 0] } });
+  const paid = { $and: [isKind('tenant'), { $eq: ['$rentStatus', 'Paid'] }] };
+  const pending = { $and: [isKind('tenant'), { $eq: ['$rentStatus', 'Pending'] }] };
+  const overdue = { $and: [isKind('tenant'), { $eq: ['$rentStatus', 'Overdue'] }] };
+  // Overdue rent is still due
+  const due = { $and: [isKind('tenant'), { $in: ['$rentStatus', ['Pending', 'Overdue']] }] };
+  const expenseThisMonth = { $and: [isKind('expense'), { $eq: ['$month', month] }] };
+
+  return [
+    { $project: { _id: 0, kind: 'property', status: 1 } },
+    { $unionWith: { coll: 'tenants', pipeline: [
+      { $project: { _id: 0, kind: 'tenant', rentStatus: 1, monthlyRent: 1, leaseEnd: 1 } },
+    ] } },
+    { $unionWith: { coll: 'payments', pipeline: [
+      { $match: inYear },
+      { $project: { _id: 0, kind: 'payment', amount: 1, month: monthOf } },
+    ] } },
+    { $unionWith: { coll: 'expenses', pipeline: [
+      { $match: inYear },
+      { $project: { _id: 0, kind: 'expense', amount: 1, month: monthOf } },
+    ] } },
+    { $facet: {
+      totals: [
+        { $group: {
+          _id: null,
+          totalProperties: countIf(isKind('property')),
+          occupiedProperties: countIf({ $and: [isKind('property'), { $eq: ['$status', 'Occupied'] }] }),
+          totalTenants: countIf(isKind('tenant')),
+          paidTenants: countIf(paid),
+          pendingTenants: countIf(pending),
+          overdueTenants: countIf(overdue),
+          expiredLeases: countIf({ $and: [
+            isKind('tenant'),
+            { $lt: ['$leaseEnd', today] },
+            { $gt: ['$leaseEnd', ''] },
+          ] }),
+          monthlyIncome: sumIf(paid, '$monthlyRent'),
+          rentDue: sumIf(due, '$monthlyRent'),
+          monthlyExpenses: sumIf(expenseThisMonth, '$amount'),
+          monthlyExpenseCount: countIf(expenseThisMonth),
+        } },
+      ],
+      monthly: [
+        { $match: { kind: { $in: ['payment', 'expense'] } } },
+        { $group: { _id: { kind: '$kind', month: '$month' }, total: { $sum: '$amount' } } },
+      ],
+    } },
+  ];
+}
+
+async function computeStats(year, month, today) {
+  const collection = await getCollection('properties');
+  const [result] = await timed('db', () => collection.aggregate(statsPipeline(year, month, today)).toArray());
+  const totals = { ...(result.totals[0] || {}) };
+  delete totals._id;
+
+  const chart = MONTH_NAMES.map((name) => ({ month: name, income: 0, expenses: 0 }));
+  for (const { _id, total } of result.monthly) {
+    const index = parseInt(_id.month.slice(5, 7), 10) - 1;
+    if (!chart[index]) continue;
+    if (_id.kind === 'payment') chart[index].income = total;
+    else chart[index].expenses = total;
+  }
+
+  const stats = {
+    month,
+    totalProperties: 0,
+    occupiedProperties: 0,
+    totalTenants: 0,
+    paidTenants: 0,
+    pendingTenants: 0,
+    overdueTenants: 0,
+    expiredLeases: 0,
+    monthlyIncome: 0,
+    rentDue: 0,
+    monthlyExpenses: 0,
+    monthlyExpenseCount: 0,
+    ...totals,
+    chart,
+  };
+  stats.netIncome = stats.monthlyIncome - stats.monthlyExpenses;
+  return stats;
+}
+
+// The ETag covers all four collections plus the current day, which moves expiredLeases
+async function getStats(request) {
+  const today = new Date().toISOString().slice(0, 10);
+  return conditionalGet(request, RECORD_COLLECTIONS, () => findStats(request), today);
+}
+
+// `month=YYYY-MM` selects the reporting month (and chart year); defaults to the current UTC month
+async function findStats(request) {
+  const searchParams = new URL(request.url).searchParams;
+  const today = new Date().toISOString().slice(0, 10);
+  const month = searchParams.get('month') || today.slice(0, 7);
+  if (!/^\d{4}-\d{2}$/.test(month)) {
+    return jsonResponse(
+      { error: 'month must be YYYY-MM' },
+      { status: 400, headers: corsHeaders }
+    );
+  }
+
+  const cacheKey = `${month}|${today}`;
+  const cached = statsCache.get(cacheKey);
+  if (cached && cached.expiresAt > Date.now()) {
+    return jsonResponse(cached.stats, { headers: corsHeaders });
+  }
+
+  const generation = statsGeneration;
+  const stats = await computeStats(parseInt(month.slice(0, 4), 10), month, today);
+  // Skip caching if a write landed while the aggregation was running
+  if (STATS_CACHE_TTL_MS > 0 && generation === statsGeneration) {
+    statsCache.set(cacheKey, { stats, expiresAt: Date.now() + STATS_CACHE_TTL_MS });
+  }
+  return jsonResponse(stats, { headers: corsHeaders });
+}
+
+// ==================== EXPORT ROUTES ====================
+
+// CSV columns per exportable collection; NDJSON rows carry the whole document
+const EXPORT_COLUMNS = {
+  payments: ['id', 'date', 'tenantId', 'tenantName', 'propertyId', 'propertyName', 'amount', 'status', 'createdAt'],
+  expenses: ['id', 'date', 'propertyId', 'propertyName', 'category', 'description', 'amount', 'createdAt'],
+};
+const EXPORT_BATCH_SIZE = 1000;
+
+// RFC 4180 quoting. Text that a spreadsheet would evaluate as a formula gets a leading quote.
+function csvCell(value) {
+  if (value === null || value === undefined) return '';
+  let text = typeof value === 'object' ? JSON.stringify(value) : String(value);
+  if (typeof value === 'string' && /^[=+\-@\t\r]/.test(text)) text = `'${text}`;
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+function csvRow(values) {
+  return values.map(csvCell).join(',') + '\r\n';
+}
+
+// GET /api/export/<payments|expenses>?format=csv|ndjson&from=YYYY-MM-DD&to=YYYY-MM-DD&propertyId=
+// Rows stream oldest first straight off the cursor; `from` and `to` are inclusive.
+async function exportCollection(name, request) {
+  const searchParams = new URL(request.url).searchParams;
+  const format = searchParams.get('format') || 'csv';
+  const from = searchParams.get('from');
+  const to = searchParams.get('to');
+  const propertyId = searchParams.get('propertyId');
+  const day = /^\d{4}-\d{2}-\d{2}$/;
+  if (!['csv', 'ndjson'].includes(format) || (from && !day.test(from)) || (to && !day.test(to))) {
+    return jsonResponse(
+      { error: 'format must be csv or ndjson; from and to must be YYYY-MM-DD' },
+      { status: 400, headers: corsHeaders }
+    );
+  }
+
+  const filter = {};
+  if (from || to) filter.date = { ...(from && { $gte: from }), ...(to && { $lte: to }) };
+  if (propertyId) filter.propertyId = propertyId;
+
+  const collection = await getCollection(name);
+  const cursor = collection.find(filter, { projection: { _id: 0 } })
+    .sort({ date: 1, id: 1 })
+    .batchSize(EXPORT_BATCH_SIZE);
+  const headers = {
+    'Content-Disposition': `attachment; filename="${name}-${from || 'start'}-${to || 'end'}.${format}"`,
+    'Cache-Control': 'no-store',
+  };
+  if (format === 'ndjson') return streamNdjson(cursor, headers);
+
+  const columns = EXPORT_COLUMNS[name];
+  return streamCursor(
+    cursor,
+    (doc) => csvRow(columns.map((column) => doc[column])),
+    { 'Content-Type': 'text/csv; charset=utf-8', ...headers },
+    csvRow(columns)
+  );
+}
+
+// ==================== SYNC ROUTES ====================
+
+const SYNC_COLLECTIONS = [...RECORD_COLLECTIONS, 'settings'];
+// Each sync re-reads this far behind its token, so writes stamped before a sync but committed
+// after it, or stamped by an instance with a slightly slow clock, are not missed. Clients apply
+// changes by id, so the overlap only costs a few repeated records.
+const SYNC_OVERLAP_MS = parseInt(process.env.SYNC_OVERLAP_MS || '5000', 10);
+
+function encodeSyncToken(time) {
+  return Buffer.from(time).toString('base64url');
+}
+
+function decodeSyncToken(token) {
+  const time = Buffer.from(token, 'base64url').toString('utf8');
+  return /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$/.test(time) ? time : null;
+}
+
+// Without `since` (or with a token older than the tombstone retention) every record is
+// returned with reset: true and the client replaces its replica. Otherwise `upserted` holds
+// records created or updated since the token and `deleted` the ids removed since then.
+async function getChanges(request) {
+  const token = new URL(request.url).searchParams.get('since');
+  const startedAt = new Date();
+  const since = token ? decodeSyncToken(token) : null;
+  if (token && !since) {
+    return jsonResponse(
+      { error: 'Invalid sync token' },
+      { status: 400, headers: corsHeaders }
+    );
+  }
+
+  const horizon = new Date(startedAt.getTime() - TOMBSTONE_RETENTION_DAYS * DAY_MS).toISOString();
+  const reset = !since || since < horizon;
+  const from = reset ? null : new Date(Date.parse(since) - SYNC_OVERLAP_MS).toISOString();
+  const filter = reset ? {} : { $or: [{ updatedAt: { $gt: from } }, { createdAt: { $gt: from } }] };
+
+  const meta = await getCollection('meta');
+  const [records, tombstones] = await Promise.all([
+    Promise.all(SYNC_COLLECTIONS.map(async (name) => {
+      const collection = await getCollection(name);
+      return timed('db', () => collection.find(filter).toArray());
+    })),
+    reset ? [] : timed('meta', () => meta.find({ type: 'tombstone', deletedAt: { $gt: from } }).toArray()),
+  ]);
+
+  const upserted = Object.fromEntries(SYNC_COLLECTIONS.map((name, index) => [name, records[index]]));
+  const deleted = Object.fromEntries(SYNC_COLLECTIONS.map((name) => [name, []]));
+  for (const tombstone of tombstones) deleted[tombstone.collection]?.push(tombstone.id);
+
+  return jsonResponse(
+    { token: encodeSyncToken(startedAt.toISOString()), reset, upserted, deleted },
+    { headers: corsHeaders }
+  );
+}
+
+// ==================== RENT CYCLE ROUTES ====================
+
+const RENT_STATUSES = ['Paid', 'Pending', 'Overdue'];
+// Days after the due date before unpaid rent turns from Pending to Overdue
+const RENT_GRACE_DAYS = parseInt(process.env.RENT_GRACE_DAYS || '5', 10);
+
+// Rent falls due each month on the day the lease started (the month's last day when it is
+// shorter), and a billing period starts on the 1st of its due date's month.
+function rentDueDate(year, monthIndex, leaseDay) {
+  const daysInMonth = new Date(Date.UTC(year, monthIndex + 1, 0)).getUTCDate();
+  return new Date(Date.UTC(year, monthIndex, Math.min(leaseDay, daysInMonth))).toISOString().slice(0, 10);
+}
+
+// For each lease day 1-31: the latest due date on or before `asOf` (last month's when this
+// month's is still ahead), the due date before it, and the start of each one's period
+function rentPeriods(asOf) {
+  const [year, month] = asOf.split('-').map(Number);
+  return Array.from({ length: 31 }, (_, index) => {
+    const back = rentDueDate(year, month - 1, index + 1) <= asOf ? 0 : 1;
+    const due = rentDueDate(year, month - 1 - back, index + 1);
+    const prevDue = rentDueDate(year, month - 2 - back, index + 1);
+    return { due, prevDue, dueStart: `${due.slice(0, 7)}-01`, prevStart: `${prevDue.slice(0, 7)}-01` };
+  });
+}
+
+// A payment covers a period it was made in or after, oldest unpaid period first: so rent left
+// unpaid keeps the tenant Overdue across the 1st and the next due date until a payment covers
+// it. Arrears older than the previous period are not tracked. Only leases running on
+// `asOf` (and in `tenantIds`, when given) are considered, so expired and future leases keep
+// their status. Returns {_id, rentStatus, next} for just the tenants whose status changes.
+function rentCyclePipeline(asOf, tenantIds) {
+  // Unpaid rent due before this day is past its grace period
+  const lateBefore = new Date(Date.parse(asOf) - RENT_GRACE_DAYS * DAY_MS).toISOString().slice(0, 10);
+  const leaseDay = { $convert: { input: { $substrBytes: ['$leaseStart', 8, 2] }, to: 'int', onError: 1, onNull: 1 } };
+  const match = {
+    leaseStart: { $lte: asOf },
+    $or: [{ leaseEnd: { $gte: asOf } }, { leaseEnd: { $in: [null, ''] } }],
+  };
+  if (tenantIds) match.id = { $in: tenantIds };
+
+  return [
+    { $match: match },
+    { $addFields: {
+      period: { $arrayElemAt: [{ $literal: rentPeriods(asOf) }, { $subtract: [{ $min: [{ $max: [leaseDay, 1] }, 31] }, 1] }] },
+    } },
+    // Periods owed in the window: the previous one only if the lease had started by then
+    { $addFields: { owed: { $cond: [{ $gte: ['$period.prevDue', { $substrBytes: ['$leaseStart', 0, 10] }] }, 2, 1] } } },
+    { $lookup: {
+      from: 'payments',
+      localField: 'id',
+      foreignField: 'tenantId',
+      let: { since: { $cond: [{ $eq: ['$owed', 2] }, '$period.prevStart', '$period.dueStart'] } },
+      pipeline: [
+        { $match: { date: { $lte: asOf }, $expr: { $gte: ['$date', '$$since'] } } },
+        { $project: { _id: 0, date: 1 } },
+      ],
+      as: 'periodPayments',
+    } },
+    { $project: {
+      rentStatus: 1,
+      next: { $let: {
+        vars: { paid: { $size: '$periodPayments' }, latest: { $max: '$periodPayments.date' } },
+        in: { $switch: {
+          branches: [
+            // Every owed period covered, the current one by a payment made since it started
+            { case: { $and: [{ $gte: ['$$paid', '$owed'] }, { $gte: ['$$latest', '$period.dueStart'] }] }, then: 'Paid' },
+            // Judged by the oldest due date left unpaid
+            { case: { $lt: [
+              { $cond: [{ $lt: ['$$paid', { $subtract: ['$owed', 1] }] }, '$period.prevDue', '$period.due'] },
+              lateBefore,
+            ] }, then: 'Overdue' },
+          ],
+          default: 'Pending',
+        } },
+      } },
+    } },
+    { $match: { $expr: { $ne: ['$rentStatus', '$next'] } } },
+  ];
+}
+
+// Meant to be triggered daily by a scheduler (cron, rent_cycle.py run). `asOf` (YYYY-MM-DD)
+// defaults to the current UTC day; rent_cycle.py simulate passes its own clock. `tenantIds`
+// limits the run to those tenants, so tests never touch anyone else's status.
+async function runRentCycle(request) {
+  const body = await request.json().catch(() => ({}));
+  const asOf = body.asOf || new Date().toISOString().slice(0, 10);
+  const { tenantIds } = body;
+  if (!/^\d{4}-\d{2}-\d{2}$/.test(asOf) || new Date(Date.parse(asOf) || 0).toISOString().slice(0, 10) !== asOf) {
+    return jsonResponse(
+      { error: 'asOf must be YYYY-MM-DD' },
+      { status: 400, headers: corsHeaders }
+    );
+  }
+  if (tenantIds !== undefined && !(Array.isArray(tenantIds) && tenantIds.every((id) => typeof id === 'string'))) {
+    return jsonResponse(
+      { error: 'tenantIds must be an array of strings' },
+      { status: 400, headers: corsHeaders }
+    );
+  }
+
+  const collection = await getCollection('tenants');
+  const changes = await timed('db', () => collection.aggregate(rentCyclePipeline(asOf, tenantIds)).toArray());
+
+  // One updateMany per (current, next) status pair, all in a single bulkWrite. Filtering on the
+  // status that was read keeps a payment recorded meanwhile from being overwritten.
+  const groups = new Map();
+  for (const { _id, rentStatus = null, next } of changes) {
+    const key = `${rentStatus}>${next}`;
+    if (!groups.has(key)) groups.set(key, { rentStatus, next, ids: [] });
+    groups.get(key).ids.push(_id);
+  }
+  const transitions = Object.fromEntries(RENT_STATUSES.map((status) => [status, 0]));
+  for (const { next, ids } of groups.values()) transitions[next] += ids.length;
+
+  let updated = 0;
+  if (groups.size) {
+    const updatedAt = new Date().toISOString();
+    const operations = [...groups.values()].map(({ rentStatus, next, ids }) => ({
+      updateMany: { filter: { _id: { $in: ids }, rentStatus }, update: { $set: { rentStatus: next, updatedAt } } },
+    }));
+    const result = await timed('cascade', () => collection.bulkWrite(operations, { ordered: false }));
+    updated = result.modifiedCount;
+    if (updated) await recordWrite('tenants');
+  }
+
+  // `transitions` counts the planned moves into each status; `skipped` those that lost a race
+  return jsonResponse(
+    { asOf, graceDays: RENT_GRACE_DAYS, updated, skipped: changes.length - updated, transitions },
+    { headers: corsHeaders }
+  );
+}
+
+// ==================== HEALTH ROUTES ====================
+
+function poolSnapshot() {
+  return {
+    maxPoolSize: MONGO_OPTIONS.maxPoolSize,
+    minPoolSize: MONGO_OPTIONS.minPoolSize,
+    ...poolStats,
+    open: poolStats.connectionsCreated - poolStats.connectionsClosed,
+  };
+}
+
+// Readiness probe and warm-up: connects (once per instance) and pings Mongo. `warm` says
+// whether the client was already connected when the request arrived.
+async function getHealth() {
+  const warm = Boolean(client);
+  const headers = { ...corsHeaders, 'Cache-Control': 'no-store' };
+  try {
+    const database = await timed('connect', connectDB);
+    await timed('db', () => database.command({ ping: 1 }));
+  } catch (error) {
+    return jsonResponse(
+      { status: 'error', warm, error: error.message, pool: poolSnapshot() },
+      { status: 503, headers }
+    );
+  }
+  return jsonResponse(
+    { status: 'ok', warm, uptimeMs: Math.round(process.uptime() * 1000), pool: poolSnapshot() },
+    { headers }
+  );
 }
 
 // ==================== MAIN ROUTER ====================
 
-export async function GET(request, { params }) {
+export async function GET(request, context) {
+  return withTiming('GET', request, () => routeGet(request, context));
+}
+
+async function routeGet(request, { params }) {
   try {
     const path = params.path ? params.path.join('/') : '';
+    const pathParts = path.split('/');
+    
+    if (path === 'properties') return await getProperties(request);
+    if (path === 'tenants') return await getTenants(request);
+    if (path === 'payments') return await getPayments(request);
+    if (path === 'expenses') return await getExpenses(request);
+    if (path === 'settings') return await getSettings(request);
+    if (path === 'stats') return await getStats(request);
+    if (path === 'changes') return await getChanges(request);
+    if (path === 'health') return await getHealth();
+    if (pathParts[0] === 'export' && pathParts.length === 2 && Object.hasOwn(EXPORT_COLUMNS, pathParts[1])) {
+      return await exportCollection(pathParts[1], request);
+    }
     
-    if (path === 'properties') return await getProperties();
-    if (path === 'tenants') return await getTenants();
-    if (path === 'payments') return await getPayments();
-    if (path === 'expenses') return await getExpenses();
-    if (path === 'settings') return await getSettings();
+    if (RECORD_COLLECTIONS.includes(pathParts[0]) && pathParts[1]) {
+      return await getRecord(request, pathParts[0], pathParts[1]);
+    }
     
-    return NextResponse.json({ message: 'API is running' }, { headers: corsHeaders });
+    return jsonResponse({ message: 'API is running' }, { headers: corsHeaders });
   } catch (error) {
     console.error('GET Error:', error);
-    return NextResponse.json(
+    return jsonResponse(
       { error: error.message },
       { status: 500, headers: corsHeaders }
     );
   }
 }
 
-export async function POST(request, { params }) {
+export async function POST(request, context) {
+  return withTiming('POST', request, () => routePost(request, context));
+}
+
+async function routePost(request, { params }) {
   try {
     const path = params.path ? params.path.join('/') : '';
     
@@ -301,21 +1241,28 @@ export async function POST(request, { params }) {
     if (path === 'tenants') return await createTenant(request);
     if (path === 'payments') return await createPayment(request);
     if (path === 'expenses') return await createExpense(request);
+    if (path === 'payments/bulk') return await createPaymentsBulk(request);
+    if (path === 'expenses/bulk') return await createExpensesBulk(request);
+    if (path === 'rent-cycle') return await runRentCycle(request);
     
-    return NextResponse.json(
+    return jsonResponse(
       { error: 'Not found' },
       { status: 404, headers: corsHeaders }
     );
   } catch (error) {
     console.error('POST Error:', error);
-    return NextResponse.json(
+    return jsonResponse(
       { error: error.message },
-      { status: 500, headers: corsHeaders }
+      { status: error.status || 500, headers: corsHeaders }
     );
   }
 }
 
-export async function PUT(request, { params }) {
+export async function PUT(request, context) {
+  return withTiming('PUT', request, () => routePut(request, context));
+}
+
+async function routePut(request, { params }) {
   try {
     const path = params.path ? params.path.join('/') : '';
     const pathParts = path.split('/');
@@ -330,20 +1277,24 @@ export async function PUT(request, { params }) {
       return await updateSettings(request);
     }
     
-    return NextResponse.json(
+    return jsonResponse(
       { error: 'Not found' },
       { status: 404, headers: corsHeaders }
     );
   } catch (error) {
     console.error('PUT Error:', error);
-    return NextResponse.json(
+    return jsonResponse(
       { error: error.message },
       { status: 500, headers: corsHeaders }
     );
   }
 }
 
-export async function DELETE(request, { params }) {
+export async function DELETE(request, context) {
+  return withTiming('DELETE', request, () => routeDelete(request, context));
+}
+
+async function routeDelete(request, { params }) {
   try {
     const path = params.path ? params.path.join('/') : '';
     const pathParts = path.split('/');
@@ -354,17 +1305,20 @@ export async function DELETE(request, { params }) {
     if (pathParts[0] === 'tenants' && pathParts[1]) {
       return await deleteTenant(pathParts[1]);
     }
+    if (pathParts[0] === 'payments' && pathParts[1]) {
+      return await deletePayment(pathParts[1]);
+    }
     if (pathParts[0] === 'expenses' && pathParts[1]) {
       return await deleteExpense(pathParts[1]);
     }
     
-    return NextResponse.json(
+    return jsonResponse(
       { error: 'Not found' },
       { status: 404, headers: corsHeaders }
     );
   } catch (error) {
     console.error('DELETE Error:', error);
-    return NextResponse.json(
+    return jsonResponse(
       { error: error.message },
       { status: 500, headers: corsHeaders }
     );
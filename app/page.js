@@ -76,7 +76,7 @@ export default function App() {
     .reduce((sum, t) => sum + (t.monthlyRent || 0), 0) : 0;
 
   const rentDue = Array.isArray(tenants) ? tenants
-    .filter(t => t.rentStatus === 'Pending')
+    .filter(t => t.rentStatus === 'Pending' || t.rentStatus === 'Overdue')
     .reduce((sum, t) => sum + (t.monthlyRent || 0), 0) : 0;
 
   const monthlyExpenses = Array.isArray(expenses) ? expenses
@@ -558,7 +558,7 @@ export default function App() {
                         <div className="flex-1">
                           <div className="flex items-center gap-3 mb-2">
                             <h3 className="text-lg font-bold text-gray-800">{tenant.name}</h3>
-                            <Badge variant={tenant.rentStatus === 'Paid' ? 'default' : 'secondary'} className={tenant.rentStatus === 'Paid' ? 'bg-green-500' : 'bg-orange-500'}>
+                            <Badge variant={tenant.rentStatus === 'Paid' ? 'default' : 'secondary'} className={tenant.rentStatus === 'Paid' ? 'bg-green-500' : tenant.rentStatus === 'Overdue' ? 'bg-red-500' : 'bg-orange-500'}>
                               {tenant.rentStatus}
                             </Badge>
                             {leaseStatus.status === 'expiring' && (
@@ -933,6 +933,7 @@ export default function App() {
                 <SelectContent>
                   <SelectItem value="Pending">Bekliyor</SelectItem>
                   <SelectItem value="Paid">Ödendi</SelectItem>
+                  <SelectItem value="Overdue">Gecikmiş</SelectItem>
                 </SelectContent>
               </Select>
             </div>
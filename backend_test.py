@@ -4,58 +4,354 @@ MyRentManager Backend API Testing Suite
 Tests all backend APIs following the specified test flow.
 """
 
+import argparse
+import base64
+import csv
 import requests
 import json
+import statistics
 import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 
+from api_emulator import EmulatorSession, emulator_requested
+
 # Base URL from environment
 BASE_URL = "https://landlordpro-6.preview.emergentagent.com"
 
-class MyRentManagerTester:
+# Entries kept by the opt-in HTTP cache (--http-cache)
+DEFAULT_CACHE_SIZE = 256
+
+# Suites run concurrently, each on its own tester and fixtures. A suite starts once every
+# suite in its `after` list has passed; its results are logged under the key of its name.
+SUITES = {
+    'settings': {'tests': ['test_settings_api', 'test_conditional_get_api', 'test_health_api', 'test_preflight_api'], 'fixtures': [], 'after': []},
+    'properties': {'tests': ['test_properties_api', 'test_pagination_api'], 'fixtures': [], 'after': []},
+    'tenants': {'tests': ['test_tenants_api', 'test_cleanup_and_verify_cascade'], 'fixtures': ['property'], 'after': ['properties']},
+    'payments': {'tests': ['test_payments_api', 'test_bulk_api', 'test_export_api'], 'fixtures': ['property', 'tenant'], 'after': ['tenants']},
+    'expenses': {'tests': ['test_expenses_api'], 'fixtures': ['property'], 'after': ['properties']},
+    'stats': {'tests': ['test_stats_api'], 'fixtures': ['property', 'tenant', 'payment'], 'after': ['payments']},
+    'sync': {'tests': ['test_sync_api'], 'fixtures': ['property'], 'after': ['properties']},
+    'rent_cycle': {'tests': ['test_rent_cycle_api'], 'fixtures': ['property', 'tenant'], 'after': ['tenants']},
+}
+DEFAULT_JOBS = len(SUITES)
+
+# A route regresses when a median grows past the threshold and by more than the noise floor
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+REGRESSION_FLOOR_MS = 2.0
+
+RECORD_ROUTES = ('properties', 'tenants', 'payments', 'expenses')
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def route_key(method, endpoint):
+    """Collapse record IDs so that e.g. PUT properties/<uuid> groups as PUT properties/{id}"""
+    parts = endpoint.split('?')[0].strip('/').split('/')
+    if len(parts) > 1 and parts[0] in RECORD_ROUTES and parts[1] != 'bulk':
+        parts[1] = '{id}'
+    return f"{method} {'/'.join(parts)}"
+
+
+def parse_server_timing(header, param='dur'):
+    """{phase: value} of one numeric parameter in a Server-Timing header such as
+    'db;dur=1.2;desc="2", total;dur=3.4'; param='desc' gives route.js's per-phase call counts"""
+    phases = {}
+    for entry in (header or '').split(','):
+        name, *params = [part.strip() for part in entry.split(';')]
+        for item in params:
+            key, _, value = item.partition('=')
+            if name and key == param:
+                try:
+                    phases[name] = float(value.strip('"'))
+                except ValueError:
+                    pass
+    return phases
+
+
+class TimingProfile:
+    """Thread-safe per-route record of client latency and Server-Timing phases"""
+
     def __init__(self):
-        self.base_url = BASE_URL
-        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, method, endpoint, elapsed, response):
+        phases = parse_server_timing(response.headers.get('Server-Timing')) if response is not None else {}
+        with self.lock:
+            self.samples.setdefault(route_key(method, endpoint), []).append((elapsed * 1000.0, phases))
+
+    def summary(self):
+        """{route: {count, client_p50_ms, client_p95_ms, server_ms: {phase: median}}}"""
+        routes = {}
+        with self.lock:
+            for key, samples in sorted(self.samples.items()):
+                client = sorted(ms for ms, _ in samples)
+                names = sorted({name for _, phases in samples for name in phases})
+                routes[key] = {
+                    'count': len(samples),
+                    'client_p50_ms': round(percentile(client, 50), 3),
+                    'client_p95_ms': round(percentile(client, 95), 3),
+                    'server_ms': {name: round(statistics.median(p[name] for _, p in samples if name in p), 3)
+                                  for name in names},
+                }
+        return routes
+
+    def write(self, path):
+        """Write the summary as CSV when the path ends in .csv, else as JSON"""
+        routes = self.summary()
+        if path.endswith('.csv'):
+            phases = sorted({name for stats in routes.values() for name in stats['server_ms']})
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['route', 'count', 'client_p50_ms', 'client_p95_ms'] + [f'server_{p}_ms' for p in phases])
+                for key, stats in routes.items():
+                    writer.writerow([key, stats['count'], stats['client_p50_ms'], stats['client_p95_ms']]
+                                    + [stats['server_ms'].get(p, '') for p in phases])
+        else:
+            with open(path, 'w') as f:
+                json.dump({'routes': routes}, f, indent=2)
+        return routes
+
+    def regressions(self, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+        """(route, metric, baseline_ms, current_ms) for every median that regressed past the threshold"""
+        found = []
+        for key, stats in self.summary().items():
+            base = baseline.get('routes', {}).get(key)
+            if not base:
+                continue
+            metrics = [('client_p50_ms', base.get('client_p50_ms'), stats['client_p50_ms']),
+                       ('server total', base.get('server_ms', {}).get('total'), stats['server_ms'].get('total'))]
+            for metric, before, after in metrics:
+                if before is None or after is None:
+                    continue
+                if after > before * (1 + threshold) and after - before > REGRESSION_FLOOR_MS:
+                    found.append((key, metric, before, after))
+        return found
+
+class MyRentManagerTester:
+    def __init__(self, base_url=BASE_URL, session=None, cache_size=0):
+        self.base_url = base_url
+        self.session = session or requests.Session()
         self.test_data = {}
+        # LRU of url -> last 200 response with an ETag, revalidated with If-None-Match
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.cache_stats = {'requests': 0, 'hits': 0, 'misses': 0, 'bytes_saved': 0}
+        # Unique per tester, so concurrently running suites can tell their records apart
+        self.tag = uuid.uuid4().hex[:8]
+        self.log = print
+        # Set to a TimingProfile to record every request's latency and Server-Timing phases
+        self.profile = None
         self.results = {
             'settings': {'passed': 0, 'failed': 0, 'errors': []},
             'properties': {'passed': 0, 'failed': 0, 'errors': []},
             'tenants': {'passed': 0, 'failed': 0, 'errors': []},
             'payments': {'passed': 0, 'failed': 0, 'errors': []},
-            'expenses': {'passed': 0, 'failed': 0, 'errors': []}
+            'expenses': {'passed': 0, 'failed': 0, 'errors': []},
+            'stats': {'passed': 0, 'failed': 0, 'errors': []},
+            'sync': {'passed': 0, 'failed': 0, 'errors': []},
+            'rent_cycle': {'passed': 0, 'failed': 0, 'errors': []}
         }
     
     def log_result(self, api, test_name, success, message=""):
         """Log test result"""
         if success:
             self.results[api]['passed'] += 1
-            print(f"✅ {api.upper()} - {test_name}: PASSED {message}")
+            self.log(f"✅ {api.upper()} - {test_name}: PASSED {message}")
         else:
             self.results[api]['failed'] += 1
             self.results[api]['errors'].append(f"{test_name}: {message}")
-            print(f"❌ {api.upper()} - {test_name}: FAILED - {message}")
+            self.log(f"❌ {api.upper()} - {test_name}: FAILED - {message}")
     
-    def make_request(self, method, endpoint, data=None):
+    def make_request(self, method, endpoint, data=None, stream=False, headers=None):
         """Make HTTP request with error handling"""
         url = f"{self.base_url}/{endpoint}"
         try:
             if method == 'GET':
-                response = self.session.get(url)
+                if self.cache_size and not stream and headers is None:
+                    return self.cached_get(endpoint)
+                response = self.send('GET', endpoint, stream=stream, headers=headers)
             elif method == 'POST':
-                response = self.session.post(url, json=data)
+                response = self.send('POST', endpoint, json=data, headers=headers)
             elif method == 'PUT':
-                response = self.session.put(url, json=data)
+                response = self.send('PUT', endpoint, json=data, headers=headers)
             elif method == 'DELETE':
-                response = self.session.delete(url)
+                response = self.send('DELETE', endpoint, headers=headers)
+            elif method == 'OPTIONS':
+                response = self.send('OPTIONS', endpoint, headers=headers)
             
             return response
         except Exception as e:
-            print(f"Request error for {method} {url}: {str(e)}")
+            self.log(f"Request error for {method} {url}: {str(e)}")
             return None
     
+    def send(self, method, endpoint, **kwargs):
+        """One round trip through the session, timed into the profile when profiling"""
+        start = time.perf_counter()
+        response = getattr(self.session, method.lower())(f"{self.base_url}/{endpoint}", **kwargs)
+        if self.profile is not None:
+            self.profile.record(method, endpoint, time.perf_counter() - start, response)
+        return response
+    
+    def cached_get(self, endpoint):
+        """GET through the LRU cache: revalidate the cached copy and reuse it on 304"""
+        url = f"{self.base_url}/{endpoint}"
+        self.cache_stats['requests'] += 1
+        cached = self.cache.get(url)
+        headers = {'If-None-Match': cached.headers['ETag']} if cached is not None else None
+        response = self.send('GET', endpoint, headers=headers)
+        
+        if response.status_code == 304 and cached is not None:
+            self.cache.move_to_end(url)
+            self.cache_stats['hits'] += 1
+            self.cache_stats['bytes_saved'] += len(cached.content)
+            return cached
+        
+        self.cache_stats['misses'] += 1
+        if response.status_code == 200 and response.headers.get('ETag'):
+            self.cache[url] = response
+            self.cache.move_to_end(url)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.pop(url, None)
+        return response
+    
+    def get_record(self, collection, record_id):
+        """Fetch a single record by ID; None if it does not exist or the request failed"""
+        response = self.make_request('GET', f'{collection}/{record_id}')
+        if response and response.status_code == 200:
+            return response.json()
+        return None
+
+    def create_many(self, collection, items, batch_size=500, ordered=False):
+        """Create records through the bulk endpoint in batches.
+        Returns (created, errors); error indexes refer to positions in `items`."""
+        created, errors = [], []
+        for offset in range(0, len(items), batch_size):
+            batch = items[offset:offset + batch_size]
+            response = self.make_request('POST', f'{collection}/bulk', {'items': batch, 'ordered': ordered})
+            try:
+                result = response.json() if response is not None else {'error': 'No response'}
+            except ValueError:
+                result = {'error': f"Status: {response.status_code}"}
+            if 'errors' not in result:
+                errors.extend({'index': offset + i, 'error': result.get('error')} for i in range(len(batch)))
+            else:
+                created.extend(result['items'])
+                errors.extend({'index': offset + e['index'], 'error': e['error']} for e in result['errors'])
+            if ordered and errors:
+                errors.extend({'index': i, 'error': 'Not attempted: an earlier item failed'}
+                              for i in range(offset + len(batch), len(items)))
+                break
+        return created, errors
+
+    def iter_pages(self, collection, limit=100):
+        """Yield successive keyset pages of a collection without loading the whole thing"""
+        cursor = None
+        while True:
+            endpoint = f"{collection}?limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+            response = self.make_request('GET', endpoint)
+            if not response or response.status_code != 200:
+                raise RuntimeError(f"GET {endpoint} failed: {response.status_code if response is not None else 'No response'}")
+            page = response.json()
+            yield page['items']
+            cursor = page.get('next')
+            if not cursor:
+                return
+
+    def iter_records(self, collection, limit=100):
+        """Yield records one at a time, fetching the next page only when the current one is used up"""
+        for page in self.iter_pages(collection, limit):
+            yield from page
+
+    def stream_records(self, collection):
+        """Yield records from the NDJSON stream as they arrive"""
+        response = self.make_request('GET', f"{collection}?format=ndjson", stream=True)
+        if not response or response.status_code != 200:
+            raise RuntimeError(f"GET {collection}?format=ndjson failed: {response.status_code if response is not None else 'No response'}")
+        try:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+        finally:
+            response.close()
+
+    def create_fixture(self, collection, record):
+        """POST a fixture record; raises RuntimeError if it was not created"""
+        response = self.make_request('POST', collection, record)
+        if not response or response.status_code != 201:
+            raise RuntimeError(f"Fixture in {collection} not created: {response.status_code if response is not None else 'No response'}")
+        return response.json()
+
+    def create_fixture_property(self, label='Fixture Property'):
+        """Create a vacant property named with this tester's tag"""
+        return self.create_fixture('properties', {
+            'name': f'{label} [{self.tag}]',
+            'address': f'{self.tag} Fixture Street',
+            'type': 'Apartment',
+            'monthlyRent': 1000.00,
+            'status': 'Vacant'
+        })
+
+    def create_fixtures(self, kinds):
+        """Create the named fixtures in order, filling the same test_data keys the tests populate"""
+        for kind in kinds:
+            if kind == 'property':
+                prop = self.create_fixture_property()
+                self.test_data['property_id'] = prop['id']
+                self.test_data['property_name'] = prop['name']
+            elif kind == 'tenant':
+                tenant = self.create_fixture('tenants', {
+                    'name': f'Fixture Tenant [{self.tag}]',
+                    'email': f'{self.tag}@fixture.test',
+                    'phone': '+1-555-0100',
+                    'propertyId': self.test_data['property_id'],
+                    'propertyName': self.test_data['property_name'],
+                    'monthlyRent': 1000.00,
+                    'leaseStart': datetime.now().strftime('%Y-%m-%d'),
+                    'leaseEnd': (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d'),
+                    'rentStatus': 'Pending'
+                })
+                self.test_data['tenant_id'] = tenant['id']
+                self.test_data['tenant_name'] = tenant['name']
+            elif kind == 'payment':
+                payment = self.create_fixture('payments', {
+                    'tenantId': self.test_data['tenant_id'],
+                    'tenantName': self.test_data['tenant_name'],
+                    'propertyId': self.test_data['property_id'],
+                    'propertyName': self.test_data['property_name'],
+                    'amount': 1000.00,
+                    'date': datetime.now().strftime('%Y-%m-%d'),
+                    'status': 'Paid'
+                })
+                self.test_data['payment_id'] = payment['id']
+            else:
+                raise ValueError(f"Unknown fixture: {kind}")
+
+    def teardown(self):
+        """Delete whatever records this tester still references; deletes of missing ids succeed"""
+        for key, collection in (('payment_id', 'payments'), ('expense_id', 'expenses'),
+                                ('tenant_id', 'tenants'), ('property_id', 'properties')):
+            if key in self.test_data:
+                self.make_request('DELETE', f'{collection}/{self.test_data.pop(key)}')
+
     def test_settings_api(self):
         """Test Settings API - GET and PUT"""
-        print("\n=== Testing Settings API ===")
+        self.log("\n=== Testing Settings API ===")
         
         # Test GET settings (should auto-create if not exists)
         response = self.make_request('GET', 'settings')
@@ -84,9 +380,72 @@ class MyRentManagerTester:
         else:
             self.log_result('settings', 'PUT settings', False, f"Status: {response.status_code if response else 'No response'}")
     
+    def test_conditional_get_api(self):
+        """Test ETag / If-None-Match revalidation on GET settings"""
+        self.log("\n=== Testing Conditional GET ===")
+        
+        response = self.make_request('GET', 'settings', headers={})
+        etag = response.headers.get('ETag') if response is not None else None
+        if response and response.status_code == 200 and etag:
+            self.log_result('settings', 'GET settings ETag', True, f"ETag: {etag}")
+        else:
+            self.log_result('settings', 'GET settings ETag', False, f"Status: {response.status_code if response is not None else 'No response'}, ETag: {etag}")
+            return
+        
+        response = self.make_request('GET', 'settings', headers={'If-None-Match': etag})
+        if response is not None and response.status_code == 304 and not response.content:
+            self.log_result('settings', 'GET settings unchanged', True, "304 Not Modified with empty body")
+        else:
+            self.log_result('settings', 'GET settings unchanged', False, f"Expected 304, got {response.status_code if response is not None else 'No response'}")
+        
+        self.make_request('PUT', 'settings', {'currency': '₺', 'notifications': True})
+        response = self.make_request('GET', 'settings', headers={'If-None-Match': etag})
+        if response and response.status_code == 200 and response.headers.get('ETag') not in (None, etag):
+            self.log_result('settings', 'GET settings after write', True, f"New ETag: {response.headers.get('ETag')}")
+        else:
+            self.log_result('settings', 'GET settings after write', False, f"Expected 200 with a new ETag, got {response.status_code if response is not None else 'No response'}")
+    
+    def test_health_api(self):
+        """Test GET health: pings Mongo, and requests keep reusing the server's existing client"""
+        self.log("\n=== Testing Health API ===")
+        
+        response = self.make_request('GET', 'health')
+        if response is None or response.status_code != 200:
+            self.log_result('settings', 'GET health', False, f"Status: {response.status_code if response is not None else 'No response'}")
+            return
+        health = response.json()
+        pool = health.get('pool', {})
+        if health.get('status') == 'ok' and health.get('warm') and response.headers.get('Cache-Control') == 'no-store':
+            self.log_result('settings', 'GET health', True, f"Up {health.get('uptimeMs')} ms, {pool.get('open')} open connections")
+        else:
+            self.log_result('settings', 'GET health', False, f"Unexpected health: {health}")
+        
+        # clientsCreated counts the whole process (a failed connect is retried with a new client), so
+        # only check that this suite's requests did not add one; cold_start.py checks a fresh instance
+        before = pool.get('clientsCreated')
+        for endpoint in ('settings', 'properties?limit=1', 'tenants?limit=1', 'stats'):
+            self.make_request('GET', endpoint)
+        response = self.make_request('GET', 'health')
+        after = response.json().get('pool', {}).get('clientsCreated') if response and response.status_code == 200 else None
+        if before is not None and after == before:
+            self.log_result('settings', 'GET health client reused', True, f"Still {after} client(s) created")
+        else:
+            self.log_result('settings', 'GET health client reused', False, f"clientsCreated went from {before} to {after}")
+    
+    def test_preflight_api(self):
+        """Test CORS preflight responses carry Server-Timing like every other route"""
+        self.log("\n=== Testing CORS Preflight ===")
+        
+        response = self.make_request('OPTIONS', 'properties')
+        if response is not None and response.status_code == 200 and 'total' in parse_server_timing(response.headers.get('Server-Timing')):
+            self.log_result('settings', 'OPTIONS Server-Timing', True, response.headers['Server-Timing'])
+        else:
+            self.log_result('settings', 'OPTIONS Server-Timing', False, f"Status: {response.status_code if response is not None else 'No response'}, "
+                            f"Server-Timing: {response.headers.get('Server-Timing') if response is not None else None}")
+    
     def test_properties_api(self):
         """Test Properties CRUD API"""
-        print("\n=== Testing Properties API ===")
+        self.log("\n=== Testing Properties API ===")
         
         # Test GET properties (initially empty)
         response = self.make_request('GET', 'properties')
@@ -131,14 +490,79 @@ class MyRentManagerTester:
                 if updated_property.get('name') == 'Sunset Luxury Apartments' and updated_property.get('monthlyRent') == 1350.00:
                     self.log_result('properties', 'PUT update property', True, "Property updated successfully")
                     self.test_data['property_name'] = updated_property['name']
+
+                    # Verify the update was persisted
+                    stored_property = self.get_record('properties', self.test_data['property_id'])
+                    if stored_property and stored_property.get('monthlyRent') == 1350.00:
+                        self.log_result('properties', 'GET property by ID', True, "Update persisted")
+                    else:
+                        self.log_result('properties', 'GET property by ID', False, "Update not visible when read back by ID")
                 else:
                     self.log_result('properties', 'PUT update property', False, "Property not updated correctly")
             else:
                 self.log_result('properties', 'PUT update property', False, f"Status: {response.status_code if response else 'No response'}")
     
+    def test_pagination_api(self):
+        """Test cursor pagination and NDJSON streaming on the collection endpoints"""
+        self.log("\n=== Testing Pagination and Streaming ===")
+
+        # Test GET properties with a limit returns a page envelope
+        response = self.make_request('GET', 'properties?limit=1')
+        if response and response.status_code == 200:
+            page = response.json()
+            if isinstance(page, dict) and isinstance(page.get('items'), list) and len(page['items']) <= 1 and 'next' in page:
+                self.log_result('properties', 'GET properties page', True, f"Page of {len(page['items'])} with next cursor: {bool(page['next'])}")
+            else:
+                self.log_result('properties', 'GET properties page', False, "Response is not an {items, next} page")
+        else:
+            self.log_result('properties', 'GET properties page', False, f"Status: {response.status_code if response else 'No response'}")
+
+        # Test invalid cursors are rejected
+        response = self.make_request('GET', 'properties?cursor=not-a-cursor')
+        if response is not None and response.status_code == 400:
+            self.log_result('properties', 'GET properties invalid cursor', True, "Rejected with 400")
+        else:
+            self.log_result('properties', 'GET properties invalid cursor', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
+        # Test tampered cursors carrying query operators or wrong types are rejected
+        tampered = [[{'$ne': None}, 'x'], ['2024-01-01', {'$gt': ''}], [True, 'x'], {'value': 1, 'id': 'x'}, ['only']]
+        statuses = []
+        for position in tampered:
+            token = base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+            response = self.make_request('GET', f'properties?limit=1&cursor={token}')
+            statuses.append(response.status_code if response is not None else None)
+        if all(status == 400 for status in statuses):
+            self.log_result('properties', 'GET properties tampered cursor', True, f"{len(tampered)} tampered cursors rejected with 400")
+        else:
+            self.log_result('properties', 'GET properties tampered cursor', False, f"Statuses: {statuses}")
+
+        # Test paged and streamed reads see this suite's tagged records exactly once, like the full dump.
+        # Other suites may be writing properties concurrently, so only the tagged ones are compared.
+        tagged = [self.create_fixture_property(f'Paging {i}') for i in range(3)]
+        tagged_ids = sorted(p['id'] for p in tagged)
+        own = lambda records: sorted(p['id'] for p in records if p['id'] in tagged_ids)
+        try:
+            response = self.make_request('GET', 'properties')
+            if not response or response.status_code != 200:
+                raise RuntimeError(f"GET properties failed: {response.status_code if response is not None else 'No response'}")
+            full_ids = own(response.json())
+            paged_ids = own(self.iter_records('properties', limit=2))
+            streamed_ids = own(self.stream_records('properties'))
+        except RuntimeError as e:
+            self.log_result('properties', 'Paged and streamed reads match full dump', False, str(e))
+        else:
+            if full_ids == paged_ids == streamed_ids == tagged_ids:
+                self.log_result('properties', 'Paged and streamed reads match full dump', True, f"{len(tagged_ids)} tagged records once in every mode")
+            else:
+                self.log_result('properties', 'Paged and streamed reads match full dump', False,
+                                f"full={len(full_ids)} paged={len(paged_ids)} streamed={len(streamed_ids)} of {len(tagged_ids)}")
+        finally:
+            for prop in tagged:
+                self.make_request('DELETE', f"properties/{prop['id']}")
+
     def test_tenants_api(self):
         """Test Tenants CRUD API"""
-        print("\n=== Testing Tenants API ===")
+        self.log("\n=== Testing Tenants API ===")
         
         # Test GET tenants (initially empty)
         response = self.make_request('GET', 'tenants')
@@ -173,14 +597,11 @@ class MyRentManagerTester:
                     self.test_data['tenant_name'] = created_tenant['name']
                     
                     # Verify property status changed to Occupied
-                    prop_response = self.make_request('GET', 'properties')
-                    if prop_response and prop_response.status_code == 200:
-                        properties = prop_response.json()
-                        target_property = next((p for p in properties if p['id'] == self.test_data['property_id']), None)
-                        if target_property and target_property.get('status') == 'Occupied':
-                            self.log_result('tenants', 'Property status update on tenant creation', True, "Property status changed to Occupied")
-                        else:
-                            self.log_result('tenants', 'Property status update on tenant creation', False, f"Property status is {target_property.get('status') if target_property else 'not found'}")
+                    target_property = self.get_record('properties', self.test_data['property_id'])
+                    if target_property and target_property.get('status') == 'Occupied':
+                        self.log_result('tenants', 'Property status update on tenant creation', True, "Property status changed to Occupied")
+                    else:
+                        self.log_result('tenants', 'Property status update on tenant creation', False, f"Property status is {target_property.get('status') if target_property else 'not found'}")
                 else:
                     self.log_result('tenants', 'POST create tenant', False, "Missing ID or incorrect data in response")
             else:
@@ -205,6 +626,13 @@ class MyRentManagerTester:
                 if updated_tenant.get('name') == 'John A. Smith':
                     self.log_result('tenants', 'PUT update tenant', True, "Tenant updated successfully")
                     self.test_data['tenant_name'] = updated_tenant['name']
+
+                    # Verify the update was persisted
+                    stored_tenant = self.get_record('tenants', self.test_data['tenant_id'])
+                    if stored_tenant and stored_tenant.get('email') == 'john.a.smith@email.com':
+                        self.log_result('tenants', 'GET tenant by ID', True, "Update persisted")
+                    else:
+                        self.log_result('tenants', 'GET tenant by ID', False, "Update not visible when read back by ID")
                 else:
                     self.log_result('tenants', 'PUT update tenant', False, "Tenant not updated correctly")
             else:
@@ -212,7 +640,7 @@ class MyRentManagerTester:
     
     def test_payments_api(self):
         """Test Payments API"""
-        print("\n=== Testing Payments API ===")
+        self.log("\n=== Testing Payments API ===")
         
         # Test GET payments (initially empty)
         response = self.make_request('GET', 'payments')
@@ -241,22 +669,124 @@ class MyRentManagerTester:
                     self.test_data['payment_id'] = created_payment['id']
                     
                     # Verify tenant rent status changed to Paid
-                    tenant_response = self.make_request('GET', 'tenants')
-                    if tenant_response and tenant_response.status_code == 200:
-                        tenants = tenant_response.json()
-                        target_tenant = next((t for t in tenants if t['id'] == self.test_data['tenant_id']), None)
-                        if target_tenant and target_tenant.get('rentStatus') == 'Paid':
-                            self.log_result('payments', 'Tenant rent status update on payment', True, "Tenant rent status changed to Paid")
-                        else:
-                            self.log_result('payments', 'Tenant rent status update on payment', False, f"Tenant rent status is {target_tenant.get('rentStatus') if target_tenant else 'not found'}")
+                    target_tenant = self.get_record('tenants', self.test_data['tenant_id'])
+                    if target_tenant and target_tenant.get('rentStatus') == 'Paid':
+                        self.log_result('payments', 'Tenant rent status update on payment', True, "Tenant rent status changed to Paid")
+                    else:
+                        self.log_result('payments', 'Tenant rent status update on payment', False, f"Tenant rent status is {target_tenant.get('rentStatus') if target_tenant else 'not found'}")
+
+                    # Verify the payment can be read back by ID
+                    stored_payment = self.get_record('payments', self.test_data['payment_id'])
+                    if stored_payment and stored_payment.get('amount') == 1350.00:
+                        self.log_result('payments', 'GET payment by ID', True, "Payment read back by ID")
+                    else:
+                        self.log_result('payments', 'GET payment by ID', False, "Payment not found by ID")
                 else:
                     self.log_result('payments', 'POST create payment', False, "Missing ID or incorrect data in response")
             else:
                 self.log_result('payments', 'POST create payment', False, f"Status: {response.status_code if response else 'No response'}")
     
+    def test_bulk_api(self):
+        """Test bulk payment and expense creation"""
+        self.log("\n=== Testing Bulk API ===")
+
+        if 'tenant_id' not in self.test_data:
+            return
+
+        # Reset the tenant to Pending so the bulk cascade is observable
+        tenant = self.get_record('tenants', self.test_data['tenant_id'])
+        if tenant:
+            self.make_request('PUT', f'tenants/{tenant["id"]}', dict(tenant, rentStatus='Pending'))
+
+        # Test POST payments/bulk with one valid and one invalid item (unordered: partial success)
+        payment = {
+            'tenantId': self.test_data['tenant_id'],
+            'tenantName': self.test_data['tenant_name'],
+            'propertyId': self.test_data['property_id'],
+            'propertyName': self.test_data['property_name'],
+            'amount': 1350.00,
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'status': 'Paid'
+        }
+        response = self.make_request('POST', 'payments/bulk', {'items': [payment, dict(payment, amount='abc')]})
+        if response is not None and response.status_code == 207:
+            result = response.json()
+            self.test_data['bulk_payment_ids'] = [p['id'] for p in result['items']]
+            if result['inserted'] == 1 and [e['index'] for e in result['errors']] == [1]:
+                self.log_result('payments', 'POST payments/bulk', True, "1 inserted, invalid item reported at index 1")
+            else:
+                self.log_result('payments', 'POST payments/bulk', False, f"inserted={result['inserted']} errors={result['errors']}")
+
+            target_tenant = self.get_record('tenants', self.test_data['tenant_id'])
+            if target_tenant and target_tenant.get('rentStatus') == 'Paid':
+                self.log_result('payments', 'Tenant rent status update on bulk payment', True, "Tenant rent status changed to Paid")
+            else:
+                self.log_result('payments', 'Tenant rent status update on bulk payment', False, f"Tenant rent status is {target_tenant.get('rentStatus') if target_tenant else 'not found'}")
+        else:
+            self.log_result('payments', 'POST payments/bulk', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
+        # Test client batch mode against expenses/bulk
+        expenses = [{
+            'propertyId': self.test_data['property_id'],
+            'propertyName': self.test_data['property_name'],
+            'description': f'Bulk import {i}',
+            'amount': 10.0 * (i + 1),
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'category': 'Utilities'
+        } for i in range(3)]
+        created, errors = self.create_many('expenses', expenses, batch_size=2)
+        if len(created) == 3 and not errors:
+            self.log_result('expenses', 'POST expenses/bulk (batched)', True, "3 expenses created in 2 batches")
+        else:
+            self.log_result('expenses', 'POST expenses/bulk (batched)', False, f"created={len(created)} errors={errors}")
+
+        # Remove the bulk-created records again
+        for payment_id in self.test_data.pop('bulk_payment_ids', []):
+            self.make_request('DELETE', f'payments/{payment_id}')
+        for expense in created:
+            self.make_request('DELETE', f'expenses/{expense["id"]}')
+
+    def test_export_api(self):
+        """Test streaming CSV/NDJSON export filtered by property and date range"""
+        self.log("\n=== Testing Export API ===")
+
+        if 'payment_id' not in self.test_data:
+            return
+        prop_id = self.test_data['property_id']
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        # Test CSV export of this property's payments
+        response = self.make_request('GET', f"export/payments?format=csv&propertyId={prop_id}&from={today}&to={today}", stream=True)
+        if response and response.status_code == 200 and response.headers.get('Content-Type', '').startswith('text/csv'):
+            rows = list(csv.DictReader(response.iter_lines(decode_unicode=True)))
+            if any(row['id'] == self.test_data['payment_id'] for row in rows) and all(row['propertyId'] == prop_id for row in rows):
+                self.log_result('payments', 'GET export CSV', True, f"{len(rows)} rows for the test property")
+            else:
+                self.log_result('payments', 'GET export CSV', False, f"Test payment missing or other properties in {len(rows)} rows")
+        else:
+            self.log_result('payments', 'GET export CSV', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
+        # Test NDJSON export with a date range that excludes today
+        response = self.make_request('GET', f"export/payments?format=ndjson&propertyId={prop_id}&to=2000-01-01", stream=True)
+        if response and response.status_code == 200:
+            lines = [line for line in response.iter_lines() if line]
+            if not lines:
+                self.log_result('payments', 'GET export NDJSON date range', True, "No rows before the range end")
+            else:
+                self.log_result('payments', 'GET export NDJSON date range', False, f"{len(lines)} rows outside the range")
+        else:
+            self.log_result('payments', 'GET export NDJSON date range', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
+        # Test invalid parameters are rejected
+        response = self.make_request('GET', 'export/payments?from=last-year')
+        if response is not None and response.status_code == 400:
+            self.log_result('payments', 'GET export invalid range', True, "Rejected with 400")
+        else:
+            self.log_result('payments', 'GET export invalid range', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
     def test_expenses_api(self):
         """Test Expenses API"""
-        print("\n=== Testing Expenses API ===")
+        self.log("\n=== Testing Expenses API ===")
         
         # Test GET expenses (initially empty)
         response = self.make_request('GET', 'expenses')
@@ -292,16 +822,175 @@ class MyRentManagerTester:
             response = self.make_request('DELETE', f'expenses/{self.test_data["expense_id"]}')
             if response and response.status_code == 200:
                 result = response.json()
-                if result.get('success'):
+                if result.get('success') and self.get_record('expenses', self.test_data['expense_id']) is None:
                     self.log_result('expenses', 'DELETE expense', True, "Expense deleted successfully")
                 else:
                     self.log_result('expenses', 'DELETE expense', False, "Delete operation did not return success")
             else:
                 self.log_result('expenses', 'DELETE expense', False, f"Status: {response.status_code if response else 'No response'}")
     
+    def test_stats_api(self):
+        """Test Dashboard Stats API"""
+        self.log("\n=== Testing Stats API ===")
+
+        # Test GET stats (test property, tenant and payment exist at this point)
+        response = self.make_request('GET', 'stats')
+        if response and response.status_code == 200:
+            stats = response.json()
+            required = ['totalProperties', 'occupiedProperties', 'totalTenants', 'monthlyIncome', 'rentDue', 'monthlyExpenses', 'netIncome', 'chart']
+            if all(field in stats for field in required) and len(stats['chart']) == 12:
+                self.log_result('stats', 'GET stats', True, f"{stats['totalProperties']} properties, {stats['occupiedProperties']} occupied")
+            else:
+                self.log_result('stats', 'GET stats', False, "Missing required fields in response")
+                return
+            if 'tenant_id' in self.test_data and stats['occupiedProperties'] >= 1 and stats['paidTenants'] >= 1:
+                self.log_result('stats', 'Stats reflect test data', True, "Occupied property and paid tenant counted")
+            elif 'tenant_id' in self.test_data:
+                self.log_result('stats', 'Stats reflect test data', False, f"occupied={stats['occupiedProperties']} paid={stats['paidTenants']}")
+        else:
+            self.log_result('stats', 'GET stats', False, f"Status: {response.status_code if response else 'No response'}")
+
+        # Test invalid month is rejected
+        response = self.make_request('GET', 'stats?month=June')
+        if response is not None and response.status_code == 400:
+            self.log_result('stats', 'GET stats invalid month', True, "Rejected with 400")
+        else:
+            self.log_result('stats', 'GET stats invalid month', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
+    def test_sync_api(self):
+        """Test Delta Sync API - full reset, then upserts and tombstones since a token"""
+        self.log("\n=== Testing Sync API ===")
+        prop_id = self.test_data['property_id']
+
+        # Test GET changes without a token (full snapshot)
+        response = self.make_request('GET', 'changes')
+        if response and response.status_code == 200 and response.json().get('reset') is True:
+            changes = response.json()
+            if any(p['id'] == prop_id for p in changes['upserted']['properties']):
+                self.log_result('sync', 'GET changes snapshot', True, f"Token: {changes['token']}")
+            else:
+                self.log_result('sync', 'GET changes snapshot', False, "Fixture property missing from the snapshot")
+                return
+        else:
+            self.log_result('sync', 'GET changes snapshot', False, f"Status: {response.status_code if response is not None else 'No response'}")
+            return
+
+        # Test an update shows up as an upsert since the token
+        prop = self.get_record('properties', prop_id)
+        self.make_request('PUT', f'properties/{prop_id}', dict(prop, name=f"Synced Property [{self.tag}]"))
+        response = self.make_request('GET', f"changes?since={changes['token']}")
+        if response and response.status_code == 200 and response.json().get('reset') is False:
+            delta = response.json()
+            upserted = {p['id']: p for p in delta['upserted']['properties']}
+            if upserted.get(prop_id, {}).get('name') == f"Synced Property [{self.tag}]":
+                self.log_result('sync', 'GET changes after update', True,
+                                f"{sum(len(items) for items in delta['upserted'].values())} records upserted")
+            else:
+                self.log_result('sync', 'GET changes after update', False, "Updated property missing from the delta")
+        else:
+            self.log_result('sync', 'GET changes after update', False, f"Status: {response.status_code if response is not None else 'No response'}")
+            return
+
+        # Test a delete shows up as a tombstone since the token
+        self.make_request('DELETE', f"properties/{self.test_data.pop('property_id')}")
+        response = self.make_request('GET', f"changes?since={delta['token']}")
+        if response and response.status_code == 200 and prop_id in response.json()['deleted']['properties']:
+            if all(p['id'] != prop_id for p in response.json()['upserted']['properties']):
+                self.log_result('sync', 'GET changes after delete', True, "Tombstone for the deleted property")
+            else:
+                self.log_result('sync', 'GET changes after delete', False, "Deleted property still upserted")
+        else:
+            self.log_result('sync', 'GET changes after delete', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
+        # Test an invalid token is rejected
+        response = self.make_request('GET', 'changes?since=not-a-token')
+        if response is not None and response.status_code == 400:
+            self.log_result('sync', 'GET changes invalid token', True, "Rejected with 400")
+        else:
+            self.log_result('sync', 'GET changes invalid token', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
+    def test_rent_cycle_api(self):
+        """Test Rent Cycle API - Paid resets to Pending, escalates to Overdue, arrears carry over, payments count"""
+        self.log("\n=== Testing Rent Cycle API ===")
+        tenant_id = self.test_data['tenant_id']
+
+        # Rent due on the 1st: a lease that starts on this month's 1st, so nothing was owed before
+        tenant = self.get_record('tenants', tenant_id)
+        today = datetime.now()
+        month = today.strftime('%Y-%m')
+        last_month = (today.replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
+        next_month = (today.replace(day=28) + timedelta(days=4)).strftime('%Y-%m')
+        self.make_request('PUT', f'tenants/{tenant_id}', dict(
+            tenant, leaseStart=f"{month}-01", leaseEnd=(today + timedelta(days=400)).strftime('%Y-%m-%d'),
+            rentStatus='Paid'))
+
+        def cycle(as_of):
+            # Only ever the fixture tenant: the job must not rewrite anyone else's rent status
+            response = self.make_request('POST', 'rent-cycle', {'asOf': as_of, 'tenantIds': [tenant_id]})
+            result = response.json() if response and response.status_code == 200 else None
+            return result, (self.get_record('tenants', tenant_id) or {}).get('rentStatus')
+
+        # Test a new period resets Paid to Pending
+        result, status = cycle(f"{month}-01")
+        if result and status == 'Pending' and result['updated'] == 1:
+            self.log_result('rent_cycle', 'Paid resets to Pending', True, "Only the fixture tenant updated")
+        else:
+            self.log_result('rent_cycle', 'Paid resets to Pending', False, f"Result: {result}, status: {status}")
+            return
+
+        # Test unpaid rent past the grace period escalates to Overdue
+        late = f"{month}-{min(result['graceDays'] + 2, 28):02d}"
+        result, status = cycle(late)
+        if result and status == 'Overdue':
+            self.log_result('rent_cycle', 'Pending escalates to Overdue', True, f"Overdue on {late}")
+        else:
+            self.log_result('rent_cycle', 'Pending escalates to Overdue', False, f"Result: {result}, status: {status}")
+
+        # Test rent still unpaid at the next due date stays Overdue
+        result, status = cycle(f"{next_month}-01")
+        if result and status == 'Overdue':
+            self.log_result('rent_cycle', 'Arrears stay Overdue', True, f"Still Overdue on {next_month}-01")
+        else:
+            self.log_result('rent_cycle', 'Arrears stay Overdue', False, f"Result: {result}, status: {status}")
+
+        # Test rent due on the 28th turns Overdue early the next month
+        tenant = self.get_record('tenants', tenant_id)
+        self.make_request('PUT', f'tenants/{tenant_id}', dict(tenant, leaseStart=f"{last_month}-28", rentStatus='Pending'))
+        result, status = cycle(late)
+        if result and status == 'Overdue':
+            self.log_result('rent_cycle', 'Late due day escalates', True, f"Due {last_month}-28, Overdue on {late}")
+        else:
+            self.log_result('rent_cycle', 'Late due day escalates', False, f"Result: {result}, status: {status}")
+
+        # Test a payment in the period makes the tenant Paid
+        response = self.make_request('POST', 'payments', {
+            'tenantId': tenant_id,
+            'tenantName': self.test_data['tenant_name'],
+            'propertyId': self.test_data['property_id'],
+            'propertyName': self.test_data['property_name'],
+            'amount': 1000.00,
+            'date': late,
+            'status': 'Paid'
+        })
+        if response and response.status_code == 201:
+            self.test_data['payment_id'] = response.json()['id']
+        result, status = cycle(late)
+        if result and status == 'Paid':
+            self.log_result('rent_cycle', 'Payment in period stays Paid', True, "Paid after the cycle")
+        else:
+            self.log_result('rent_cycle', 'Payment in period stays Paid', False, f"Result: {result}, status: {status}")
+
+        # Test an invalid asOf or tenantIds is rejected
+        for body in ({'asOf': 'tomorrow'}, {'asOf': f"{month}-32"}, {'tenantIds': tenant_id}):
+            response = self.make_request('POST', 'rent-cycle', body)
+            if response is not None and response.status_code == 400:
+                self.log_result('rent_cycle', f'POST rent-cycle invalid {next(iter(body))}', True, f"{body} rejected with 400")
+            else:
+                self.log_result('rent_cycle', f'POST rent-cycle invalid {next(iter(body))}', False, f"Status: {response.status_code if response is not None else 'No response'}")
+
     def test_cleanup_and_verify_cascade(self):
         """Test cleanup operations and verify cascade effects"""
-        print("\n=== Testing Cleanup and Cascade Effects ===")
+        self.log("\n=== Testing Cleanup and Cascade Effects ===")
         
         # Test DELETE tenant (should update property status to Vacant)
         if 'tenant_id' in self.test_data:
@@ -312,14 +1001,11 @@ class MyRentManagerTester:
                     self.log_result('tenants', 'DELETE tenant', True, "Tenant deleted successfully")
                     
                     # Verify property status changed back to Vacant
-                    prop_response = self.make_request('GET', 'properties')
-                    if prop_response and prop_response.status_code == 200:
-                        properties = prop_response.json()
-                        target_property = next((p for p in properties if p['id'] == self.test_data['property_id']), None)
-                        if target_property and target_property.get('status') == 'Vacant':
-                            self.log_result('tenants', 'Property status update on tenant deletion', True, "Property status changed back to Vacant")
-                        else:
-                            self.log_result('tenants', 'Property status update on tenant deletion', False, f"Property status is {target_property.get('status') if target_property else 'not found'}")
+                    target_property = self.get_record('properties', self.test_data['property_id'])
+                    if target_property and target_property.get('status') == 'Vacant':
+                        self.log_result('tenants', 'Property status update on tenant deletion', True, "Property status changed back to Vacant")
+                    else:
+                        self.log_result('tenants', 'Property status update on tenant deletion', False, f"Property status is {target_property.get('status') if target_property else 'not found'}")
                 else:
                     self.log_result('tenants', 'DELETE tenant', False, "Delete operation did not return success")
             else:
@@ -330,34 +1016,118 @@ class MyRentManagerTester:
             response = self.make_request('DELETE', f'properties/{self.test_data["property_id"]}')
             if response and response.status_code == 200:
                 result = response.json()
-                if result.get('success'):
+                if result.get('success') and self.get_record('properties', self.test_data['property_id']) is None:
                     self.log_result('properties', 'DELETE property', True, "Property deleted successfully")
                 else:
                     self.log_result('properties', 'DELETE property', False, "Delete operation did not return success")
             else:
                 self.log_result('properties', 'DELETE property', False, f"Status: {response.status_code if response else 'No response'}")
     
-    def run_all_tests(self):
-        """Run all tests in the specified order"""
+    def fork(self):
+        """Tester for one suite: its own session, tag, test_data, results and output buffer"""
+        session = EmulatorSession(self.session.emulator) if isinstance(self.session, EmulatorSession) else None
+        child = MyRentManagerTester(self.base_url, session, self.cache_size)
+        child.profile = self.profile
+        child.lines = []
+        child.log = child.lines.append
+        return child
+
+    def run_suite(self, name):
+        """Run one suite on a forked tester and return it; fixtures are torn down even on errors"""
+        suite = SUITES[name]
+        tester = self.fork()
+        tester.log(f"\n##### Suite: {name} [{tester.tag}] #####")
+        try:
+            tester.create_fixtures(suite['fixtures'])
+            for test in suite['tests']:
+                getattr(tester, test)()
+        except Exception as e:
+            tester.log_result(name, 'Suite', False, f"{type(e).__name__}: {e}")
+        finally:
+            tester.teardown()
+        return tester
+
+    def merge(self, tester):
+        """Fold a forked tester's results, cache counters and output into this one"""
+        for line in tester.lines:
+            print(line)
+        for api, results in tester.results.items():
+            self.results[api]['passed'] += results['passed']
+            self.results[api]['failed'] += results['failed']
+            self.results[api]['errors'].extend(results['errors'])
+        for key, value in tester.cache_stats.items():
+            self.cache_stats[key] += value
+        return sum(results['failed'] for results in tester.results.values()) == 0
+
+    def run_suites(self, jobs=DEFAULT_JOBS):
+        """Run SUITES on a worker pool, each as soon as everything in its `after` list has passed"""
+        pending = list(SUITES)
+        finished, failed = set(), set()
+        running = {}
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                ready = [name for name in pending if finished.issuperset(SUITES[name]['after'])]
+                for name in ready:
+                    pending.remove(name)
+                    blocked = failed.intersection(SUITES[name]['after'])
+                    if blocked:
+                        self.log_result(name, 'Suite', False, f"Skipped: {', '.join(sorted(blocked))} failed")
+                        finished.add(name)
+                        failed.add(name)
+                    else:
+                        running[pool.submit(self.run_suite, name)] = name
+                if not running:
+                    if ready:
+                        continue
+                    raise ValueError(f"Suite dependency cycle among: {', '.join(pending)}")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if not self.merge(future.result()):
+                        failed.add(name)
+                    finished.add(name)
+
+    def run_all_tests(self, jobs=DEFAULT_JOBS):
+        """Run all suites, concurrently where the dependency graph allows"""
         print(f"Starting MyRentManager Backend API Tests")
         print(f"Base URL: {self.base_url}")
+        if isinstance(self.session, EmulatorSession):
+            print("Backend: in-process API emulator")
+        print(f"Workers: {jobs}")
         print("=" * 60)
         
+        start = time.perf_counter()
         try:
-            # Test flow as specified in requirements
-            self.test_settings_api()
-            self.test_properties_api()
-            self.test_tenants_api()
-            self.test_payments_api()
-            self.test_expenses_api()
-            self.test_cleanup_and_verify_cascade()
+            self.run_suites(jobs)
             
         except Exception as e:
             print(f"\n❌ CRITICAL ERROR during testing: {str(e)}")
             return False
         
+        print(f"\nSuites finished in {time.perf_counter() - start:.2f}s")
         return True
     
+    def check_profile(self, profile_path=None, baseline_path=None, threshold=DEFAULT_REGRESSION_THRESHOLD):
+        """Write the timing profile and compare it with the baseline; returns the regressions"""
+        if self.profile is None:
+            return []
+        if profile_path:
+            routes = self.profile.write(profile_path)
+            print(f"\nTiming profile for {len(routes)} routes written to {profile_path}")
+        if not baseline_path:
+            return []
+        baseline = load_baseline(baseline_path)
+        if baseline is None:
+            self.profile.write(baseline_path)
+            print(f"No baseline at {baseline_path}; saved this run as the baseline")
+            return []
+        regressions = self.profile.regressions(baseline, threshold)
+        for route, metric, before, after in regressions:
+            print(f"❌ {route:28} {metric:14} {before:9.2f} ms -> {after:9.2f} ms (+{(after / before - 1) if before else 0:.0%})")
+        if not regressions:
+            print(f"✅ No route regressed more than {threshold:.0%} against {baseline_path}")
+        return regressions
+
     def print_summary(self):
         """Print test summary"""
         print("\n" + "=" * 60)
@@ -383,6 +1153,12 @@ class MyRentManagerTester:
         print("-" * 60)
         print(f"TOTAL        | {'✅ PASS' if total_failed == 0 else '❌ FAIL'} | Passed: {total_passed:2d} | Failed: {total_failed:2d}")
         
+        if self.cache_size:
+            stats = self.cache_stats
+            hit_ratio = stats['hits'] / stats['requests'] if stats['requests'] else 0.0
+            print(f"HTTP CACHE   | {stats['requests']} GETs | Hits: {stats['hits']} ({hit_ratio:.0%}) | "
+                  f"Misses: {stats['misses']} | Saved: {stats['bytes_saved'] / 1024:.1f} KiB")
+        
         if total_failed == 0:
             print("\n🎉 All backend APIs are working correctly!")
         else:
@@ -390,12 +1166,49 @@ class MyRentManagerTester:
         
         return total_failed == 0
 
+def load_baseline(path):
+    """Baseline profile from disk in either format TimingProfile.write() produces, or None if
+    the file does not exist yet"""
+    try:
+        with open(path, newline='') as f:
+            if not path.endswith('.csv'):
+                return json.load(f)
+            routes = {}
+            for row in csv.DictReader(f):
+                phases = {column[len('server_'):-len('_ms')]: float(value) for column, value in row.items()
+                          if column.startswith('server_') and value not in (None, '')}
+                routes[row['route']] = {
+                    'count': int(row['count']),
+                    'client_p50_ms': float(row['client_p50_ms']),
+                    'client_p95_ms': float(row['client_p95_ms']),
+                    'server_ms': phases,
+                }
+            return {'routes': routes}
+    except FileNotFoundError:
+        return None
+
 def main():
     """Main test execution"""
-    tester = MyRentManagerTester()
+    parser = argparse.ArgumentParser(description="Run the MyRentManager backend API test suites")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--emulator', action='store_true', help="test the in-process API emulator")
+    parser.add_argument('--http-cache', action='store_true', help="revalidate GETs through an LRU response cache")
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help="suites run concurrently (1 = sequential)")
+    parser.add_argument('--profile', help="write per-route client latency and Server-Timing phases (.json or .csv)")
+    parser.add_argument('--baseline', help="profile (.json or .csv) to compare against; created from this run if missing")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="fail when a route's median grows by more than this fraction over the baseline")
+    args = parser.parse_args()
     
-    success = tester.run_all_tests()
+    session = EmulatorSession() if args.emulator or emulator_requested() else None
+    cache_size = DEFAULT_CACHE_SIZE if args.http_cache else 0
+    tester = MyRentManagerTester(args.base_url, session, cache_size)
+    if args.profile or args.baseline:
+        tester.profile = TimingProfile()
+    
+    success = tester.run_all_tests(max(args.jobs, 1))
     all_passed = tester.print_summary()
+    regressions = tester.check_profile(args.profile, args.baseline, args.threshold)
     
     if not success:
         print("\n❌ Testing was interrupted due to critical errors.")
@@ -403,6 +1216,9 @@ def main():
     elif not all_passed:
         print("\n❌ Some tests failed.")
         sys.exit(1)
+    elif regressions:
+        print("\n❌ Performance regressed against the baseline.")
+        sys.exit(1)
     else:
         print("\n✅ All tests passed successfully!")
         sys.exit(0)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Bulk Write Benchmark
+Records one month of rent for every tenant twice, once with a POST /api/payments per
+tenant and once through POST /api/payments/bulk in batches, and compares throughput.
+The rent run only pays fixture tenants the benchmark creates on its own tagged
+properties; they are deleted afterwards together with their payments.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+from api_emulator import ApiEmulator, EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester
+from seed_portfolio import run_bounded
+
+# Fixture tenants sharing one fixture property
+TENANTS_PER_PROPERTY = 50
+
+
+def rent_run(tenants, paid_on):
+    """One payment per tenant, as a landlord's monthly rent run would record them"""
+    return [{
+        'tenantId': t['id'],
+        'tenantName': t['name'],
+        'propertyId': t.get('propertyId'),
+        'propertyName': t.get('propertyName'),
+        'amount': t.get('monthlyRent') or 0.0,
+        'date': paid_on,
+        'status': 'Paid'
+    } for t in tenants]
+
+
+class BulkBenchmark:
+    def __init__(self, base_url=BASE_URL, emulator=None, concurrency=1, batch_size=500):
+        self.base_url = base_url
+        self.emulator = emulator
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.local = threading.local()
+        self.properties = []
+        self.tenants = []
+
+    def tester(self):
+        """One tester (and HTTP session) per worker thread"""
+        if not hasattr(self.local, 'tester'):
+            session = EmulatorSession(self.emulator) if self.emulator else None
+            self.local.tester = MyRentManagerTester(self.base_url, session)
+        return self.local.tester
+
+    def setup(self, count):
+        """Create `count` fixture tenants spread over tagged fixture properties"""
+        tester = self.tester()
+        self.properties = [tester.create_fixture_property(f'Bulk {i}')
+                           for i in range(-(-count // TENANTS_PER_PROPERTY))]
+
+        def create_tenant(index):
+            prop = self.properties[index // TENANTS_PER_PROPERTY]
+            response = self.tester().make_request('POST', 'tenants', {
+                'name': f'Bulk Tenant {index}',
+                'email': 'bulk@example.test',
+                'phone': '+1-555-0199',
+                'propertyId': prop['id'],
+                'propertyName': prop['name'],
+                'monthlyRent': 1000.0,
+                'leaseStart': date.today().isoformat(),
+                'leaseEnd': (date.today() + timedelta(days=365)).isoformat(),
+                'rentStatus': 'Pending'
+            })
+            return response.json() if response is not None and response.status_code == 201 else None
+
+        self.tenants = [t for t in run_bounded(create_tenant, range(count), max(self.concurrency, 8)) if t]
+        return self.tenants
+
+    def create_one(self, payment):
+        response = self.tester().make_request('POST', 'payments', payment)
+        return response.json()['id'] if response is not None and response.status_code == 201 else None
+
+    def per_item(self, payments):
+        start = time.perf_counter()
+        ids = list(run_bounded(self.create_one, payments, self.concurrency))
+        elapsed = time.perf_counter() - start
+        created = [payment_id for payment_id in ids if payment_id]
+        return created, len(ids) - len(created), elapsed
+
+    def bulk(self, payments):
+        start = time.perf_counter()
+        created, errors = self.tester().create_many('payments', payments, self.batch_size)
+        elapsed = time.perf_counter() - start
+        return [p['id'] for p in created], len(errors), elapsed
+
+    def delete_all(self, collection, ids):
+        delete = lambda record_id: self.tester().make_request('DELETE', f'{collection}/{record_id}')
+        for _ in run_bounded(delete, ids, max(self.concurrency, 8)):
+            pass
+
+    def cleanup(self, payment_ids):
+        self.delete_all('payments', payment_ids)
+
+    def teardown(self):
+        """Delete the fixture tenants and properties setup() created"""
+        self.delete_all('tenants', [t['id'] for t in self.tenants])
+        self.delete_all('properties', [p['id'] for p in self.properties])
+        self.tenants, self.properties = [], []
+
+    def run(self, tenants, paid_on):
+        payments = rent_run(tenants, paid_on)
+        results = {}
+        for mode, runner in (('per_item', self.per_item), ('bulk', self.bulk)):
+            created, failed, elapsed = runner(payments)
+            results[mode] = {
+                'items': len(payments),
+                'created': len(created),
+                'failed': failed,
+                'elapsed_s': round(elapsed, 3),
+                'items_per_s': round(len(created) / elapsed, 1) if elapsed else 0.0,
+            }
+            self.cleanup(created)
+        per_item, bulk = results['per_item']['items_per_s'], results['bulk']['items_per_s']
+        results['speedup'] = round(bulk / per_item, 2) if per_item else None
+        return results
+
+
+def main():
+    """Main benchmark execution"""
+    parser = argparse.ArgumentParser(description="Compare per-item and bulk payment creation throughput")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--tenants', type=int, default=5000, help="number of tenants in the rent run")
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=1, help="requests in flight for the per-item run")
+    parser.add_argument('--date', default=date.today().isoformat(), help="payment date for the rent run")
+    parser.add_argument('--emulator', action='store_true', help="benchmark the in-process API emulator")
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    emulator = ApiEmulator() if args.emulator or emulator_requested() else None
+    benchmark = BulkBenchmark(args.base_url, emulator, args.concurrency, args.batch_size)
+    try:
+        tenants = benchmark.setup(args.tenants)
+        if len(tenants) < args.tenants:
+            print(f"❌ Only {len(tenants)} of {args.tenants} fixture tenants were created")
+            sys.exit(1)
+        print(f"Recording rent for {len(tenants)} fixture tenants (batch size {args.batch_size}, "
+              f"per-item concurrency {args.concurrency})")
+        results = benchmark.run(tenants, args.date)
+    finally:
+        benchmark.teardown()
+    for mode in ('per_item', 'bulk'):
+        stats = results[mode]
+        print(f"{mode:9} | {stats['created']:7d} created | {stats['failed']:5d} failed | "
+              f"{stats['elapsed_s']:8.2f}s | {stats['items_per_s']:10.1f} items/s")
+    print(f"Bulk speedup: {results['speedup']}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    sys.exit(1 if results['per_item']['failed'] or results['bulk']['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Cold-Start Benchmark
+Fires a burst of concurrent first requests at a cold server instance and reports:
+  - time to first response, and when the whole burst completed
+  - how many MongoClients and pooled connections the instance opened (GET /api/health)
+  - steady-state latency once the instance is warm
+
+With --start-command the benchmark starts (and afterwards stops) the server itself for
+every run, waiting on GET /api, which never touches Mongo, so each burst hits a truly cold
+instance. Without it, point --base-url at a freshly started server.
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from api_emulator import ApiEmulator, EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester, percentile
+from seed_portfolio import run_bounded
+
+DEFAULT_ENDPOINT = 'properties?limit=1'
+
+
+class ColdStartBenchmark:
+    def __init__(self, base_url=BASE_URL, endpoint=DEFAULT_ENDPOINT, start_command=None, ready_timeout=120.0,
+                 emulated=False):
+        self.base_url = base_url
+        self.endpoint = endpoint
+        self.start_command = start_command
+        self.ready_timeout = ready_timeout
+        self.emulated = emulated
+        self.emulator = None
+        self.server = None
+        self.local = threading.local()
+
+    def tester(self):
+        """One tester (and HTTP session, so its own connection) per worker thread"""
+        if not hasattr(self.local, 'tester'):
+            session = EmulatorSession(self.emulator) if self.emulator else None
+            self.local.tester = MyRentManagerTester(self.base_url, session)
+        return self.local.tester
+
+    def start(self):
+        """Bring up a cold instance: a fresh emulator, or the server process from --start-command"""
+        if self.emulated:
+            self.emulator = ApiEmulator()
+            return
+        if not self.start_command:
+            return
+        self.server = subprocess.Popen(self.start_command, shell=True, start_new_session=True,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + self.ready_timeout
+        probe = MyRentManagerTester(self.base_url)
+        probe.log = lambda *args: None
+        while time.monotonic() < deadline:
+            if self.server.poll() is not None:
+                raise RuntimeError(f"Server exited with status {self.server.returncode} before it was ready")
+            response = probe.make_request('GET', '')
+            if response is not None and response.status_code == 200:
+                return
+            time.sleep(0.25)
+        self.stop()
+        raise RuntimeError(f"Server not ready within {self.ready_timeout:.0f}s")
+
+    def stop(self):
+        if self.server is not None and self.server.poll() is None:
+            os.killpg(self.server.pid, signal.SIGTERM)
+            try:
+                self.server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.server.pid, signal.SIGKILL)
+                self.server.wait()
+        self.server = None
+
+    def burst(self, size):
+        """`size` concurrent first requests released together; (start, end, status) offsets in seconds"""
+        barrier = threading.Barrier(size + 1)
+        results = [None] * size
+
+        def fire(index):
+            tester = MyRentManagerTester(self.base_url, EmulatorSession(self.emulator) if self.emulator else None)
+            barrier.wait()
+            start = time.perf_counter()
+            response = tester.make_request('GET', self.endpoint)
+            results[index] = (start, time.perf_counter(), response.status_code if response is not None else None)
+
+        threads = [threading.Thread(target=fire, args=(i,)) for i in range(size)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+        # Offsets from the first request sent: workers leave the barrier before any one thread can timestamp it
+        released = min(start for start, _, _ in results)
+        return [(start - released, end - released, status) for start, end, status in results]
+
+    def health(self):
+        response = self.tester().make_request('GET', 'health')
+        if response is None or response.status_code != 200:
+            raise RuntimeError(f"GET health failed: {response.status_code if response is not None else 'No response'}")
+        return response.json()
+
+    def steady(self, requests, concurrency):
+        """Latencies in ms of `requests` GETs against the now warm instance"""
+        def timed_get(_):
+            start = time.perf_counter()
+            response = self.tester().make_request('GET', self.endpoint)
+            return (time.perf_counter() - start) * 1000, response is not None and response.status_code == 200
+
+        return list(run_bounded(timed_get, range(requests), concurrency))
+
+    def run(self, burst_size, steady_requests, concurrency):
+        self.start()
+        try:
+            burst = self.burst(burst_size)
+            health = self.health()
+            steady = self.steady(steady_requests, concurrency)
+        finally:
+            self.stop()
+
+        ends = sorted(end for _, end, _ in burst)
+        latencies = sorted(ms for ms, _ in steady)
+        return {
+            'first_response_ms': round(ends[0] * 1000, 3),
+            'burst_complete_ms': round(ends[-1] * 1000, 3),
+            'burst_errors': sum(1 for _, _, status in burst if status != 200),
+            'clients_created': health['pool']['clientsCreated'],
+            'connections_created': health['pool']['connectionsCreated'],
+            'open_connections': health['pool']['open'],
+            'max_pool_size': health['pool']['maxPoolSize'],
+            'steady_p50_ms': round(percentile(latencies, 50), 3),
+            'steady_p95_ms': round(percentile(latencies, 95), 3),
+            'steady_p99_ms': round(percentile(latencies, 99), 3),
+            'steady_errors': sum(1 for _, ok in steady if not ok),
+        }
+
+
+def main():
+    """Main cold-start benchmark execution"""
+    parser = argparse.ArgumentParser(description="Measure cold-start bursts, connections opened and warm latency")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--start-command', help="shell command that starts a fresh server, e.g. 'npm run start'")
+    parser.add_argument('--ready-timeout', type=float, default=120.0)
+    parser.add_argument('--endpoint', default=DEFAULT_ENDPOINT, help="route hit by the burst and the steady phase")
+    parser.add_argument('--burst', type=int, default=32, help="concurrent first requests")
+    parser.add_argument('--runs', type=int, default=1, help="cold starts (needs --start-command or --emulator for more than one)")
+    parser.add_argument('--steady-requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8, help="requests in flight in the steady phase")
+    parser.add_argument('--emulator', action='store_true', help="cold-start the in-process API emulator")
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    emulated = args.emulator or emulator_requested()
+    if args.runs > 1 and not (emulated or args.start_command):
+        parser.error("--runs above 1 needs --start-command (or --emulator) to get a cold instance each time")
+
+    benchmark = ColdStartBenchmark(args.base_url, args.endpoint, args.start_command, args.ready_timeout, emulated)
+    results = []
+    for number in range(1, args.runs + 1):
+        result = benchmark.run(args.burst, args.steady_requests, args.concurrency)
+        results.append(result)
+        print(f"Run {number}: first response {result['first_response_ms']:.1f} ms, burst of {args.burst} done in "
+              f"{result['burst_complete_ms']:.1f} ms, {result['clients_created']} client(s), "
+              f"{result['connections_created']} connection(s), steady p50 {result['steady_p50_ms']:.2f} ms")
+
+    summary = {key: statistics.median(r[key] for r in results)
+               for key in ('first_response_ms', 'burst_complete_ms', 'connections_created',
+                           'steady_p50_ms', 'steady_p95_ms', 'steady_p99_ms')}
+    print(f"\n{'METRIC':22} | {'MEDIAN':>10}")
+    print("-" * 36)
+    for key, value in summary.items():
+        print(f"{key:22} | {value:10.2f}")
+
+    problems = []
+    for number, result in enumerate(results, 1):
+        if result['clients_created'] != 1:
+            problems.append(f"run {number}: {result['clients_created']} MongoClients created; initialization is not single-flight")
+        if result['max_pool_size'] and result['connections_created'] > result['max_pool_size'] + 1:
+            # +1 for the monitoring connection the driver keeps outside the pool
+            problems.append(f"run {number}: {result['connections_created']} connections for a pool of {result['max_pool_size']}")
+        if result['burst_errors'] or result['steady_errors']:
+            problems.append(f"run {number}: {result['burst_errors']} burst and {result['steady_errors']} steady requests failed")
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("\n✅ One client per instance, connections within the pool size, no failed requests")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'runs': results, 'summary': summary}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Delta Sync Benchmark
+Keeps a local replica of every collection up to date through GET /api/changes and,
+after each round of writes, compares that refresh with reloading the five collections
+the way app/page.js does: bytes transferred, latency, and whether the replica still
+matches the full reload record for record.
+
+Writes only touch records the benchmark creates, and those are deleted afterwards.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+from api_emulator import SYNC_COLLECTIONS, SYNC_OVERLAP_MS, ApiEmulator, EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester
+from seed_portfolio import PortfolioGenerator, seed_in_process
+
+# Relative weight of each write in a round
+WRITE_MIX = {
+    'update_property': 3,
+    'add_tenant': 3,
+    'remove_tenant': 1,
+    'pay': 4,
+    'add_expense': 2,
+    'remove_expense': 1,
+}
+
+
+class SyncClient:
+    """Local replica {collection: {id: record}} kept current from GET /api/changes"""
+
+    def __init__(self, tester):
+        self.tester = tester
+        self.replica = {name: {} for name in SYNC_COLLECTIONS}
+        self.token = None
+
+    def refresh(self):
+        """Apply the changes since the last token; returns what was transferred and applied"""
+        endpoint = f"changes?since={self.token}" if self.token else 'changes'
+        response = self.tester.make_request('GET', endpoint)
+        if not response or response.status_code != 200:
+            raise RuntimeError(f"GET {endpoint} failed: {response.status_code if response is not None else 'No response'}")
+        changes = response.json()
+        if changes['reset']:
+            self.replica = {name: {} for name in SYNC_COLLECTIONS}
+        for name, records in changes['upserted'].items():
+            self.replica[name].update((record['id'], record) for record in records)
+        # Upserts first: a record deleted after its update must end up gone
+        for name, ids in changes['deleted'].items():
+            for record_id in ids:
+                self.replica[name].pop(record_id, None)
+        self.token = changes['token']
+        return {
+            'bytes': len(response.content),
+            'reset': changes['reset'],
+            'upserted': sum(len(records) for records in changes['upserted'].values()),
+            'deleted': sum(len(ids) for ids in changes['deleted'].values()),
+        }
+
+
+def full_reload(tester):
+    """Every collection through its list route, as the dashboard loads them; (snapshot, bytes)"""
+    snapshot, total_bytes = {}, 0
+    for name in SYNC_COLLECTIONS:
+        response = tester.make_request('GET', name)
+        if not response or response.status_code != 200:
+            raise RuntimeError(f"GET {name} failed: {response.status_code if response is not None else 'No response'}")
+        data = response.json()
+        # GET /api/settings returns the single settings document rather than a list
+        records = data if isinstance(data, list) else [data]
+        snapshot[name] = {record['id']: record for record in records}
+        total_bytes += len(response.content)
+    return snapshot, total_bytes
+
+
+def differences(replica, snapshot):
+    """Human-readable mismatches between the synced replica and a full reload"""
+    problems = []
+    for name in SYNC_COLLECTIONS:
+        mine, theirs = replica[name], snapshot[name]
+        missing = theirs.keys() - mine.keys()
+        extra = mine.keys() - theirs.keys()
+        stale = [record_id for record_id in mine.keys() & theirs.keys() if mine[record_id] != theirs[record_id]]
+        for label, ids in (('missing', missing), ('extra', extra), ('stale', stale)):
+            if ids:
+                problems.append(f"{name}: {len(ids)} {label} (e.g. {next(iter(ids))})")
+    return problems
+
+
+class DeltaSyncBenchmark:
+    def __init__(self, tester, seed=42):
+        self.tester = tester
+        self.random = random.Random(seed)
+        self.properties = []
+        self.tenants = []
+        self.payments = []
+        self.expenses = []
+
+    def setup(self, count):
+        # GET /api/settings creates the settings document on first use
+        self.tester.make_request('GET', 'settings')
+        self.properties = [self.tester.create_fixture_property(f'Sync {i}') for i in range(count)]
+
+    def create(self, collection, data):
+        response = self.tester.make_request('POST', collection, data)
+        return response.json() if response and response.status_code == 201 else None
+
+    def update_property(self):
+        prop = self.tester.get_record('properties', self.random.choice(self.properties)['id'])
+        if prop:
+            prop['monthlyRent'] = float(self.random.randrange(500, 3000))
+            self.tester.make_request('PUT', f"properties/{prop['id']}", prop)
+
+    def add_tenant(self):
+        prop = self.random.choice(self.properties)
+        tenant = self.create('tenants', {
+            'name': f'Sync Tenant {self.random.randrange(10**6)}',
+            'email': 'sync@example.test',
+            'phone': '+1-555-0199',
+            'propertyId': prop['id'],
+            'propertyName': prop['name'],
+            'monthlyRent': 1100.0,
+            'leaseStart': date.today().isoformat(),
+            'leaseEnd': (date.today() + timedelta(days=365)).isoformat(),
+            'rentStatus': 'Pending'
+        })
+        if tenant:
+            self.tenants.append(tenant)
+
+    def remove_tenant(self):
+        if not self.tenants:
+            return self.add_tenant()
+        tenant = self.tenants.pop(self.random.randrange(len(self.tenants)))
+        self.tester.make_request('DELETE', f"tenants/{tenant['id']}")
+
+    def pay(self):
+        if not self.tenants:
+            return self.add_tenant()
+        tenant = self.random.choice(self.tenants)
+        payment = self.create('payments', {
+            'tenantId': tenant['id'],
+            'tenantName': tenant['name'],
+            'propertyId': tenant['propertyId'],
+            'propertyName': tenant['propertyName'],
+            'amount': tenant['monthlyRent'],
+            'date': date.today().isoformat(),
+            'status': 'Paid'
+        })
+        if payment:
+            self.payments.append(payment['id'])
+
+    def add_expense(self):
+        prop = self.random.choice(self.properties)
+        expense = self.create('expenses', {
+            'propertyId': prop['id'],
+            'propertyName': prop['name'],
+            'description': 'Sync benchmark repair',
+            'amount': float(self.random.randrange(50, 500)),
+            'date': date.today().isoformat(),
+            'category': 'Maintenance'
+        })
+        if expense:
+            self.expenses.append(expense['id'])
+
+    def remove_expense(self):
+        if not self.expenses:
+            return self.add_expense()
+        expense_id = self.expenses.pop(self.random.randrange(len(self.expenses)))
+        self.tester.make_request('DELETE', f'expenses/{expense_id}')
+
+    def write(self, count):
+        names = list(WRITE_MIX)
+        for name in self.random.choices(names, [WRITE_MIX[n] for n in names], k=count):
+            getattr(self, name)()
+
+    def run(self, client, rounds, writes):
+        results = []
+        for round_number in range(1, rounds + 1):
+            self.write(writes)
+
+            start = time.perf_counter()
+            delta = client.refresh()
+            delta_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            snapshot, full_bytes = full_reload(self.tester)
+            full_ms = (time.perf_counter() - start) * 1000
+
+            results.append(dict(delta, round=round_number, writes=writes, delta_ms=round(delta_ms, 3),
+                                full_bytes=full_bytes, full_ms=round(full_ms, 3),
+                                mismatches=differences(client.replica, snapshot)))
+        return results
+
+    def cleanup(self):
+        for payment_id in self.payments:
+            self.tester.make_request('DELETE', f'payments/{payment_id}')
+        for expense_id in self.expenses:
+            self.tester.make_request('DELETE', f'expenses/{expense_id}')
+        for tenant in self.tenants:
+            self.tester.make_request('DELETE', f"tenants/{tenant['id']}")
+        for prop in self.properties:
+            self.tester.make_request('DELETE', f"properties/{prop['id']}")
+
+
+def main():
+    """Main delta sync benchmark execution"""
+    parser = argparse.ArgumentParser(description="Compare GET /api/changes refreshes with full collection reloads")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--writes', type=int, default=20, help="writes between two refreshes")
+    parser.add_argument('--properties', type=int, default=2000, help="portfolio size seeded into the emulator")
+    parser.add_argument('--months', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--emulator', action='store_true', help="seed and benchmark the in-process API emulator")
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    session = None
+    if args.emulator or emulator_requested():
+        emulator = ApiEmulator()
+        counts = seed_in_process(emulator, PortfolioGenerator(args.seed, args.properties, months=args.months))
+        print(f"Seeded emulator: {counts}")
+        session = EmulatorSession(emulator)
+        # Every refresh re-reads the overlap window; a real portfolio is older than that,
+        # so let the freshly seeded one age out of it before measuring
+        time.sleep(SYNC_OVERLAP_MS / 1000)
+
+    tester = MyRentManagerTester(args.base_url, session)
+    benchmark = DeltaSyncBenchmark(tester, args.seed)
+    client = SyncClient(tester)
+    benchmark.setup(4)
+    try:
+        initial = client.refresh()
+        print(f"Initial sync: {initial['upserted']} records, {initial['bytes'] / 1024:.1f} KiB")
+        results = benchmark.run(client, args.rounds, args.writes)
+    finally:
+        benchmark.cleanup()
+
+    print(f"\n{'ROUND':>5} | {'UPSERTS':>7} | {'DELETES':>7} | {'DELTA KiB':>9} | {'FULL KiB':>9} | "
+          f"{'DELTA ms':>9} | {'FULL ms':>9}")
+    print("-" * 76)
+    for r in results:
+        print(f"{r['round']:5d} | {r['upserted']:7d} | {r['deleted']:7d} | {r['bytes'] / 1024:9.1f} | "
+              f"{r['full_bytes'] / 1024:9.1f} | {r['delta_ms']:9.2f} | {r['full_ms']:9.2f}")
+
+    summary = {
+        'delta_median_ms': statistics.median(r['delta_ms'] for r in results),
+        'full_median_ms': statistics.median(r['full_ms'] for r in results),
+        'delta_median_bytes': statistics.median(r['bytes'] for r in results),
+        'full_median_bytes': statistics.median(r['full_bytes'] for r in results),
+    }
+    print(f"\nMedian refresh: {summary['delta_median_ms']:.2f} ms / {summary['delta_median_bytes'] / 1024:.1f} KiB "
+          f"vs full reload {summary['full_median_ms']:.2f} ms / {summary['full_median_bytes'] / 1024:.1f} KiB")
+
+    mismatches = [f"round {r['round']}: {problem}" for r in results for problem in r['mismatches']]
+    for problem in mismatches:
+        print(f"❌ {problem}")
+    if not mismatches:
+        print("✅ Replica matched the full reload after every round")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'initial': initial, 'rounds': results, 'summary': summary}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Index Check
+Applies the index specs from lib/indexes.json (the same ones connectDB() bootstraps)
+and explains every hot query shape issued by route.js, failing if any of them falls
+back to a COLLSCAN or a blocking in-memory SORT.
+
+Runs against a scratch database on a local mongod (requires pymongo), or with
+--static against a stand-in planner that evaluates the specs without a server.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+INDEX_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib', 'indexes.json')
+
+# Sort field of each collection's list handler in route.js
+SORT_FIELDS = {
+    'properties': 'createdAt',
+    'tenants': 'createdAt',
+    'payments': 'date',
+    'expenses': 'date',
+}
+
+SAMPLE_ID = 'index-check-0'
+SAMPLE_DATE = '2024-06-15T00:00:00.000Z'
+SAMPLE_DAY = '2024-06-15'
+
+BAD_STAGES = {'COLLSCAN', 'SORT'}
+
+
+def load_index_specs(path=INDEX_SPEC_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def keyset_filter(sort_field, value, record_id):
+    """Mirror of keysetFilter() in route.js"""
+    if value is None:
+        return {sort_field: None, 'id': {'$lt': record_id}}
+    return {'$or': [
+        {sort_field: {'$lt': value}},
+        {sort_field: value, 'id': {'$lt': record_id}},
+        {sort_field: None},
+    ]}
+
+
+def changes_filter(since):
+    """Mirror of the GET /api/changes filter in route.js"""
+    return {'$or': [{'updatedAt': {'$gt': since}}, {'createdAt': {'$gt': since}}]}
+
+
+def hot_queries():
+    """(name, operation, collection, filter, sort) for every query shape route.js issues"""
+    queries = []
+    for collection in SORT_FIELDS:
+        queries.append((f"find {collection} by id", 'find', collection, {'id': SAMPLE_ID}, None))
+        queries.append((f"update {collection} by id", 'update', collection, {'id': SAMPLE_ID}, None))
+        queries.append((f"delete {collection} by id", 'delete', collection, {'id': SAMPLE_ID}, None))
+    for collection, field in SORT_FIELDS.items():
+        queries.append((f"list {collection}", 'find', collection, {}, {field: -1}))
+        queries.append((f"page {collection}", 'find', collection,
+                        keyset_filter(field, SAMPLE_DATE, SAMPLE_ID), {field: -1, 'id': -1}))
+    queries += [
+        ('tenants by property', 'find', 'tenants', {'propertyId': SAMPLE_ID}, None),
+        ('payments by tenant', 'find', 'payments', {'tenantId': SAMPLE_ID}, None),
+        ('payments by property', 'find', 'payments', {'propertyId': SAMPLE_ID}, None),
+        ('expenses by property', 'find', 'expenses', {'propertyId': SAMPLE_ID}, None),
+        ('stats payments in year', 'find', 'payments', {'date': {'$gte': '2024-01-01', '$lt': '2025-01-01'}}, None),
+        ('stats expenses in year', 'find', 'expenses', {'date': {'$gte': '2024-01-01', '$lt': '2025-01-01'}}, None),
+        ('find settings by type', 'find', 'settings', {'type': 'app_settings'}, None),
+        ('upsert settings by type', 'update', 'settings', {'type': 'app_settings'}, None),
+        ('tombstones since', 'find', 'meta', {'type': 'tombstone', 'deletedAt': {'$gt': SAMPLE_DATE}}, None),
+        ('export payments in range', 'find', 'payments',
+         {'date': {'$gte': '2024-01-01', '$lte': '2024-12-31'}}, {'date': 1, 'id': 1}),
+        ('export payments by property', 'find', 'payments',
+         {'propertyId': SAMPLE_ID, 'date': {'$gte': '2024-01-01', '$lte': '2024-12-31'}}, {'date': 1, 'id': 1}),
+        ('export expenses in range', 'find', 'expenses',
+         {'date': {'$gte': '2024-01-01', '$lte': '2024-12-31'}}, {'date': 1, 'id': 1}),
+        ('export expenses by property', 'find', 'expenses',
+         {'propertyId': SAMPLE_ID, 'date': {'$gte': '2024-01-01', '$lte': '2024-12-31'}}, {'date': 1, 'id': 1}),
+        ('rent cycle running leases', 'find', 'tenants', {
+            'leaseStart': {'$lte': SAMPLE_DAY},
+            '$or': [{'leaseEnd': {'$gte': SAMPLE_DAY}}, {'leaseEnd': {'$in': [None, '']}}],
+        }, None),
+        # The $lookup window opens on the 1st of the previous billing period's month
+        ('rent cycle tenant payments', 'find', 'payments',
+         {'tenantId': SAMPLE_ID, 'date': {'$gte': '2024-05-01', '$lte': SAMPLE_DAY}}, None),
+    ]
+    for collection in list(SORT_FIELDS) + ['settings']:
+        queries.append((f"changes {collection} since", 'find', collection,
+                        changes_filter(SAMPLE_DATE), None))
+    return queries
+
+
+# ==================== STAND-IN PLANNER ====================
+
+def split_predicates(query_filter):
+    """Equality fields and range fields of a single (non-$or) filter"""
+    equality, ranges = set(), set()
+    for field, condition in query_filter.items():
+        if isinstance(condition, dict) and any(key.startswith('$') for key in condition):
+            ranges.add(field)
+        else:
+            equality.add(field)
+    return equality, ranges
+
+
+def index_plan(key, equality, ranges, sort):
+    """(filters, sorts) for one index: whether it bounds the scan and whether it yields the sort order"""
+    fields = list(key)
+    prefix = 0
+    while prefix < len(fields) and fields[prefix] in equality:
+        prefix += 1
+    filters = prefix > 0 or (prefix < len(fields) and fields[prefix] in ranges)
+
+    sorts = False
+    if sort:
+        sort_fields = [field for field in sort if field not in equality]
+        tail = fields[prefix:prefix + len(sort_fields)]
+        if tail == sort_fields:
+            directions = {key[field] * sort[field] for field in sort_fields}
+            sorts = len(directions) == 1
+    return filters, sorts
+
+
+def static_plan(indexes, query_filter, sort):
+    """Approximate the winning plan's stages the way the query planner would pick them"""
+    if '$or' in query_filter:
+        branches = [static_plan(indexes, branch, sort) for branch in query_filter['$or']]
+        stages = {stage for branch in branches for stage in branch}
+        if 'COLLSCAN' in stages:
+            return ['SORT', 'COLLSCAN'] if sort else ['COLLSCAN']
+        return (['SORT_MERGE'] if sort else ['OR']) + sorted(stages)
+
+    equality, ranges = split_predicates(query_filter)
+    candidates = [index_plan(spec['key'], equality, ranges, sort) for spec in indexes]
+    if any(filters and (sorts or not sort) for filters, sorts in candidates):
+        return ['FETCH', 'IXSCAN']
+    if sort and any(sorts for _, sorts in candidates):
+        return ['FETCH', 'IXSCAN']
+    if any(filters for filters, _ in candidates):
+        return ['SORT', 'FETCH', 'IXSCAN']
+    return ['SORT', 'COLLSCAN'] if sort else ['COLLSCAN']
+
+
+# ==================== MONGOD EXPLAIN ====================
+
+def collect_stages(plan):
+    """Every `stage` name in an explain plan tree (classic and slot-based formats)"""
+    stages = []
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            stages.append(plan['stage'])
+        for value in plan.values():
+            stages.extend(collect_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(collect_stages(item))
+    return stages
+
+
+def explain_stages(db, operation, collection, query_filter, sort):
+    if operation == 'find':
+        command = {'find': collection, 'filter': query_filter}
+        if sort:
+            command['sort'] = sort
+    elif operation == 'update':
+        command = {'update': collection, 'updates': [{'q': query_filter, 'u': {'$set': {'updatedAt': SAMPLE_DATE}}}]}
+    else:
+        command = {'delete': collection, 'deletes': [{'q': query_filter, 'limit': 1}]}
+    result = db.command('explain', command, verbosity='queryPlanner')
+    return collect_stages(result['queryPlanner']['winningPlan'])
+
+
+def bootstrap_indexes(db, specs):
+    """Create the indexes the same way ensureIndexes() does"""
+    from pymongo import IndexModel
+
+    for name, indexes in specs.items():
+        models = [IndexModel(list(spec['key'].items()), **{option: value for option, value in spec.items() if option != 'key'})
+                  for spec in indexes]
+        db[name].create_indexes(models)
+
+
+def seed_scratch_data(db, count=200):
+    """A few documents per collection so the planner sees real collections"""
+    for collection, field in SORT_FIELDS.items():
+        db[collection].insert_many([
+            {'id': f"index-check-{i}", field: f"2024-{i % 12 + 1:02d}-01T00:00:00.000Z",
+             'propertyId': f"prop-{i % 20}", 'tenantId': f"tenant-{i % 40}"}
+            for i in range(count)
+        ])
+    db.settings.insert_one({'id': 'index-check-settings', 'type': 'app_settings', 'currency': '₺'})
+    db.meta.insert_many([
+        {'_id': f"tombstone:payments:index-check-{i}", 'type': 'tombstone', 'collection': 'payments',
+         'id': f"index-check-{i}", 'deletedAt': f"2024-{i % 12 + 1:02d}-01T00:00:00.000Z"}
+        for i in range(count)
+    ])
+
+
+# ==================== RUNNER ====================
+
+class IndexChecker:
+    def __init__(self, specs, planner):
+        self.specs = specs
+        self.planner = planner
+        self.failures = []
+
+    def run(self):
+        for name, operation, collection, query_filter, sort in hot_queries():
+            stages = self.planner(operation, collection, query_filter, sort)
+            bad = BAD_STAGES.intersection(stages)
+            if bad:
+                self.failures.append(name)
+                print(f"❌ {name:28} {' > '.join(stages)}  ({', '.join(sorted(bad))})")
+            else:
+                print(f"✅ {name:28} {' > '.join(stages)}")
+        return not self.failures
+
+
+def main():
+    """Main index check execution"""
+    parser = argparse.ArgumentParser(description="Explain the hot route.js queries against the bootstrapped indexes")
+    parser.add_argument('--mongo-url', default='mongodb://localhost:27017')
+    parser.add_argument('--database', default='myrentmanager_index_check', help="scratch database, dropped afterwards")
+    parser.add_argument('--static', action='store_true', help="use the stand-in planner instead of a mongod")
+    parser.add_argument('--specs', default=INDEX_SPEC_PATH)
+    args = parser.parse_args()
+
+    specs = load_index_specs(args.specs)
+
+    if args.static:
+        print("Planner: static stand-in")
+        planner = lambda operation, collection, query_filter, sort: static_plan(specs.get(collection, []), query_filter, sort)
+        sys.exit(0 if IndexChecker(specs, planner).run() else 1)
+
+    try:
+        from pymongo import MongoClient
+        from pymongo.errors import ServerSelectionTimeoutError
+    except ImportError:
+        print("❌ pymongo is required to explain against a mongod (pip install pymongo), or pass --static")
+        sys.exit(2)
+
+    client = MongoClient(args.mongo_url, serverSelectionTimeoutMS=5000)
+    try:
+        client.admin.command('ping')
+    except ServerSelectionTimeoutError:
+        print(f"❌ No mongod reachable at {args.mongo_url}; start one or pass --static")
+        sys.exit(2)
+    db = client[args.database]
+    print(f"Planner: mongod at {args.mongo_url} (database {args.database})")
+    try:
+        client.drop_database(args.database)
+        seed_scratch_data(db)
+        # Twice, to prove the bootstrap is idempotent
+        bootstrap_indexes(db, specs)
+        bootstrap_indexes(db, specs)
+        planner = lambda operation, collection, query_filter, sort: explain_stages(db, operation, collection, query_filter, sort)
+        passed = IndexChecker(specs, planner).run()
+    finally:
+        client.drop_database(args.database)
+        client.close()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Backend Load Generator
+Runs concurrent virtual users against the API through MyRentManagerTester.make_request
+and reports throughput and p50/p95/p99 latency per route and method.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from api_emulator import ApiEmulator, EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester, percentile, route_key
+
+# Relative weight of each operation in the request mix
+DEFAULT_MIX = {
+    'list_properties': 15,
+    'list_tenants': 15,
+    'list_payments': 10,
+    'list_expenses': 10,
+    'get_settings': 10,
+    'create_property': 8,
+    'update_property': 6,
+    'create_tenant': 6,
+    'update_tenant': 4,
+    'create_payment': 6,
+    'create_expense': 5,
+    'delete_expense': 3,
+    'update_settings': 2,
+}
+
+
+class LatencyRecorder:
+    """Thread-safe collector of per-route latency samples"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, method, endpoint, elapsed, response):
+        key = route_key(method, endpoint)
+        failed = response is None or response.status_code >= 400
+        with self.lock:
+            self.samples.setdefault(key, []).append(elapsed * 1000.0)
+            self.errors.setdefault(key, 0)
+            if failed:
+                self.errors[key] += 1
+
+    def summary(self, wall_time):
+        """Build the machine-readable per-route summary"""
+        routes = {}
+        total_requests = 0
+        total_errors = 0
+        with self.lock:
+            for key in sorted(self.samples):
+                values = sorted(self.samples[key])
+                count = len(values)
+                total_requests += count
+                total_errors += self.errors[key]
+                routes[key] = {
+                    'count': count,
+                    'errors': self.errors[key],
+                    'throughput_rps': round(count / wall_time, 3) if wall_time else 0.0,
+                    'mean_ms': round(sum(values) / count, 3),
+                    'p50_ms': round(percentile(values, 50), 3),
+                    'p95_ms': round(percentile(values, 95), 3),
+                    'p99_ms': round(percentile(values, 99), 3),
+                    'max_ms': round(values[-1], 3),
+                }
+        return {
+            'wall_time_s': round(wall_time, 3),
+            'total_requests': total_requests,
+            'total_errors': total_errors,
+            'throughput_rps': round(total_requests / wall_time, 3) if wall_time else 0.0,
+            'routes': routes,
+        }
+
+
+class VirtualUser:
+    """One simulated landlord issuing a weighted mix of API calls"""
+
+    def __init__(self, user_id, base_url, recorder, mix, interval, seed, session=None):
+        self.user_id = user_id
+        self.tester = MyRentManagerTester(base_url, session)
+        self.recorder = recorder
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.interval = interval
+        self.rng = random.Random(seed)
+        self.owned = {'properties': [], 'tenants': [], 'payments': [], 'expenses': []}
+
+    def request(self, method, endpoint, data=None):
+        """Timed wrapper around make_request"""
+        start = time.perf_counter()
+        response = self.tester.make_request(method, endpoint, data)
+        self.recorder.record(method, endpoint, time.perf_counter() - start, response)
+        return response
+
+    def created_record(self, response):
+        if response is not None and response.status_code == 201:
+            return response.json()
+        return None
+
+    # ---- operations ----
+
+    def list_properties(self):
+        self.request('GET', 'properties')
+
+    def list_tenants(self):
+        self.request('GET', 'tenants')
+
+    def list_payments(self):
+        self.request('GET', 'payments')
+
+    def list_expenses(self):
+        self.request('GET', 'expenses')
+
+    def get_settings(self):
+        self.request('GET', 'settings')
+
+    def property_payload(self):
+        return {
+            'name': f"Load Test Property {self.user_id}-{self.rng.randint(1, 10**6)}",
+            'address': f"{self.rng.randint(1, 999)} Load Street",
+            'type': self.rng.choice(['Apartment', 'House', 'Commercial']),
+            'monthlyRent': float(self.rng.randint(500, 3000)),
+            'status': 'Vacant'
+        }
+
+    def create_property(self):
+        created = self.created_record(self.request('POST', 'properties', self.property_payload()))
+        if created:
+            self.owned['properties'].append(created)
+        return created
+
+    def update_property(self):
+        if not self.owned['properties']:
+            return self.create_property()
+        prop = self.rng.choice(self.owned['properties'])
+        data = self.property_payload()
+        data['status'] = prop.get('status', 'Vacant')
+        self.request('PUT', f"properties/{prop['id']}", data)
+
+    def tenant_payload(self, prop):
+        lease_start = datetime.now().strftime('%Y-%m-%d')
+        lease_end = (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d')
+        return {
+            'name': f"Load Tenant {self.user_id}-{self.rng.randint(1, 10**6)}",
+            'email': f"load{self.user_id}@example.com",
+            'phone': '+1-555-0100',
+            'propertyId': prop['id'],
+            'propertyName': prop['name'],
+            'monthlyRent': prop['monthlyRent'],
+            'leaseStart': lease_start,
+            'leaseEnd': lease_end,
+            'rentStatus': 'Pending'
+        }
+
+    def create_tenant(self):
+        prop = self.rng.choice(self.owned['properties']) if self.owned['properties'] else self.create_property()
+        if not prop:
+            return None
+        created = self.created_record(self.request('POST', 'tenants', self.tenant_payload(prop)))
+        if created:
+            self.owned['tenants'].append(created)
+        return created
+
+    def update_tenant(self):
+        if not self.owned['tenants']:
+            return self.create_tenant()
+        tenant = self.rng.choice(self.owned['tenants'])
+        prop = {'id': tenant['propertyId'], 'name': tenant['propertyName'], 'monthlyRent': tenant['monthlyRent']}
+        self.request('PUT', f"tenants/{tenant['id']}", self.tenant_payload(prop))
+
+    def create_payment(self):
+        tenant = self.rng.choice(self.owned['tenants']) if self.owned['tenants'] else self.create_tenant()
+        if not tenant:
+            return
+        created = self.created_record(self.request('POST', 'payments', {
+            'tenantId': tenant['id'],
+            'tenantName': tenant['name'],
+            'propertyId': tenant['propertyId'],
+            'propertyName': tenant['propertyName'],
+            'amount': tenant['monthlyRent'],
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'status': 'Paid'
+        }))
+        if created:
+            self.owned['payments'].append(created)
+
+    def create_expense(self):
+        prop = self.rng.choice(self.owned['properties']) if self.owned['properties'] else self.create_property()
+        if not prop:
+            return None
+        created = self.created_record(self.request('POST', 'expenses', {
+            'propertyId': prop['id'],
+            'propertyName': prop['name'],
+            'description': 'Load test maintenance',
+            'amount': float(self.rng.randint(20, 500)),
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'category': 'Maintenance'
+        }))
+        if created:
+            self.owned['expenses'].append(created)
+        return created
+
+    def delete_expense(self):
+        if not self.owned['expenses']:
+            return self.create_expense()
+        expense = self.owned['expenses'].pop(self.rng.randrange(len(self.owned['expenses'])))
+        self.request('DELETE', f"expenses/{expense['id']}")
+
+    def update_settings(self):
+        self.request('PUT', 'settings', {
+            'currency': self.rng.choice(['₺', '€', '$']),
+            'notifications': self.rng.random() < 0.5
+        })
+
+    # ---- driver ----
+
+    def run(self, deadline, stop_event):
+        """Issue operations until the deadline, paced to the per-user interval"""
+        next_at = time.perf_counter()
+        while not stop_event.is_set() and time.perf_counter() < deadline:
+            operation = self.rng.choices(self.operations, weights=self.weights)[0]
+            getattr(self, operation)()
+            if self.interval:
+                next_at += self.interval
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    stop_event.wait(delay)
+
+    def cleanup(self):
+        """Remove every record this user created (untimed)"""
+        for payment in self.owned['payments']:
+            self.tester.make_request('DELETE', f"payments/{payment['id']}")
+        for expense in self.owned['expenses']:
+            self.tester.make_request('DELETE', f"expenses/{expense['id']}")
+        for tenant in self.owned['tenants']:
+            self.tester.make_request('DELETE', f"tenants/{tenant['id']}")
+        for prop in self.owned['properties']:
+            self.tester.make_request('DELETE', f"properties/{prop['id']}")
+
+
+class LoadTester:
+    """Drive N virtual users for a fixed duration and summarize the results"""
+
+    def __init__(self, base_url=BASE_URL, users=10, rate=0.0, duration=30.0, mix=None, seed=0, cleanup=True,
+                 emulator=None):
+        self.base_url = base_url
+        self.users = users
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix or DEFAULT_MIX
+        self.seed = seed
+        self.cleanup = cleanup
+        self.emulator = emulator
+        self.recorder = LatencyRecorder()
+
+    def run(self):
+        # rate is the target across all users; 0 means as fast as possible
+        interval = self.users / self.rate if self.rate else 0.0
+        virtual_users = [
+            VirtualUser(i, self.base_url, self.recorder, self.mix, interval, self.seed + i,
+                        EmulatorSession(self.emulator) if self.emulator else None)
+            for i in range(self.users)
+        ]
+        stop_event = threading.Event()
+
+        start = time.perf_counter()
+        deadline = start + self.duration
+        with ThreadPoolExecutor(max_workers=self.users) as pool:
+            futures = [pool.submit(vu.run, deadline, stop_event) for vu in virtual_users]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                stop_event.set()
+        wall_time = time.perf_counter() - start
+
+        if self.cleanup:
+            with ThreadPoolExecutor(max_workers=self.users) as pool:
+                list(pool.map(lambda vu: vu.cleanup(), virtual_users))
+
+        summary = self.recorder.summary(wall_time)
+        summary['config'] = {
+            'base_url': self.base_url,
+            'users': self.users,
+            'rate': self.rate,
+            'duration_s': self.duration,
+            'seed': self.seed,
+            'emulator': self.emulator is not None,
+        }
+        return summary
+
+
+def print_load_summary(summary):
+    """Print a human-readable per-route table"""
+    print("\n" + "=" * 92)
+    print("LOAD TEST SUMMARY")
+    print("=" * 92)
+    print(f"{'ROUTE':32} | {'COUNT':>6} | {'ERR':>4} | {'RPS':>8} | {'P50 ms':>8} | {'P95 ms':>8} | {'P99 ms':>8}")
+    print("-" * 92)
+    for key, stats in summary['routes'].items():
+        print(f"{key:32} | {stats['count']:6d} | {stats['errors']:4d} | {stats['throughput_rps']:8.2f} | "
+              f"{stats['p50_ms']:8.1f} | {stats['p95_ms']:8.1f} | {stats['p99_ms']:8.1f}")
+    print("-" * 92)
+    print(f"TOTAL: {summary['total_requests']} requests, {summary['total_errors']} errors, "
+          f"{summary['throughput_rps']:.2f} req/s over {summary['wall_time_s']:.1f}s")
+
+
+def main():
+    """Main load test execution"""
+    parser = argparse.ArgumentParser(description="MyRentManager backend load generator")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, default=10, help="number of concurrent virtual users")
+    parser.add_argument('--rate', type=float, default=0.0, help="target total requests/second (0 = unthrottled)")
+    parser.add_argument('--duration', type=float, default=30.0, help="run time in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='load_summary.json', help="path of the JSON summary ('-' for stdout)")
+    parser.add_argument('--no-cleanup', action='store_true', help="keep the records created during the run")
+    parser.add_argument('--emulator', action='store_true', help="run against the in-process API emulator")
+    args = parser.parse_args()
+    emulator = ApiEmulator() if args.emulator or emulator_requested() else None
+
+    print(f"Starting MyRentManager load test: {args.users} users, "
+          f"{args.rate or 'unthrottled'} req/s, {args.duration}s")
+    print(f"Base URL: {'in-process emulator' if emulator else args.base_url}")
+
+    tester = LoadTester(args.base_url, args.users, args.rate, args.duration,
+                        seed=args.seed, cleanup=not args.no_cleanup, emulator=emulator)
+    summary = tester.run()
+    print_load_summary(summary)
+
+    if args.output == '-':
+        print(json.dumps(summary, indent=2))
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSummary written to {args.output}")
+
+    sys.exit(1 if summary['total_errors'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Pagination Benchmark
+Compares full-dump, keyset-paged and NDJSON-streamed reads of a collection:
+wall time, time to first record, bytes received and peak client memory.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from api_emulator import ApiEmulator, EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester
+from seed_portfolio import PortfolioGenerator, seed_in_process
+
+
+class MeasuringTester(MyRentManagerTester):
+    """MyRentManagerTester that counts response bytes, including streamed ones"""
+
+    def __init__(self, base_url=BASE_URL, session=None):
+        super().__init__(base_url, session)
+        self.bytes_received = 0
+
+    def make_request(self, method, endpoint, data=None, stream=False, headers=None):
+        response = super().make_request(method, endpoint, data, stream, headers)
+        if response is None:
+            return None
+        if stream:
+            iter_lines = response.iter_lines
+
+            def counting_iter_lines(*args, **kwargs):
+                for line in iter_lines(*args, **kwargs):
+                    self.bytes_received += len(line) + 1
+                    yield line
+
+            response.iter_lines = counting_iter_lines
+        else:
+            self.bytes_received += len(response.content)
+        return response
+
+
+def read_full(tester, collection, page_size):
+    response = tester.make_request('GET', collection)
+    if not response or response.status_code != 200:
+        raise RuntimeError(f"GET {collection} failed: {response.status_code if response is not None else 'No response'}")
+    yield from response.json()
+
+
+def read_paged(tester, collection, page_size):
+    yield from tester.iter_records(collection, limit=page_size)
+
+
+def read_streamed(tester, collection, page_size):
+    yield from tester.stream_records(collection)
+
+
+MODES = {
+    'full': read_full,
+    'paged': read_paged,
+    'ndjson': read_streamed,
+}
+
+
+def measure(make_tester, mode, collection, page_size):
+    """Time one pass, then repeat it under tracemalloc for the client memory peak"""
+    tester = make_tester()
+    records = 0
+    first_record = None
+    start = time.perf_counter()
+    for _ in MODES[mode](tester, collection, page_size):
+        if first_record is None:
+            first_record = time.perf_counter() - start
+        records += 1
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in MODES[mode](make_tester(), collection, page_size):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'records': records,
+        'wall_s': round(elapsed, 4),
+        'first_record_ms': round((first_record or 0.0) * 1000, 3),
+        'records_per_s': round(records / elapsed, 1) if elapsed else 0.0,
+        'bytes': tester.bytes_received,
+        'peak_client_mb': round(peak / 2**20, 2),
+    }
+
+
+def main():
+    """Main benchmark execution"""
+    parser = argparse.ArgumentParser(description="Compare full-dump, paged and streamed collection reads")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--collection', default='payments', choices=['properties', 'tenants', 'payments', 'expenses'])
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--emulator', action='store_true', help="seed and benchmark the in-process API emulator")
+    parser.add_argument('--properties', type=int, default=2000, help="portfolio size seeded into the emulator")
+    parser.add_argument('--months', type=int, default=36, help="months of history seeded into the emulator")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    emulator = None
+    if args.emulator or emulator_requested():
+        emulator = ApiEmulator()
+        counts = seed_in_process(emulator, PortfolioGenerator(args.seed, args.properties, months=args.months))
+        print(f"Seeded emulator: {counts}")
+        # Build the sorted views up front so the first mode does not pay for them
+        emulator.handle('GET', args.collection, query={'limit': '1'})
+
+    make_tester = lambda: MeasuringTester(args.base_url, EmulatorSession(emulator) if emulator else None)
+
+    results = {}
+    print(f"\n{'MODE':8} | {'RECORDS':>9} | {'WALL s':>8} | {'FIRST ms':>9} | {'REC/s':>10} | {'MB RECV':>8} | {'PEAK MB':>8}")
+    print("-" * 80)
+    for mode in MODES:
+        stats = measure(make_tester, mode, args.collection, args.page_size)
+        results[mode] = stats
+        print(f"{mode:8} | {stats['records']:9d} | {stats['wall_s']:8.3f} | {stats['first_record_ms']:9.1f} | "
+              f"{stats['records_per_s']:10.1f} | {stats['bytes'] / 2**20:8.2f} | {stats['peak_client_mb']:8.2f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'collection': args.collection, 'page_size': args.page_size, 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    counts = {stats['records'] for stats in results.values()}
+    if len(counts) != 1:
+        print(f"\n❌ Modes returned different record counts: {counts}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Rent Cycle
+Drives POST /api/rent-cycle, which moves every running lease's rentStatus to Paid, Pending
+or Overdue for the current period in one bulk write.
+
+  run       triggers one cycle for today (or --as-of); point a daily cron entry at it
+  simulate  replays 12+ months day by day on an injectable clock: tenants pay on their own
+            schedule, the cycle runs every --every days, and each run is timed and checked
+            against an independent reference of the status rules. Extra leases due on the
+            5th and the 26th-31st, half of which never pay, must turn Overdue and stay so
+            across month boundaries
+
+simulate rewrites rent statuses, so point it at the emulator or a scratch database; the
+payments and scenario leases it creates are deleted afterwards.
+"""
+
+import argparse
+import calendar
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from api_emulator import RENT_STATUSES, ApiEmulator, EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester, parse_server_timing, percentile
+from seed_portfolio import PortfolioGenerator, add_months, seed_in_process
+
+# Days after the due date a tenant pays, weighted like the seeded payment history
+PAYMENT_DELAYS = [0, 0, 0, 1, 2, 5, 10]
+# Billing periods route.js still collects: the current one and the one before
+ARREARS_PERIODS = 2
+# Extra leases due late in the month (the seeded ones fall on days 1-28), each once paying
+# and once never paying, so their rent goes unpaid across month boundaries
+SCENARIO_DUE_DAYS = [5, 26, 28, 29, 30, 31]
+
+
+class SystemClock:
+    """The current UTC day, as route.js defaults asOf"""
+
+    def today(self):
+        return datetime.now(timezone.utc).date()
+
+
+class SimulatedClock:
+    """A day that only moves when the simulation advances it"""
+
+    def __init__(self, start):
+        self.current = start
+
+    def today(self):
+        return self.current
+
+    def advance(self, days=1):
+        self.current += timedelta(days=days)
+
+
+def due_date(lease_start, period):
+    """Rent is due on the lease start's day of the month, or the period's last day if shorter"""
+    last_day = calendar.monthrange(period.year, period.month)[1]
+    return period.replace(day=min(lease_start.day, last_day))
+
+
+def lease_running(tenant, day):
+    lease_start = date.fromisoformat(tenant['leaseStart'])
+    return lease_start <= day and not (tenant.get('leaseEnd') and date.fromisoformat(tenant['leaseEnd']) < day)
+
+
+def open_due_dates(lease_start, as_of):
+    """The lease's due dates on or before as_of that the rent cycle still collects: the last
+    ARREARS_PERIODS of them, found by walking back month by month from as_of"""
+    dues = []
+    month = as_of.replace(day=1)
+    while len(dues) < ARREARS_PERIODS and month >= lease_start.replace(day=1):
+        due = due_date(lease_start, month)
+        if lease_start <= due <= as_of:
+            dues.insert(0, due)
+        month = (month - timedelta(days=1)).replace(day=1)
+    return dues
+
+
+def expected_status(tenant, paid_dates, as_of, grace_days):
+    """Independent reference for the rent-cycle rules; None for leases the cycle leaves alone.
+    Payments settle the open due dates oldest first, from the 1st of the oldest one's month;
+    the first due date left unpaid decides between Pending and Overdue."""
+    if not lease_running(tenant, as_of):
+        return None
+    unpaid = open_due_dates(date.fromisoformat(tenant['leaseStart']), as_of)
+    for paid_on in sorted(paid_dates):
+        if unpaid and unpaid[0].replace(day=1) <= paid_on <= as_of:
+            unpaid.pop(0)
+    if not unpaid:
+        return 'Paid'
+    return 'Overdue' if as_of > unpaid[0] + timedelta(days=grace_days) else 'Pending'
+
+
+def first_due_on(day, not_before):
+    """Earliest date on `day` of a month, on or after not_before"""
+    month = not_before.replace(day=1)
+    while day > calendar.monthrange(month.year, month.month)[1] or month.replace(day=day) < not_before:
+        month = add_months(month, 1)
+    return month.replace(day=day)
+
+
+class RentCycleRunner:
+    """Triggers the rent cycle for whatever day the clock says it is"""
+
+    def __init__(self, tester, clock):
+        self.tester = tester
+        self.clock = clock
+
+    def run(self):
+        """(result, client ms, server ms) for one cycle"""
+        start = time.perf_counter()
+        response = self.tester.make_request('POST', 'rent-cycle', {'asOf': self.clock.today().isoformat()})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not response or response.status_code != 200:
+            raise RuntimeError(f"POST rent-cycle failed: {response.status_code if response is not None else 'No response'}")
+        timing = parse_server_timing(response.headers.get('Server-Timing', ''))
+        return response.json(), elapsed_ms, timing.get('total')
+
+
+class RentCycleSimulation:
+    def __init__(self, tester, clock, seed=42, payment_rate=0.95, every=1):
+        self.tester = tester
+        self.clock = clock
+        self.runner = RentCycleRunner(tester, clock)
+        self.random = random.Random(f"{seed}:rent-cycle")
+        self.payment_rate = payment_rate
+        self.every = every
+        self.tenants = []
+        self.paid_dates = {}
+        self.scheduled = {}
+        self.payment_ids = []
+        self.scenario_property = None
+        self.scenario_tenants = []
+        self.never_pay = set()
+        self.overdue_unpaid = set()
+        self.runs = []
+        self.mismatches = []
+
+    def add_scenarios(self):
+        """Leases on SCENARIO_DUE_DAYS starting from the first simulated day, one paying and one not for each"""
+        prop = self.tester.create_fixture_property('Rent cycle scenarios')
+        self.scenario_property = prop['id']
+        for day in SCENARIO_DUE_DAYS:
+            lease_start = first_due_on(day, self.clock.today())
+            for pays in (True, False):
+                tenant = self.tester.create_fixture('tenants', {
+                    'name': f"Scenario due {day}{'' if pays else ' unpaid'}",
+                    'email': 'rent-cycle@example.test',
+                    'phone': '+1-555-0199',
+                    'propertyId': prop['id'],
+                    'propertyName': prop['name'],
+                    'monthlyRent': 1000.0,
+                    'leaseStart': lease_start.isoformat(),
+                    'leaseEnd': add_months(lease_start, 36).isoformat(),
+                    'rentStatus': 'Pending'
+                })
+                self.scenario_tenants.append(tenant['id'])
+                if not pays:
+                    self.never_pay.add(tenant['id'])
+
+    def load(self):
+        self.tenants = [t for t in self.tester.iter_records('tenants', limit=1000) if t.get('leaseStart')]
+        for payment in self.tester.iter_records('payments', limit=1000):
+            if payment.get('tenantId') and isinstance(payment.get('date'), str):
+                self.paid_dates.setdefault(payment['tenantId'], []).append(date.fromisoformat(payment['date']))
+
+    def schedule_period(self):
+        """Decide, for every lease running this period, whether and when its rent gets paid"""
+        today = self.clock.today()
+        last_day = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+        for tenant in self.tenants:
+            due = due_date(date.fromisoformat(tenant['leaseStart']), today)
+            if tenant['id'] in self.never_pay or not lease_running(tenant, due) or self.random.random() >= self.payment_rate:
+                continue
+            paid_on = min(due + timedelta(days=self.random.choice(PAYMENT_DELAYS)), last_day)
+            if paid_on >= today:
+                self.scheduled.setdefault(paid_on, []).append(tenant)
+
+    def pay_due(self):
+        """Record today's payments in one bulk request"""
+        today = self.clock.today()
+        tenants = self.scheduled.pop(today, [])
+        if not tenants:
+            return
+        created, errors = self.tester.create_many('payments', [{
+            'tenantId': t['id'],
+            'tenantName': t['name'],
+            'propertyId': t.get('propertyId'),
+            'propertyName': t.get('propertyName'),
+            'amount': t.get('monthlyRent') or 0.0,
+            'date': today.isoformat(),
+            'status': 'Paid'
+        } for t in tenants])
+        for payment in created:
+            self.payment_ids.append(payment['id'])
+            self.paid_dates.setdefault(payment['tenantId'], []).append(today)
+        if errors:
+            self.mismatches.append(f"{today}: {len(errors)} payments failed")
+
+    def verify(self, grace_days):
+        today = self.clock.today()
+        wrong = []
+        for tenant in self.tester.iter_records('tenants', limit=1000):
+            if not tenant.get('leaseStart'):
+                continue
+            expected = expected_status(tenant, self.paid_dates.get(tenant['id'], ()), today, grace_days)
+            if expected is not None and tenant.get('rentStatus') != expected:
+                wrong.append(tenant['id'])
+            # Checked without the reference: rent never paid must never stop being Overdue
+            if tenant['id'] in self.never_pay:
+                if tenant.get('rentStatus') == 'Overdue':
+                    self.overdue_unpaid.add(tenant['id'])
+                elif tenant['id'] in self.overdue_unpaid:
+                    self.mismatches.append(f"{today}: unpaid tenant {tenant['name']} left Overdue for {tenant.get('rentStatus')}")
+        if wrong:
+            self.mismatches.append(f"{today}: {len(wrong)} tenants off the reference (e.g. {wrong[0]})")
+
+    def run(self, days, verify=True):
+        for day_number in range(days):
+            if day_number == 0 or self.clock.today().day == 1:
+                self.schedule_period()
+            self.pay_due()
+            if day_number % self.every == 0:
+                result, elapsed_ms, server_ms = self.runner.run()
+                self.runs.append({'asOf': result['asOf'], 'elapsed_ms': round(elapsed_ms, 3),
+                                  'server_ms': server_ms, 'updated': result['updated'],
+                                  'transitions': result['transitions']})
+                if verify:
+                    self.verify(result['graceDays'])
+            self.clock.advance()
+
+    def unreached_overdue(self):
+        """Never-paying scenario tenants the cycle did not once mark Overdue"""
+        return sorted(self.never_pay - self.overdue_unpaid)
+
+    def cleanup(self):
+        for payment_id in self.payment_ids:
+            self.tester.make_request('DELETE', f'payments/{payment_id}')
+        for tenant_id in self.scenario_tenants:
+            self.tester.make_request('DELETE', f'tenants/{tenant_id}')
+        if self.scenario_property:
+            self.tester.make_request('DELETE', f'properties/{self.scenario_property}')
+
+
+def monthly_summary(runs):
+    """Per simulated month: runs, transitions into each status, and run latency"""
+    months = {}
+    for run in runs:
+        months.setdefault(run['asOf'][:7], []).append(run)
+    summary = {}
+    for month, month_runs in months.items():
+        elapsed = sorted(r['elapsed_ms'] for r in month_runs)
+        summary[month] = {
+            'runs': len(month_runs),
+            'transitions': {s: sum(r['transitions'][s] for r in month_runs) for s in RENT_STATUSES},
+            'median_ms': round(statistics.median(elapsed), 3),
+            'max_ms': round(elapsed[-1], 3),
+        }
+    return summary
+
+
+def main():
+    """Main rent cycle execution"""
+    parser = argparse.ArgumentParser(description="Trigger or simulate the batched rent-cycle job")
+    parser.add_argument('action', choices=['run', 'simulate'])
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--as-of', help="day to run the cycle for (run only; default today, UTC)")
+    parser.add_argument('--start', default=date.today().isoformat(), help="first simulated day")
+    parser.add_argument('--months', type=int, default=13, help="months to simulate")
+    parser.add_argument('--every', type=int, default=1, help="simulated days between cycle runs")
+    parser.add_argument('--properties', type=int, default=5000, help="portfolio size seeded into the emulator")
+    parser.add_argument('--payment-rate', type=float, default=0.95, help="chance a tenant pays in a given month")
+    parser.add_argument('--no-verify', action='store_true', help="skip the reference check after each run")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--emulator', action='store_true', help="seed and simulate on the in-process API emulator")
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    start = date.fromisoformat(args.start)
+    session = None
+    if args.emulator or emulator_requested():
+        emulator = ApiEmulator()
+        if args.action == 'simulate':
+            # History up to the day before the simulation starts
+            generator = PortfolioGenerator(args.seed, args.properties, months=12, end_date=start - timedelta(days=1))
+            print(f"Seeded emulator: {seed_in_process(emulator, generator)}")
+        session = EmulatorSession(emulator)
+    tester = MyRentManagerTester(args.base_url, session)
+
+    if args.action == 'run':
+        clock = SimulatedClock(date.fromisoformat(args.as_of)) if args.as_of else SystemClock()
+        result, elapsed_ms, server_ms = RentCycleRunner(tester, clock).run()
+        print(f"Rent cycle for {result['asOf']}: {result['updated']} tenants updated "
+              f"({', '.join(f'{count} to {status}' for status, count in result['transitions'].items())}) "
+              f"in {elapsed_ms:.1f} ms")
+        sys.exit(0)
+
+    days = (add_months(start, args.months) - start).days
+    simulation = RentCycleSimulation(tester, SimulatedClock(start), args.seed, args.payment_rate, args.every)
+    simulation.add_scenarios()
+    simulation.load()
+    print(f"Simulating {days} days from {start} over {len(simulation.tenants)} tenants, "
+          f"a cycle every {args.every} day(s)")
+    try:
+        simulation.run(days, verify=not args.no_verify)
+    finally:
+        simulation.cleanup()
+    if not args.no_verify:
+        simulation.mismatches.extend(f"unpaid scenario tenant {tenant_id} never became Overdue"
+                                     for tenant_id in simulation.unreached_overdue())
+
+    summary = monthly_summary(simulation.runs)
+    print(f"\n{'MONTH':7} | {'RUNS':>4} | {'→PAID':>6} | {'→PENDING':>8} | {'→OVERDUE':>8} | {'MEDIAN ms':>9} | {'MAX ms':>8}")
+    print("-" * 70)
+    for month, stats in summary.items():
+        moved = stats['transitions']
+        print(f"{month:7} | {stats['runs']:4d} | {moved['Paid']:6d} | {moved['Pending']:8d} | {moved['Overdue']:8d} | "
+              f"{stats['median_ms']:9.2f} | {stats['max_ms']:8.2f}")
+
+    elapsed = sorted(run['elapsed_ms'] for run in simulation.runs)
+    print(f"\n{len(elapsed)} runs: median {statistics.median(elapsed):.2f} ms, "
+          f"p95 {percentile(elapsed, 95):.2f} ms, max {elapsed[-1]:.2f} ms")
+
+    for problem in simulation.mismatches[:20]:
+        print(f"❌ {problem}")
+    if not simulation.mismatches and not args.no_verify:
+        print("✅ Every run matched the reference rent-cycle rules")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'months': summary, 'runs': simulation.runs, 'mismatches': simulation.mismatches}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    sys.exit(1 if simulation.mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Synthetic Portfolio Seeder
+Generates referentially consistent properties, tenants, payments and expenses at a
+chosen scale and seed, uploads them through the API with bounded concurrency, and
+tears them down again from the manifest written during the upload. Properties and
+tenants are created one POST at a time, since later records need their IDs; payments
+and expenses go through POST /api/<collection>/bulk in batches of up to MAX_BULK_ITEMS.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from itertools import islice
+
+from api_emulator import MAX_BULK_ITEMS, ApiEmulator, EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester
+
+FIRST_NAMES = ['Ahmet', 'Ayşe', 'Mehmet', 'Fatma', 'Ali', 'Zeynep', 'John', 'Maria', 'David', 'Elif',
+               'Can', 'Deniz', 'Emma', 'Lucas', 'Selin', 'Burak', 'Olivia', 'Mert', 'Sofia', 'Kerem']
+LAST_NAMES = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Smith', 'Garcia', 'Öztürk', 'Aydın', 'Brown',
+              'Arslan', 'Doğan', 'Wilson', 'Koç', 'Kurt', 'Taylor', 'Özdemir', 'Martin', 'Polat', 'Aksoy']
+STREETS = ['Atatürk Caddesi', 'Bağdat Caddesi', 'Main Street', 'Cumhuriyet Bulvarı', 'İstiklal Caddesi',
+           'Oak Avenue', 'Gazi Bulvarı', 'Park Lane', 'Lale Sokak', 'Deniz Sokak']
+PROPERTY_TYPES = {
+    # type: (weight, min rent, max rent)
+    'Apartment': (55, 800, 2500),
+    'House': (20, 1500, 4500),
+    'Studio': (15, 500, 1200),
+    'Commercial': (10, 2000, 9000),
+}
+EXPENSE_CATEGORIES = {
+    # category: (weight, min amount, max amount)
+    'Maintenance': (35, 50, 800),
+    'Repair': (20, 100, 3000),
+    'Utilities': (25, 30, 400),
+    'Insurance': (8, 200, 1500),
+    'Tax': (7, 300, 4000),
+    'Other': (5, 20, 600),
+}
+
+
+def add_months(day, months):
+    """Shift a date by whole months, clamping the day to 28 so every month is valid"""
+    month_index = day.year * 12 + (day.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, min(day.day, 28))
+
+
+def weighted_choice(rng, table):
+    names = list(table)
+    return rng.choices(names, weights=[table[name][0] for name in names])[0]
+
+
+class PortfolioGenerator:
+    """Deterministic synthetic portfolio; every phase has its own RNG stream so results are
+    reproducible regardless of the IDs the server assigns"""
+
+    def __init__(self, seed=42, properties=1000, occupancy=0.9, months=24, expense_rate=0.3,
+                 payment_rate=0.97, end_date=None):
+        self.seed = seed
+        self.property_count = properties
+        self.occupancy = occupancy
+        self.months = months
+        self.expense_rate = expense_rate
+        self.payment_rate = payment_rate
+        self.end_date = end_date or date.today()
+
+    def rng(self, phase):
+        return random.Random(f"{self.seed}:{phase}")
+
+    def properties(self):
+        rng = self.rng('properties')
+        for i in range(self.property_count):
+            prop_type = weighted_choice(rng, PROPERTY_TYPES)
+            _, low, high = PROPERTY_TYPES[prop_type]
+            yield {
+                'name': f"{rng.choice(STREETS).split()[0]} {prop_type} #{i + 1}",
+                'address': f"{rng.choice(STREETS)} No:{rng.randint(1, 250)}",
+                'type': prop_type,
+                'monthlyRent': float(rng.randrange(low, high, 25)),
+                'status': 'Vacant'
+            }
+
+    def tenants(self, properties):
+        """One tenant for each occupied property, with a lease that started within the history window"""
+        rng = self.rng('tenants')
+        for prop in properties:
+            if rng.random() >= self.occupancy:
+                continue
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            lease_start = add_months(self.end_date.replace(day=rng.randint(1, 28)), -rng.randint(1, self.months))
+            lease_end = add_months(lease_start, rng.choice([12, 12, 24, 36]))
+            yield {
+                'name': f"{first} {last}",
+                'email': f"{first}.{last}.{rng.randint(1, 99999)}@example.com".lower(),
+                'phone': f"+90-5{rng.randint(10, 59)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                'propertyId': prop['id'],
+                'propertyName': prop['name'],
+                'monthlyRent': prop['monthlyRent'],
+                'leaseStart': lease_start.isoformat(),
+                'leaseEnd': lease_end.isoformat(),
+                'rentStatus': 'Pending'
+            }
+
+    def payments(self, tenants):
+        """Monthly rent from lease start until lease end or today; a few months are skipped or late"""
+        rng = self.rng('payments')
+        for tenant in tenants:
+            due = date.fromisoformat(tenant['leaseStart'])
+            last_due = min(date.fromisoformat(tenant['leaseEnd']), self.end_date)
+            while due <= last_due:
+                if rng.random() < self.payment_rate:
+                    paid_on = due.replace(day=min(due.day + rng.choice([0, 0, 0, 1, 2, 5, 10]), 28))
+                    yield {
+                        'tenantId': tenant['id'],
+                        'tenantName': tenant['name'],
+                        'propertyId': tenant['propertyId'],
+                        'propertyName': tenant['propertyName'],
+                        'amount': tenant['monthlyRent'],
+                        'date': min(paid_on, self.end_date).isoformat(),
+                        'status': 'Paid'
+                    }
+                due = add_months(due, 1)
+
+    def expenses(self, properties):
+        rng = self.rng('expenses')
+        first_month = add_months(self.end_date.replace(day=1), -self.months + 1)
+        for prop in properties:
+            for offset in range(self.months):
+                if rng.random() >= self.expense_rate:
+                    continue
+                category = weighted_choice(rng, EXPENSE_CATEGORIES)
+                _, low, high = EXPENSE_CATEGORIES[category]
+                spent_on = min(add_months(first_month, offset).replace(day=rng.randint(1, 28)), self.end_date)
+                yield {
+                    'propertyId': prop['id'],
+                    'propertyName': prop['name'],
+                    'description': f"{category} - {prop['name']}",
+                    'amount': float(rng.randint(low, high)),
+                    'date': spent_on.isoformat(),
+                    'category': category
+                }
+
+
+def run_bounded(fn, items, concurrency):
+    """Apply fn to items lazily with at most `concurrency` calls in flight; yields results as they finish"""
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+        for item in items:
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(fn, item))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+class PortfolioSeeder:
+    """Uploads a generated portfolio and records every created ID in a manifest for teardown"""
+
+    def __init__(self, base_url=BASE_URL, concurrency=16, manifest_path='seed_manifest.txt', emulator=None,
+                 batch_size=MAX_BULK_ITEMS):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.manifest_path = manifest_path
+        self.emulator = emulator
+        self.local = threading.local()
+        self.stats = {}
+
+    def tester(self):
+        """One tester (and HTTP session) per worker thread"""
+        if not hasattr(self.local, 'tester'):
+            session = EmulatorSession(self.emulator) if self.emulator else None
+            self.local.tester = MyRentManagerTester(self.base_url, session)
+        return self.local.tester
+
+    def create(self, collection, payload):
+        response = self.tester().make_request('POST', collection, payload)
+        if response is not None and response.status_code == 201:
+            return response.json()
+        return None
+
+    def delete(self, collection, record_id):
+        response = self.tester().make_request('DELETE', f"{collection}/{record_id}")
+        return response is not None and response.status_code == 200
+
+    def upload(self, collection, payloads, manifest, keep=None):
+        """Insert payloads with bounded concurrency; returns the created records listed in `keep`"""
+        created_records = {}
+        created = errors = 0
+        start = time.perf_counter()
+        create = lambda item: (item[0], self.create(collection, item[1]))
+        for position, record in run_bounded(create, enumerate(payloads), self.concurrency):
+            if record is None:
+                errors += 1
+                continue
+            created += 1
+            manifest.write(f"{collection} {record['id']}\n")
+            if keep:
+                created_records[position] = {field: record.get(field) for field in keep}
+        self.record_stats(collection, created, errors, time.perf_counter() - start)
+        # Restore generation order so the next phase's RNG stream does not depend on completion order
+        return [created_records[position] for position in sorted(created_records)]
+
+    def upload_bulk(self, collection, payloads, manifest):
+        """Insert payloads through the bulk endpoint, batch_size per request, with bounded concurrency"""
+        created = errors = 0
+        start = time.perf_counter()
+        payloads = iter(payloads)
+        batches = iter(lambda: list(islice(payloads, self.batch_size)), [])
+        create = lambda batch: self.tester().create_many(collection, batch, self.batch_size)
+        for records, failed in run_bounded(create, batches, self.concurrency):
+            created += len(records)
+            errors += len(failed)
+            manifest.writelines(f"{collection} {record['id']}\n" for record in records)
+        self.record_stats(collection, created, errors, time.perf_counter() - start)
+
+    def record_stats(self, phase, count, errors, elapsed):
+        self.stats[phase] = {
+            'count': count,
+            'errors': errors,
+            'elapsed_s': round(elapsed, 3),
+            'per_second': round(count / elapsed, 1) if elapsed else 0.0,
+        }
+        print(f"  {phase:12} {count:>9d} ok  {errors:>6d} failed  {elapsed:8.1f}s  {self.stats[phase]['per_second']:>9.1f}/s")
+
+    def seed(self, generator):
+        print(f"Seeding {generator.property_count} properties over {generator.months} months "
+              f"(seed={generator.seed}, concurrency={self.concurrency})")
+        with open(self.manifest_path, 'w') as manifest:
+            properties = self.upload('properties', generator.properties(), manifest,
+                                     keep=('id', 'name', 'monthlyRent'))
+            tenants = self.upload('tenants', generator.tenants(properties), manifest,
+                                  keep=('id', 'name', 'propertyId', 'propertyName', 'monthlyRent',
+                                        'leaseStart', 'leaseEnd'))
+            self.upload_bulk('payments', generator.payments(tenants), manifest)
+            self.upload_bulk('expenses', generator.expenses(properties), manifest)
+        return self.stats
+
+    def teardown(self):
+        """Delete everything in the manifest: payments and expenses, then tenants, then properties"""
+        print(f"Tearing down records listed in {self.manifest_path}")
+        for collection in ('payments', 'expenses', 'tenants', 'properties'):
+            ids = self.manifest_ids(collection)
+            deleted = errors = 0
+            start = time.perf_counter()
+            for ok in run_bounded(lambda record_id: self.delete(collection, record_id), ids, self.concurrency):
+                if ok:
+                    deleted += 1
+                else:
+                    errors += 1
+            self.record_stats(f"-{collection}", deleted, errors, time.perf_counter() - start)
+        return self.stats
+
+    def manifest_ids(self, collection):
+        with open(self.manifest_path) as manifest:
+            for line in manifest:
+                name, _, record_id = line.strip().partition(' ')
+                if name == collection:
+                    yield record_id
+
+
+def seed_in_process(emulator, generator):
+    """Load a generated portfolio straight into an ApiEmulator, skipping the HTTP layer.
+    Used by the benchmarks to build large datasets quickly."""
+    counts = {}
+    keep = lambda record, fields: {field: record[field] for field in fields}
+    with emulator.lock:
+        properties = [keep(emulator.create_property(p)[1], ('id', 'name', 'monthlyRent'))
+                      for p in generator.properties()]
+        tenants = [keep(emulator.create_tenant(t)[1], ('id', 'name', 'propertyId', 'propertyName',
+                                                         'monthlyRent', 'leaseStart', 'leaseEnd'))
+                   for t in generator.tenants(properties)]
+        counts['properties'] = len(properties)
+        counts['tenants'] = len(tenants)
+        counts['payments'] = sum(1 for payment in generator.payments(tenants) if emulator.create_payment(payment))
+        counts['expenses'] = sum(1 for expense in generator.expenses(properties) if emulator.create_expense(expense))
+    return counts
+
+
+def main():
+    """Main seeding execution"""
+    parser = argparse.ArgumentParser(description="MyRentManager synthetic portfolio seeder")
+    parser.add_argument('action', choices=['seed', 'teardown', 'roundtrip'],
+                        help="roundtrip seeds and immediately tears down")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--properties', type=int, default=1000)
+    parser.add_argument('--occupancy', type=float, default=0.9, help="fraction of properties with a tenant")
+    parser.add_argument('--months', type=int, default=24, help="months of payment/expense history")
+    parser.add_argument('--expense-rate', type=float, default=0.3, help="expenses per property per month")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, default=16, help="maximum requests in flight")
+    parser.add_argument('--batch-size', type=int, default=MAX_BULK_ITEMS,
+                        help=f"payments or expenses per bulk request (at most {MAX_BULK_ITEMS})")
+    parser.add_argument('--manifest', default='seed_manifest.txt', help="file of created IDs used for teardown")
+    parser.add_argument('--output', help="write the throughput summary as JSON to this path")
+    parser.add_argument('--emulator', action='store_true', help="run against the in-process API emulator")
+    args = parser.parse_args()
+
+    emulator = ApiEmulator() if args.emulator or emulator_requested() else None
+    if emulator and args.action == 'teardown':
+        print("❌ teardown needs the server that was seeded; the emulator does not persist between runs")
+        sys.exit(1)
+
+    if not 0 < args.batch_size <= MAX_BULK_ITEMS:
+        parser.error(f"--batch-size must be between 1 and {MAX_BULK_ITEMS}")
+
+    seeder = PortfolioSeeder(args.base_url, args.concurrency, args.manifest, emulator, args.batch_size)
+    if args.action in ('seed', 'roundtrip'):
+        generator = PortfolioGenerator(args.seed, args.properties, args.occupancy, args.months, args.expense_rate)
+        seeder.seed(generator)
+    if args.action in ('teardown', 'roundtrip'):
+        seeder.teardown()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(seeder.stats, f, indent=2)
+        print(f"\nSummary written to {args.output}")
+
+    failed = sum(stats['errors'] for stats in seeder.stats.values())
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Dashboard Stats Check
+Verifies GET /api/stats against a NumPy-vectorized reference computed from the full
+collections, and benchmarks the endpoint against the dashboard's download-everything
+approach (five collection GETs plus client-side filter/reduce passes).
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from api_emulator import MONTH_NAMES, ApiEmulator, EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester
+from seed_portfolio import PortfolioGenerator, seed_in_process
+
+COUNT_FIELDS = ('totalProperties', 'occupiedProperties', 'totalTenants', 'paidTenants', 'pendingTenants',
+                'overdueTenants', 'expiredLeases', 'monthlyExpenseCount')
+AMOUNT_FIELDS = ('monthlyIncome', 'rentDue', 'monthlyExpenses', 'netIncome')
+
+
+def numbers(records, field):
+    """Float column with non-numeric values as 0, like $sum and `x || 0`"""
+    return np.fromiter(
+        (value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0.0
+         for value in (r.get(field) for r in records)),
+        dtype=np.float64, count=len(records))
+
+
+def strings(records, field, width):
+    """Fixed-width string column; missing or non-string values become ''"""
+    return np.array([v if isinstance(v, str) else '' for v in (r.get(field) for r in records)], dtype=f"U{width}")
+
+
+def reference_stats(properties, tenants, payments, expenses, month, today):
+    """Vectorized reference for GET /api/stats over fully downloaded collections"""
+    year = month[:4]
+    month_keys = np.array([f"{year}-{m:02d}" for m in range(1, 13)])
+
+    def monthly_totals(records):
+        months = strings(records, 'date', 7)
+        amounts = numbers(records, 'amount')
+        index = np.searchsorted(month_keys, months)
+        valid = (index < 12) & (month_keys[np.minimum(index, 11)] == months)
+        return np.bincount(index[valid], weights=amounts[valid], minlength=12), months
+
+    property_status = strings(properties, 'status', 8)
+    rent_status = strings(tenants, 'rentStatus', 7)
+    rents = numbers(tenants, 'monthlyRent')
+    lease_end = strings(tenants, 'leaseEnd', 10)
+    paid = rent_status == 'Paid'
+    pending = rent_status == 'Pending'
+    overdue = rent_status == 'Overdue'
+
+    income, _ = monthly_totals(payments)
+    spent, expense_months = monthly_totals(expenses)
+    this_month = expense_months == month
+    expense_amounts = numbers(expenses, 'amount')
+
+    stats = {
+        'month': month,
+        'totalProperties': len(properties),
+        'occupiedProperties': int(np.count_nonzero(property_status == 'Occupied')),
+        'totalTenants': len(tenants),
+        'paidTenants': int(np.count_nonzero(paid)),
+        'pendingTenants': int(np.count_nonzero(pending)),
+        'overdueTenants': int(np.count_nonzero(overdue)),
+        'expiredLeases': int(np.count_nonzero((lease_end != '') & (lease_end < today))),
+        'monthlyIncome': float(rents[paid].sum()),
+        'rentDue': float(rents[pending | overdue].sum()),
+        'monthlyExpenses': float(expense_amounts[this_month].sum()),
+        'monthlyExpenseCount': int(np.count_nonzero(this_month)),
+        'chart': [{'month': name, 'income': float(income[i]), 'expenses': float(spent[i])}
+                  for i, name in enumerate(MONTH_NAMES)],
+    }
+    stats['netIncome'] = stats['monthlyIncome'] - stats['monthlyExpenses']
+    return stats
+
+
+def dashboard_style_stats(properties, tenants, payments, expenses, month, today):
+    """The figures as app/page.js derives them: one filter/reduce pass per figure and per chart month"""
+    year = month[:4]
+    in_month = lambda record, key: isinstance(record.get('date'), str) and record['date'][:7] == key
+    stats = {
+        'totalProperties': len(properties),
+        'occupiedProperties': len([p for p in properties if p.get('status') == 'Occupied']),
+        'totalTenants': len(tenants),
+        'monthlyIncome': sum((t.get('monthlyRent') or 0) for t in tenants if t.get('rentStatus') == 'Paid'),
+        'rentDue': sum((t.get('monthlyRent') or 0) for t in tenants if t.get('rentStatus') in ('Pending', 'Overdue')),
+        'monthlyExpenses': sum((e.get('amount') or 0) for e in expenses if in_month(e, month)),
+    }
+    stats['chart'] = [
+        {'month': name,
+         'income': sum((p.get('amount') or 0) for p in payments if in_month(p, f"{year}-{i + 1:02d}")),
+         'expenses': sum((e.get('amount') or 0) for e in expenses if in_month(e, f"{year}-{i + 1:02d}"))}
+        for i, name in enumerate(MONTH_NAMES)
+    ]
+    return stats
+
+
+def compare(actual, expected):
+    """List of human-readable mismatches between endpoint and reference"""
+    problems = []
+    for field in COUNT_FIELDS:
+        if actual.get(field) != expected[field]:
+            problems.append(f"{field}: endpoint={actual.get(field)} reference={expected[field]}")
+    for field in AMOUNT_FIELDS:
+        if not np.isclose(actual.get(field, np.nan), expected[field], rtol=1e-9, atol=1e-6):
+            problems.append(f"{field}: endpoint={actual.get(field)} reference={expected[field]}")
+    for got, want in zip(actual.get('chart', []), expected['chart']):
+        for field in ('income', 'expenses'):
+            if not np.isclose(got.get(field, np.nan), want[field], rtol=1e-9, atol=1e-6):
+                problems.append(f"chart {want['month']} {field}: endpoint={got.get(field)} reference={want[field]}")
+    if len(actual.get('chart', [])) != 12:
+        problems.append(f"chart has {len(actual.get('chart', []))} months")
+    return problems
+
+
+class StatsChecker:
+    """Runs the correctness check and the endpoint vs download-everything benchmark"""
+
+    def __init__(self, tester, month, repeat=5):
+        self.tester = tester
+        self.month = month
+        self.repeat = repeat
+        self.today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    def fetch_json(self, endpoint):
+        response = self.tester.make_request('GET', endpoint)
+        if not response or response.status_code != 200:
+            raise RuntimeError(f"GET {endpoint} failed: {response.status_code if response is not None else 'No response'}")
+        return response.json(), len(response.content)
+
+    def download_everything(self):
+        collections = {}
+        total_bytes = 0
+        for name in ('properties', 'tenants', 'payments', 'expenses', 'settings'):
+            collections[name], size = self.fetch_json(name)
+            total_bytes += size
+        return collections, total_bytes
+
+    def check(self):
+        stats, _ = self.fetch_json(f"stats?month={self.month}")
+        data, _ = self.download_everything()
+        start = time.perf_counter()
+        expected = reference_stats(data['properties'], data['tenants'], data['payments'], data['expenses'],
+                                   self.month, self.today)
+        reference_s = time.perf_counter() - start
+        sizes = {name: len(data[name]) for name in ('properties', 'tenants', 'payments', 'expenses')}
+        return compare(stats, expected), sizes, reference_s
+
+    def benchmark(self):
+        endpoint_times, dump_times = [], []
+        endpoint_bytes = dump_bytes = 0
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            _, endpoint_bytes = self.fetch_json(f"stats?month={self.month}")
+            endpoint_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            data, dump_bytes = self.download_everything()
+            dashboard_style_stats(data['properties'], data['tenants'], data['payments'], data['expenses'],
+                                  self.month, self.today)
+            dump_times.append(time.perf_counter() - start)
+        return {
+            'endpoint': {'median_ms': round(statistics.median(endpoint_times) * 1000, 3), 'bytes': endpoint_bytes},
+            'download_everything': {'median_ms': round(statistics.median(dump_times) * 1000, 3), 'bytes': dump_bytes},
+        }
+
+
+def main():
+    """Main stats check execution"""
+    parser = argparse.ArgumentParser(description="Check /api/stats against a NumPy reference and benchmark it")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--month', default=datetime.now(timezone.utc).strftime('%Y-%m'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--emulator', action='store_true', help="seed and check the in-process API emulator")
+    parser.add_argument('--properties', type=int, default=5000, help="portfolio size seeded into the emulator")
+    parser.add_argument('--months', type=int, default=24)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    session = None
+    if args.emulator or emulator_requested():
+        emulator = ApiEmulator()
+        counts = seed_in_process(emulator, PortfolioGenerator(args.seed, args.properties, months=args.months))
+        print(f"Seeded emulator: {counts}")
+        session = EmulatorSession(emulator)
+
+    checker = StatsChecker(MyRentManagerTester(args.base_url, session), args.month, args.repeat)
+    problems, sizes, reference_s = checker.check()
+    print(f"Reference over {sizes} computed in {reference_s * 1000:.1f} ms")
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+    else:
+        print(f"✅ /api/stats matches the NumPy reference for {args.month}")
+
+    results = checker.benchmark()
+    for name, stats in results.items():
+        print(f"{name:20} | median {stats['median_ms']:10.1f} ms | {stats['bytes'] / 1024:10.1f} KiB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'month': args.month, 'sizes': sizes, 'mismatches': problems, 'benchmark': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+MyRentManager Write Stress Test
+Hammers a handful of tagged properties with concurrent tenant creates and deletes and
+single and bulk payments, then checks the cascade invariants:
+  - a property is Occupied exactly when it has tenants, and its tenantCount matches them
+  - every remaining tenant that was paid for is Paid
+Round trips per request are read from the Server-Timing call counts (db + cascade + meta)
+and checked against a per-route budget. Everything the test creates is deleted afterwards.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+from datetime import date, timedelta
+
+from api_emulator import EmulatorSession, emulator_requested
+from backend_test import BASE_URL, MyRentManagerTester, parse_server_timing, route_key
+from seed_portfolio import run_bounded
+
+ROUND_TRIP_PHASES = ('db', 'cascade', 'meta')
+
+# Most Mongo round trips each write route may make: the write itself, one cascade, one version bump
+ROUND_TRIP_BUDGET = {
+    'POST tenants': 3,
+    'DELETE tenants/{id}': 3,
+    'POST payments': 3,
+    'POST payments/bulk': 3,
+    'PUT properties/{id}': 2,
+    'PUT tenants/{id}': 2,
+    'PUT settings': 2,
+}
+
+# Relative weight of each operation in the contended mix
+STRESS_MIX = {
+    'add_tenant': 5,
+    'remove_tenant': 4,
+    'pay': 3,
+    'pay_bulk': 1,
+}
+
+
+def round_trips(response):
+    """Mongo round trips the server reported for this response, or None without Server-Timing"""
+    if response is None or 'Server-Timing' not in response.headers:
+        return None
+    calls = parse_server_timing(response.headers['Server-Timing'], 'desc')
+    return int(sum(calls.get(phase, 0) for phase in ROUND_TRIP_PHASES))
+
+
+class WriteStress:
+    def __init__(self, base_url=BASE_URL, emulator_session=None, seed=42):
+        self.base_url = base_url
+        self.emulator_session = emulator_session
+        self.random = random.Random(seed)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.properties = []
+        self.tenants = {}
+        self.paid = set()
+        self.payment_ids = []
+        self.trips = {}
+        self.errors = []
+
+    def tester(self):
+        """One tester (and HTTP session) per worker thread"""
+        if not hasattr(self.local, 'tester'):
+            session = EmulatorSession(self.emulator_session.emulator) if self.emulator_session else None
+            self.local.tester = MyRentManagerTester(self.base_url, session)
+        return self.local.tester
+
+    def request(self, method, endpoint, data=None):
+        response = self.tester().make_request(method, endpoint, data)
+        trips = round_trips(response)
+        with self.lock:
+            if trips is not None:
+                self.trips.setdefault(route_key(method, endpoint), []).append(trips)
+            if response is None or response.status_code >= 400:
+                self.errors.append(f"{method} {endpoint}: {response.status_code if response is not None else 'No response'}")
+        return response
+
+    def setup(self, count):
+        tester = self.tester()
+        self.properties = [tester.create_fixture_property(f'Stress {i}') for i in range(count)]
+
+    def payment_for(self, tenant):
+        return {
+            'tenantId': tenant['id'],
+            'tenantName': tenant['name'],
+            'propertyId': tenant['propertyId'],
+            'propertyName': tenant['propertyName'],
+            'amount': tenant['monthlyRent'],
+            'date': date.today().isoformat(),
+            'status': 'Paid'
+        }
+
+    def add_tenant(self, rng):
+        prop = rng.choice(self.properties)
+        response = self.request('POST', 'tenants', {
+            'name': f'Stress Tenant {rng.randrange(10**6)}',
+            'email': 'stress@example.test',
+            'phone': '+1-555-0199',
+            'propertyId': prop['id'],
+            'propertyName': prop['name'],
+            'monthlyRent': 900.0,
+            'leaseStart': date.today().isoformat(),
+            'leaseEnd': (date.today() + timedelta(days=365)).isoformat(),
+            'rentStatus': 'Pending'
+        })
+        if response is not None and response.status_code == 201:
+            tenant = response.json()
+            with self.lock:
+                self.tenants[tenant['id']] = tenant
+
+    def take_tenant(self, rng):
+        """Remove and return a random live tenant, so no two workers delete the same one"""
+        with self.lock:
+            if not self.tenants:
+                return None
+            return self.tenants.pop(rng.choice(list(self.tenants)))
+
+    def remove_tenant(self, rng):
+        tenant = self.take_tenant(rng)
+        if tenant is None:
+            return self.add_tenant(rng)
+        self.request('DELETE', f"tenants/{tenant['id']}")
+
+    def pay(self, rng):
+        with self.lock:
+            tenant = self.tenants.get(rng.choice(list(self.tenants))) if self.tenants else None
+        if tenant is None:
+            return self.add_tenant(rng)
+        response = self.request('POST', 'payments', self.payment_for(tenant))
+        if response is not None and response.status_code == 201:
+            with self.lock:
+                self.paid.add(tenant['id'])
+                self.payment_ids.append(response.json()['id'])
+
+    def pay_bulk(self, rng):
+        with self.lock:
+            tenants = [self.tenants[i] for i in rng.sample(list(self.tenants), min(5, len(self.tenants)))]
+        if not tenants:
+            return self.add_tenant(rng)
+        response = self.request('POST', 'payments/bulk', {'items': [self.payment_for(t) for t in tenants]})
+        if response is not None and response.status_code == 201:
+            with self.lock:
+                self.paid.update(t['id'] for t in tenants)
+                self.payment_ids.extend(p['id'] for p in response.json()['items'])
+
+    def run(self, operations, workers):
+        names = list(STRESS_MIX)
+        weights = [STRESS_MIX[name] for name in names]
+        # Each operation gets its own seeded RNG so the mix does not depend on thread scheduling
+        plan = [(random.Random(self.random.random()), name)
+                for name in self.random.choices(names, weights, k=operations)]
+        for _ in run_bounded(lambda item: getattr(self, item[1])(item[0]), plan, workers):
+            pass
+
+    def probe_updates(self):
+        """Uncontended PUTs, for the round-trip counts of the update routes"""
+        with self.lock:
+            tenant = next(iter(self.tenants.values()), None)
+        prop = self.tester().get_record('properties', self.properties[0]['id'])
+        if prop:
+            self.request('PUT', f"properties/{prop['id']}", prop)
+        if tenant:
+            current = self.tester().get_record('tenants', tenant['id'])
+            if current:
+                self.request('PUT', f"tenants/{tenant['id']}", current)
+        settings = self.tester().make_request('GET', 'settings')
+        if settings:
+            self.request('PUT', 'settings', settings.json())
+
+    def check_invariants(self):
+        tester = self.tester()
+        property_ids = {p['id'] for p in self.properties}
+        by_property = {prop_id: [] for prop_id in property_ids}
+        for tenant in tester.iter_records('tenants', limit=500):
+            if tenant.get('propertyId') in property_ids:
+                by_property[tenant['propertyId']].append(tenant)
+
+        violations = []
+        for prop_id, tenants in by_property.items():
+            prop = tester.get_record('properties', prop_id)
+            if prop is None:
+                violations.append(f"property {prop_id} disappeared")
+                continue
+            expected = 'Occupied' if tenants else 'Vacant'
+            if prop.get('status') != expected:
+                violations.append(f"property {prop['name']}: status {prop.get('status')} with {len(tenants)} tenants")
+            if prop.get('tenantCount', 0) != len(tenants):
+                violations.append(f"property {prop['name']}: tenantCount {prop.get('tenantCount')} with {len(tenants)} tenants")
+            for tenant in tenants:
+                if tenant['id'] in self.paid and tenant.get('rentStatus') != 'Paid':
+                    violations.append(f"tenant {tenant['id']}: paid for but rentStatus is {tenant.get('rentStatus')}")
+        return violations
+
+    def budget_violations(self):
+        problems = []
+        for key, samples in sorted(self.trips.items()):
+            budget = ROUND_TRIP_BUDGET.get(key)
+            if budget is not None and max(samples) > budget:
+                problems.append(f"{key}: up to {max(samples)} round trips (budget {budget})")
+        return problems
+
+    def cleanup(self):
+        tester = self.tester()
+        property_ids = {p['id'] for p in self.properties}
+        leftover = [t['id'] for t in tester.iter_records('tenants', limit=500) if t.get('propertyId') in property_ids]
+        for tenant_id in leftover:
+            tester.make_request('DELETE', f'tenants/{tenant_id}')
+        for payment_id in self.payment_ids:
+            tester.make_request('DELETE', f'payments/{payment_id}')
+        for prop_id in property_ids:
+            tester.make_request('DELETE', f'properties/{prop_id}')
+
+
+def main():
+    """Main stress test execution"""
+    parser = argparse.ArgumentParser(description="Concurrent write stress test with cascade invariant checks")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--operations', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--properties', type=int, default=4, help="few properties means more contention")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--emulator', action='store_true', help="stress the in-process API emulator")
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    session = EmulatorSession() if args.emulator or emulator_requested() else None
+    stress = WriteStress(args.base_url, session, args.seed)
+    print(f"Stressing {args.properties} properties with {args.operations} writes from {args.workers} workers")
+    stress.setup(args.properties)
+    try:
+        stress.run(args.operations, args.workers)
+        stress.probe_updates()
+        violations = stress.check_invariants()
+    finally:
+        stress.cleanup()
+    over_budget = stress.budget_violations()
+
+    print(f"\n{'ROUTE':24} | {'CALLS':>6} | {'MEAN TRIPS':>10} | {'MAX':>4} | {'BUDGET':>6}")
+    print("-" * 64)
+    for key, samples in sorted(stress.trips.items()):
+        print(f"{key:24} | {len(samples):6d} | {sum(samples) / len(samples):10.2f} | {max(samples):4d} | "
+              f"{ROUND_TRIP_BUDGET.get(key, '-'):>6}")
+    if not stress.trips:
+        print("❌ No Server-Timing call counts in the responses; round trips were not measured")
+
+    for problem in violations + over_budget + stress.errors[:20]:
+        print(f"❌ {problem}")
+    if not (violations or over_budget or stress.errors):
+        print("\n✅ Invariants held and every route stayed within its round-trip budget")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'round_trips': {key: {'calls': len(s), 'mean': sum(s) / len(s), 'max': max(s)}
+                                for key, s in stress.trips.items()},
+                'violations': violations,
+                'over_budget': over_budget,
+                'errors': stress.errors,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    sys.exit(1 if violations or over_budget or stress.errors or not stress.trips else 0)
+
+
+if __name__ == "__main__":
+    main()